@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import warnings
 from collections import deque
+from typing import Any
 
 import numpy as np
 import polars as pl
@@ -20,7 +21,17 @@ from backtest_data_module.backtesting.events import SignalEvent, OrderEvent, Fil
 from backtest_data_module.backtesting.execution import Execution
 from backtest_data_module.backtesting.performance import Performance
 from backtest_data_module.backtesting.portfolio import Portfolio
-from backtest_data_module.backtesting.strategy import StrategyBase
+from backtest_data_module.backtesting.strategy import (
+    StrategyBase,
+    is_signal_frame,
+    signal_events,
+    signal_frame,
+)
+from backtest_data_module.backtesting.market_index import MarketIndex
+from backtest_data_module.backtesting.vectorized import (
+    VectorizedBacktest,
+    VectorizedResult,
+)
 from backtest_data_module.utils.profiler import Profiler
 from backtest_data_module.data_handler import DataHandler
 
@@ -50,10 +61,88 @@ class Backtest:
         self.profiler = Profiler() if self.device == "cuda" and cp else None
         self.data_handler = DataHandler(None)
 
+    @staticmethod
+    def _signal_order(signal: SignalEvent) -> OrderEvent:
+        """訊號轉為訂單並沿用訊號時間，帶時間的訊號於該時間點下單。
+
+        未帶時間的舊式訊號由 ``_order_time`` 改以資產第一筆資料的時間下單。
+        """
+        return OrderEvent(
+            asset=signal.asset,
+            quantity=signal.quantity,
+            timestamp=signal.timestamp,
+        )
+
+    def _order_time(self, order: OrderEvent) -> Any:
+        """訂單未指定時間時，以該資產第一筆資料的時間下單。"""
+        if order.timestamp is not None:
+            return order.timestamp
+        return self.market_index.first_timestamp(order.asset)
+
+    def run_vectorized(
+        self, signals: np.ndarray | pl.DataFrame, *, targets: bool = False
+    ) -> VectorizedResult:
+        """以向量化模式執行，``signals`` 為時間 × 資產的下單量或目標部位矩陣。
+
+        使用與事件模式相同的手續費、滑價與部位上限設定，但有以下限制：
+        延遲模型不適用，訂單於訊號當根 K 線收盤成交；風控只檢查
+        ``position_limit``，自訂的 ``check_risk`` 不會被呼叫；部位由零開始，
+        不計入投資組合既有部位；結果只寫入 ``results`` 與 ``performance``，
+        ``portfolio`` 的現金、部位與成交紀錄不會更新；滑價亂數的抽取順序
+        也可能與事件模式不同（見 ``VectorizedBacktest``）。需要上述行為時改用
+        ``run``。
+        """
+        engine = VectorizedBacktest(
+            self.data,
+            initial_cash=self.portfolio.cash,
+            commission_model=self.execution.commission_model,
+            slippage_model=self.execution.slippage_model,
+            position_limit=getattr(
+                self.portfolio.risk_manager, "position_limit", None
+            ),
+        )
+        result = engine.run(signals, targets=targets)
+        self.performance.nav_series = result.nav.tolist()
+        self.performance.returns = (
+            np.diff(result.nav) / result.nav[:-1]
+            if len(result.nav) > 1
+            else np.array([])
+        )
+        self.results = {
+            "pnl": result.pnl,
+            "fills": result.fill_dicts(),
+            "performance": self.performance.compute_metrics(),
+        }
+        return result
+
+    def _target_schedule(
+        self, frame: pl.DataFrame
+    ) -> dict[Any, list[tuple[Any, float]]]:
+        """將目標部位表依時間分組，缺值的目標略過。"""
+        frame = frame.filter(pl.col("target").is_not_null())
+        schedule: dict[Any, list[tuple[Any, float]]] = {}
+        for timestamp, asset, target in zip(
+            frame["date"].to_list(),
+            frame["asset"].to_list(),
+            frame["target"].to_list(),
+        ):
+            schedule.setdefault(timestamp, []).append((asset, float(target)))
+        return schedule
+
     def run(self):
+        """以事件模式執行回測。
+
+        策略可回傳 ``SignalEvent`` 清單或欄位式訊號表，兩者都經由 ``Execution``
+        與 ``Portfolio`` 處理，延遲模型、風控與既有部位皆適用。quantity 表轉為
+        帶時間的訊號；target 表於該時間點以目標減去目前持有部位下單，
+        與 ``StreamingBacktest`` 相同。只需市價單且不需上述行為時，
+        可改用較快的 ``run_vectorized``。
+        """
         if self.profiler:
             self.profiler.start()
 
+        self.market_index = MarketIndex(self.data)
+
         if self.device == "cuda" and cp:
             data = cp.asarray(self.data.to_numpy())
             if self.quantization_bits:
@@ -62,6 +151,15 @@ class Backtest:
             data = self.data
 
         signals = self.strategy.on_data(data)
+        targets: dict[Any, list[tuple[Any, float]]] = {}
+        if is_signal_frame(signals):
+            frame = signal_frame(signals)
+            if "quantity" in frame.columns:
+                signals = signal_events(frame)
+            else:
+                # 目標部位需依成交後的部位換算，於逐時間處理訂單時下單
+                targets = self._target_schedule(frame)
+                signals = []
         for signal in signals:
             self.events.append(signal)
 
@@ -72,15 +170,9 @@ class Backtest:
                     event = self.events.popleft()
 
                     if isinstance(event, SignalEvent):
-                        order = OrderEvent(asset=event.asset, quantity=event.quantity)
-                        self.events.append(order)
+                        self.events.append(self._signal_order(event))
                     elif isinstance(event, OrderEvent):
-                        timestamp = (
-                            self.data.filter(pl.col("asset") == event.asset)
-                            .select("date")
-                            .row(0)[0]
-                        )
-                        self.execution.place_order(event, timestamp)
+                        self.execution.place_order(event, self._order_time(event))
                     elif isinstance(event, FillEvent):
                         self.portfolio.update([event.__dict__])
             self.graph_exec = graph.instantiate()
@@ -90,34 +182,42 @@ class Backtest:
                 event = self.events.popleft()
 
                 if isinstance(event, SignalEvent):
-                    order = OrderEvent(asset=event.asset, quantity=event.quantity)
-                    self.events.append(order)
+                    self.events.append(self._signal_order(event))
                 elif isinstance(event, OrderEvent):
-                    timestamp = (
-                        self.data.filter(pl.col("asset") == event.asset)
-                        .select("date")
-                        .row(0)[0]
-                    )
-                    self.execution.place_order(event, timestamp)
+                    self.execution.place_order(event, self._order_time(event))
                 elif isinstance(event, FillEvent):
                     self.portfolio.update([event.__dict__])
 
-        # 在回測結束時處理所有訂單
-        for timestamp in self.data["date"].unique():
-            market_data_at_timestamp = (
-                self.data.filter(pl.col("date") == timestamp)
-                .to_dict(as_series=False)
+        # 在回測結束時依時間順序處理所有訂單，並記錄每個時間點的現金與部位變化
+        index = self.market_index
+        asset_idx = index.asset_ids
+        delta = np.zeros(index.close.shape)
+        cash = np.empty(len(index.dates))
+        start_positions = np.zeros(len(index.assets))
+        for asset, position in self.portfolio.positions.items():
+            if asset in asset_idx:
+                start_positions[asset_idx[asset]] = position.quantity
+
+        held = start_positions.copy()
+        for i, timestamp in enumerate(index.dates.to_list()):
+            for asset, target in targets.get(timestamp, ()):
+                j = asset_idx.get(asset)
+                quantity = target - (held[j] if j is not None else 0.0)
+                if quantity:
+                    order = OrderEvent(
+                        asset=asset, quantity=quantity, timestamp=timestamp
+                    )
+                    self.execution.place_order(order, timestamp)
+            fills = self.execution.process_orders_batch(
+                timestamp, index.close[i], asset_idx
             )
-            market_data_dict = {}
-            for i in range(len(market_data_at_timestamp["asset"])):
-                asset = market_data_at_timestamp["asset"][i]
-                market_data_dict[asset] = {
-                    "close": market_data_at_timestamp["close"][i]
-                }
-
-            fills = self.execution.process_orders(timestamp, market_data_dict)
-            for fill in fills:
-                self.portfolio.update([fill])
+            # 只計入通過風控的成交
+            for fill in self.portfolio.update(fills):
+                j = asset_idx.get(fill["asset"])
+                if j is not None:
+                    delta[i, j] += fill["quantity"]
+                    held[j] += fill["quantity"]
+            cash[i] = self.portfolio.cash
 
         # 更新投資組合績效
         if self.device == "cuda" and cp:
@@ -127,25 +227,10 @@ class Backtest:
         else:
             xp = np
 
-        for timestamp in self.data["date"].unique():
-            last_prices = (
-                self.data.filter(pl.col("date") <= timestamp)
-                .group_by("asset")
-                .last()
-                .select(["asset", "close"])
-                .to_dict()
-            )
-            last_prices = {
-                a: p
-                for a, p in zip(last_prices["asset"], last_prices["close"])
-            }
-            self.performance.nav_series.append(
-                self.portfolio.cash
-                + sum(
-                    p.market_value(last_prices.get(asset, 0))
-                    for asset, p in self.portfolio.positions.items()
-                )
-            )
+        # 以部位時間序列與 as-of 收盤價矩陣逐期計算 NAV
+        positions = start_positions + np.cumsum(delta, axis=0)
+        nav = cash + np.sum(positions * index.as_of(), axis=1)
+        self.performance.nav_series.extend(nav.tolist())
 
         self.performance.returns = (
             xp.diff(xp.asarray(self.performance.nav_series))
@@ -154,16 +239,7 @@ class Backtest:
             else xp.array([])
         )
 
-        last_prices = (
-            self.data.group_by("asset")
-            .last()
-            .select(["asset", "close"])
-            .to_dict()
-        )
-        last_prices = {
-            a: p
-            for a, p in zip(last_prices["asset"], last_prices["close"])
-        }
+        last_prices = index.last_prices()
         self.results = {
             "pnl": self.portfolio.get_pnl(last_prices),
             "fills": self.portfolio.fills,
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Literal
+from typing import Any, Dict, Literal
 
 EventType = Literal["MARKET", "SIGNAL", "ORDER", "FILL"]
 
@@ -23,6 +23,7 @@ class SignalEvent(Event):
     asset: str | None = None
     quantity: float | None = None
     direction: str | None = None
+    timestamp: Any = None
 
 
 @dataclass
@@ -31,6 +32,7 @@ class OrderEvent(Event):
     asset: str | None = None
     quantity: float | None = None
     order_type: str = "market"
+    timestamp: Any = None
 
 
 @dataclass
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
+import heapq
+import itertools
 from abc import ABC, abstractmethod
-from collections import deque
 from datetime import timedelta
-from typing import Dict, List
+from typing import Any, Dict, List, Mapping
 
 import numpy as np
 
-from backtest_data_module.backtesting.events import OrderEvent, FillEvent
+from backtest_data_module.backtesting.events import OrderEvent
 
 
 class CommissionModel(ABC):
@@ -15,6 +16,12 @@ class CommissionModel(ABC):
     def calculate(self, quantity: float, price: float) -> float:
         pass
 
+    def calculate_batch(self, quantities: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """一次計算多筆成交的手續費，子類別可覆寫為向量化版本。"""
+        return np.array(
+            [self.calculate(q, p) for q, p in zip(quantities, prices)], dtype=float
+        )
+
 
 class FlatCommission(CommissionModel):
     def __init__(self, fee: float = 0.0005):
@@ -23,12 +30,23 @@ class FlatCommission(CommissionModel):
     def calculate(self, quantity: float, price: float) -> float:
         return self.fee * abs(quantity) * price
 
+    def calculate_batch(self, quantities: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        fees: np.ndarray = self.fee * np.abs(quantities) * prices
+        return fees
+
 
 class SlippageModel(ABC):
     @abstractmethod
-    def apply(self, price: float, quantity: float) -> float:
+    def apply(self, price: Mapping[str, float], quantity: float) -> float:
         pass
 
+    def apply_batch(self, prices: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        """依序套用滑價，``prices`` 為收盤價；結果與逐筆呼叫 ``apply`` 相同。"""
+        return np.array(
+            [self.apply({"close": p}, q) for p, q in zip(prices, quantities)],
+            dtype=float,
+        )
+
 
 class GaussianSlippage(SlippageModel):
     def __init__(self, mu: float = 0, sigma: float = 0.001, seed: int = None):
@@ -36,11 +54,15 @@ class GaussianSlippage(SlippageModel):
         self.sigma = sigma
         self.rng = np.random.default_rng(seed)
 
-    def apply(self, price: float, quantity: float) -> float:
+    def apply(self, price: Mapping[str, float], quantity: float) -> float:
         # Simulate slippage based on a normal distribution
         # A more advanced model could also consider the order size (quantity)
         return price["close"] * (1 + self.rng.normal(self.mu, self.sigma))
 
+    def apply_batch(self, prices: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        # 一次抽樣與逐筆抽樣的亂數序列相同
+        return prices * (1 + self.rng.normal(self.mu, self.sigma, size=len(prices)))
+
 
 class LatencyModel(ABC):
     @abstractmethod
@@ -57,6 +79,12 @@ class PoissonLatency(LatencyModel):
 
 
 class Execution:
+    """模擬下單與成交。
+
+    ``order_queue`` 為以 (執行時間, 序號, 訂單) 排序的 heap，執行時間相同的
+    訂單依下單順序成交。
+    """
+
     def __init__(
         self,
         commission_model: CommissionModel = FlatCommission(),
@@ -66,26 +94,29 @@ class Execution:
         self.commission_model = commission_model
         self.slippage_model = slippage_model
         self.latency_model = latency_model
-        self.order_queue = deque()
+        self.order_queue: List[tuple[Any, int, OrderEvent]] = []
+        self._seq = itertools.count()
 
     def place_order(self, order: OrderEvent, timestamp: float):
         delay = self.latency_model.get_delay()
         execution_time = timestamp + timedelta(seconds=delay)
-        self.order_queue.append((order, execution_time))
+        heapq.heappush(self.order_queue, (execution_time, next(self._seq), order))
+
+    def _due_orders(self, current_time: Any) -> List[OrderEvent]:
+        """取出所有執行時間不晚於 ``current_time`` 的訂單。"""
+        due = []
+        while self.order_queue and self.order_queue[0][0] <= current_time:
+            due.append(heapq.heappop(self.order_queue)[2])
+        return due
 
     def process_orders(
-        self, current_time: float, price_data: Dict[str, float]
-    ) -> List[FillEvent]:
+        self, current_time: Any, price_data: Mapping[Any, Mapping[str, float]]
+    ) -> List[Dict[str, Any]]:
         fills = []
 
-        # 依執行時間排序訂單以維持 FIFO
-        self.order_queue = deque(sorted(self.order_queue, key=lambda x: x[1]))
-
-        while self.order_queue and self.order_queue[0][1] <= current_time:
-            order, execution_time = self.order_queue.popleft()
-
-            if order.asset not in price_data:
-                # 若該資產無價格資料則略過
+        for order in self._due_orders(current_time):
+            if order.asset not in price_data or order.quantity is None:
+                # 若該資產無價格資料（或訂單未指定數量）則略過
                 # 目前僅直接跳過該訂單
                 continue
 
@@ -102,3 +133,42 @@ class Execution:
                 }
             )
         return fills
+
+    def process_orders_batch(
+        self,
+        current_time: Any,
+        close: np.ndarray,
+        asset_ids: Mapping[Any, int],
+    ) -> List[Dict[str, Any]]:
+        """一次處理當根 K 線所有到期訂單。
+
+        ``close`` 為各資產收盤價陣列（缺值為 NaN），``asset_ids`` 為資產對應的
+        欄位編號。滑價與手續費以批次模型計算，結果與 ``process_orders`` 相同，
+        皆為 ``Portfolio.update`` 接受的成交紀錄 dict。
+        """
+        due = self._due_orders(current_time)
+        if not due:
+            return []
+        cols = np.array(
+            [
+                asset_ids.get(o.asset, -1) if o.quantity is not None else -1
+                for o in due
+            ],
+            dtype=np.int64,
+        )
+        prices = np.where(cols >= 0, close[cols], np.nan)
+        keep = np.flatnonzero(np.isfinite(prices))
+        if not len(keep):
+            return []
+        quantities = np.array([due[k].quantity for k in keep], dtype=float)
+        slipped = self.slippage_model.apply_batch(prices[keep], quantities)
+        commissions = self.commission_model.calculate_batch(quantities, slipped)
+        return [
+            {
+                "asset": due[k].asset,
+                "quantity": due[k].quantity,
+                "price": float(p),
+                "commission": float(c),
+            }
+            for k, p, c in zip(keep, slipped, commissions)
+        ]
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Mapping, Sequence, Tuple
+
+import polars as pl
+
+from backtest_data_module.backtesting import indicators as ind
+
+IndicatorKey = Tuple[str, str, Tuple[Tuple[str, Any], ...], Hashable]
+
+INDICATORS: Dict[str, Callable[..., pl.Series]] = {
+    "rolling_mean": lambda s, window: s.rolling_mean(window_size=window),
+    "rolling_std": lambda s, window: s.rolling_std(window_size=window),
+}
+
+
+def fingerprint(data: pl.DataFrame, columns: Sequence[str] | None = None) -> str:
+    """依欄位結構與逐列雜湊計算資料指紋，不同程序間結果一致。
+
+    指定 ``columns`` 時只雜湊這些欄位，其他欄位不同的資料會得到相同指紋。
+    """
+    if columns is not None:
+        wanted = set(columns)
+        data = data.select(c for c in data.columns if c in wanted)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(data.schema).encode())
+    digest.update(data.hash_rows(seed=0).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _nbytes(value: pl.Series) -> int:
+    return int(value.estimated_size())
+
+
+def compute_indicator(
+    data: pl.DataFrame,
+    name: str,
+    asset: Hashable | None = None,
+    *,
+    column: str = "close",
+    **params: Any,
+) -> pl.Series:
+    """直接計算指標；指定 ``asset`` 時只使用該資產的資料列。"""
+    if name not in INDICATORS:
+        raise KeyError(f"未知的指標: {name}")
+    if asset is not None:
+        data = data.filter(pl.col("asset") == asset)
+    return INDICATORS[name](data[column], **params)
+
+
+class IndicatorCache:
+    """以 (資料指紋, 指標, 參數, 資產) 為鍵的指標快取。
+
+    超過 ``max_bytes`` 時淘汰最久未使用的項目。指紋只涵蓋指標實際讀取的
+    欄位，且同一個 DataFrame 只計算一次；內容相同的資料（例如以不同參數組合
+    重複執行同一切片）才會命中，內容不同的切片各自計算。物件可 pickle，
+    也可透過 ``shared_indicator_cache`` 放入 Ray actor 供多個 worker 共用。
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[IndicatorKey, pl.Series] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[
+            Tuple[int, Tuple[str, ...]], Tuple[weakref.ref[pl.DataFrame], str]
+        ] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_fingerprints"] = {}
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def fingerprint(self, data: pl.DataFrame, columns: Sequence[str]) -> str:
+        memo_key = (id(data), tuple(sorted(set(columns))))
+        cached = self._fingerprints.get(memo_key)
+        if cached is not None and cached[0]() is data:
+            return cached[1]
+        value = fingerprint(data, memo_key[1])
+        self._fingerprints = {
+            k: v for k, v in self._fingerprints.items() if v[0]() is not None
+        }
+        self._fingerprints[memo_key] = (weakref.ref(data), value)
+        return value
+
+    @staticmethod
+    def key(
+        data_fingerprint: str,
+        name: str,
+        params: Dict[str, Any],
+        asset: Hashable | None = None,
+    ) -> IndicatorKey:
+        return (data_fingerprint, name, tuple(sorted(params.items())), asset)
+
+    def get(self, key: IndicatorKey) -> pl.Series | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: IndicatorKey, value: pl.Series) -> None:
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= _nbytes(old)
+            self._items[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= _nbytes(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def lookup(self, key: IndicatorKey) -> pl.Series | None:
+        """與 ``get`` 相同，但在快取本身累計命中次數；放在 actor 時可統計各 worker。"""
+        value = self.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "items": len(self),
+            "bytes": self._bytes,
+        }
+
+    def indicator(
+        self,
+        data: pl.DataFrame,
+        name: str,
+        asset: Hashable | None = None,
+        *,
+        column: str = "close",
+        **params: Any,
+    ) -> pl.Series:
+        """取得指標，未命中時計算並寫入快取。"""
+        columns = [column] if asset is None else ["asset", column]
+        key = self.key(
+            self.fingerprint(data, columns),
+            name,
+            {"column": column, **params},
+            asset,
+        )
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = compute_indicator(data, name, asset, column=column, **params)
+        self.put(key, value)
+        return value
+
+    def compute(
+        self,
+        data: pl.DataFrame,
+        exprs: Mapping[str, pl.Expr],
+        *,
+        by: str = "asset",
+        time_col: str = "date",
+    ) -> pl.DataFrame:
+        """與 ``indicators.compute`` 相同，但只計算未命中快取的運算式。"""
+        if any(expr.meta.has_multiple_outputs() for expr in exprs.values()):
+            # 萬用字元或正規表示式選取的欄位無法事先列出，改雜湊全部欄位
+            columns = data.columns
+        else:
+            roots = {c for e in exprs.values() for c in e.meta.root_names()}
+            columns = [by, time_col, *roots]
+        data_fp = self.fingerprint(data, columns)
+        frame = ind.sort_frame(data, by, time_col)
+        keys = {
+            name: self.key(
+                data_fp,
+                "expr",
+                {
+                    "expr": expr.meta.serialize(format="json"),
+                    "by": by,
+                    "time_col": time_col,
+                },
+            )
+            for name, expr in exprs.items()
+        }
+        values: Dict[str, pl.Series] = {}
+        missing: Dict[str, pl.Expr] = {}
+        for name, expr in exprs.items():
+            value = self.get(keys[name])
+            if value is None:
+                missing[name] = expr
+            else:
+                values[name] = value
+        self.hits += len(values)
+        self.misses += len(missing)
+        if missing:
+            computed = frame.lazy().with_columns(**missing).collect()
+            for name in missing:
+                values[name] = computed[name]
+                self.put(keys[name], computed[name])
+        return frame.with_columns(values[name].alias(name) for name in exprs)
+
+
+class RemoteIndicatorCache(IndicatorCache):
+    """透過 Ray actor 存取共用快取，未命中時於本地計算後回存。"""
+
+    def __init__(self, handle: Any) -> None:
+        super().__init__(max_bytes=0)
+        self.handle = handle
+
+    def get(self, key: IndicatorKey) -> pl.Series | None:
+        import ray
+
+        value: pl.Series | None = ray.get(self.handle.lookup.remote(key))
+        return value
+
+    def put(self, key: IndicatorKey, value: pl.Series) -> None:
+        self.handle.put.remote(key, value)
+
+    def clear(self) -> None:
+        self.handle.clear.remote()
+
+    def stats(self) -> Dict[str, int]:
+        """回傳 actor 端累計的統計，涵蓋所有 worker。"""
+        import ray
+
+        stats: Dict[str, int] = ray.get(self.handle.stats.remote())
+        return stats
+
+
+def shared_indicator_cache(
+    max_bytes: int = 256 * 1024 * 1024,
+) -> RemoteIndicatorCache:
+    """建立存放於 Ray actor 的快取，回傳的物件可傳給各個 remote task。"""
+    import ray
+
+    actor = ray.remote(IndicatorCache).remote(max_bytes)
+    return RemoteIndicatorCache(actor)
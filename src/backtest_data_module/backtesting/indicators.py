@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Mapping, Tuple
+
+import polars as pl
+
+# 所有指標皆以 ``.over(by)`` 分資產計算，須先依資產內時間排序（見 ``compute``）
+
+
+def _col(column: str | pl.Expr) -> pl.Expr:
+    return pl.col(column) if isinstance(column, str) else column
+
+
+def sma(window: int, column: str = "close", by: str = "asset") -> pl.Expr:
+    return pl.col(column).rolling_mean(window_size=window).over(by)
+
+
+def ema(span: int, column: str = "close", by: str = "asset") -> pl.Expr:
+    return pl.col(column).ewm_mean(span=span, adjust=False).over(by)
+
+
+def rolling_std(window: int, column: str = "close", by: str = "asset") -> pl.Expr:
+    return pl.col(column).rolling_std(window_size=window).over(by)
+
+
+def zscore(window: int, column: str = "close", by: str = "asset") -> pl.Expr:
+    """與近 ``window`` 期平均的差距，以標準差為單位。"""
+    col = pl.col(column)
+    return (
+        (col - col.rolling_mean(window_size=window))
+        / col.rolling_std(window_size=window)
+    ).over(by)
+
+
+def rsi(window: int = 14, column: str = "close", by: str = "asset") -> pl.Expr:
+    """Wilder RSI，平均漲跌幅以 ``alpha=1/window`` 的指數平均計算。"""
+    delta = pl.col(column).diff()
+    gain = delta.clip(lower_bound=0).ewm_mean(alpha=1 / window, adjust=False)
+    loss = (-delta).clip(lower_bound=0).ewm_mean(alpha=1 / window, adjust=False)
+    return (100 - 100 / (1 + gain / loss)).over(by)
+
+
+def atr(
+    window: int = 14,
+    high: str = "high",
+    low: str = "low",
+    close: str = "close",
+    by: str = "asset",
+) -> pl.Expr:
+    """平均真實區間，真實區間取高低差與前收盤跳空的最大值。"""
+    prev_close = pl.col(close).shift(1)
+    true_range = pl.max_horizontal(
+        pl.col(high) - pl.col(low),
+        (pl.col(high) - prev_close).abs(),
+        (pl.col(low) - prev_close).abs(),
+    )
+    return true_range.rolling_mean(window_size=window).over(by)
+
+
+def bollinger(
+    window: int = 20, k: float = 2.0, column: str = "close", by: str = "asset"
+) -> Tuple[pl.Expr, pl.Expr, pl.Expr]:
+    """回傳 (中軌, 上軌, 下軌)。"""
+    mid = sma(window, column, by)
+    width = k * rolling_std(window, column, by)
+    return mid, mid + width, mid - width
+
+
+def returns(
+    periods: int = 1, column: str = "close", by: str = "asset", log: bool = False
+) -> pl.Expr:
+    col = pl.col(column)
+    if log:
+        return (col / col.shift(periods)).log().over(by)
+    return col.pct_change(periods).over(by)
+
+
+def crossover(
+    fast: str | pl.Expr, slow: str | pl.Expr, by: str = "asset"
+) -> pl.Expr:
+    """``fast`` 由下往上穿越 ``slow`` 的時點；參數為欄位名稱或非視窗運算式。"""
+    f, s = _col(fast), _col(slow)
+    return ((f > s) & (f.shift(1) <= s.shift(1))).over(by)
+
+
+def crossunder(
+    fast: str | pl.Expr, slow: str | pl.Expr, by: str = "asset"
+) -> pl.Expr:
+    """``fast`` 由上往下穿越 ``slow`` 的時點。"""
+    f, s = _col(fast), _col(slow)
+    return ((f < s) & (f.shift(1) >= s.shift(1))).over(by)
+
+
+def sort_frame(
+    data: pl.DataFrame, by: str = "asset", time_col: str = "date"
+) -> pl.DataFrame:
+    """依資產、時間排序；無時間欄位時僅依資產排序並保留原順序。"""
+    keys = [by, time_col] if time_col in data.columns else [by]
+    return data.sort(keys, maintain_order=True)
+
+
+def compute(
+    data: pl.DataFrame,
+    indicators: Mapping[str, pl.Expr],
+    *,
+    by: str = "asset",
+    time_col: str = "date",
+) -> pl.DataFrame:
+    """以單一查詢計算所有資產與所有指標，``indicators`` 為欄位名稱 → 運算式。"""
+    return (
+        sort_frame(data, by, time_col).lazy().with_columns(**indicators).collect()
+    )
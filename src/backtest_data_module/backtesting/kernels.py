@@ -0,0 +1,194 @@
+"""路徑相依交易規則的 NumPy 迴圈核心。
+
+安裝 Numba 時以 ``njit`` 編譯，否則以純 Python 執行，結果相同。
+輸入皆為時間 × 資產的 float64 陣列，輸出的目標部位矩陣可直接交給
+``Backtest.run_vectorized(..., targets=True)``。
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, TypeVar
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except Exception:  # noqa: BLE001
+    njit = None
+    NUMBA_AVAILABLE = False
+
+# exit_reason 代碼
+NO_EXIT = 0
+STOP_EXIT = 1
+TARGET_EXIT = 2
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _jit(fn: F) -> F:
+    """有 Numba 時編譯，否則原樣回傳。"""
+    if njit is None:
+        return fn
+    compiled: F = njit(cache=True, nogil=True)(fn)
+    return compiled
+
+
+@_jit
+def _stop_target_exits(
+    close: np.ndarray, signals: np.ndarray, stop_pct: float, target_pct: float
+) -> tuple[np.ndarray, np.ndarray]:
+    n_rows, n_cols = close.shape
+    direction = np.zeros((n_rows, n_cols))
+    reason = np.zeros((n_rows, n_cols), dtype=np.int8)
+    for j in range(n_cols):
+        side = 0.0
+        entry = 0.0
+        for i in range(n_rows):
+            price = close[i, j]
+            if math.isnan(price):
+                direction[i, j] = side
+                continue
+            if side != 0.0:
+                change = side * (price / entry - 1.0)
+                if change <= -stop_pct:
+                    side = 0.0
+                    reason[i, j] = STOP_EXIT
+                elif change >= target_pct:
+                    side = 0.0
+                    reason[i, j] = TARGET_EXIT
+            elif signals[i, j] > 0.0 or signals[i, j] < 0.0:
+                side = 1.0 if signals[i, j] > 0.0 else -1.0
+                entry = price
+            direction[i, j] = side
+    return direction, reason
+
+
+@_jit
+def _trailing_stop(
+    close: np.ndarray, signals: np.ndarray, trail_pct: float
+) -> np.ndarray:
+    n_rows, n_cols = close.shape
+    direction = np.zeros((n_rows, n_cols))
+    for j in range(n_cols):
+        side = 0.0
+        extreme = 0.0
+        for i in range(n_rows):
+            price = close[i, j]
+            if math.isnan(price):
+                direction[i, j] = side
+                continue
+            if side > 0.0:
+                extreme = max(extreme, price)
+                if price <= extreme * (1.0 - trail_pct):
+                    side = 0.0
+            elif side < 0.0:
+                extreme = min(extreme, price)
+                if price >= extreme * (1.0 + trail_pct):
+                    side = 0.0
+            elif signals[i, j] > 0.0 or signals[i, j] < 0.0:
+                side = 1.0 if signals[i, j] > 0.0 else -1.0
+                extreme = price
+            direction[i, j] = side
+    return direction
+
+
+@_jit
+def _volatility_sizing(
+    close: np.ndarray,
+    direction: np.ndarray,
+    capital: float,
+    target_vol: float,
+    window: int,
+    max_weight: float,
+) -> np.ndarray:
+    n_rows, n_cols = close.shape
+    weights = np.zeros((n_rows, n_cols))
+    for j in range(n_cols):
+        for i in range(window, n_rows):
+            if direction[i, j] == 0.0:
+                continue
+            total = 0.0
+            total_sq = 0.0
+            count = 0
+            for k in range(i - window + 1, i + 1):
+                r = close[k, j] / close[k - 1, j] - 1.0
+                if not math.isnan(r):
+                    total += r
+                    total_sq += r * r
+                    count += 1
+            if count < window:
+                continue
+            mean = total / count
+            vol = math.sqrt(max(total_sq / count - mean * mean, 0.0))
+            weight = max_weight if vol == 0.0 else min(target_vol / vol, max_weight)
+            weights[i, j] = direction[i, j] * weight
+    shares = np.zeros((n_rows, n_cols))
+    for i in range(n_rows):
+        # 總曝險不得超過資金
+        gross = 0.0
+        for j in range(n_cols):
+            gross += abs(weights[i, j])
+        scale = 1.0 / gross if gross > 1.0 else 1.0
+        for j in range(n_cols):
+            price = close[i, j]
+            if weights[i, j] != 0.0 and not math.isnan(price) and price > 0.0:
+                shares[i, j] = math.trunc(weights[i, j] * scale * capital / price)
+    return shares
+
+
+def stop_target_exits(
+    close: np.ndarray,
+    signals: np.ndarray,
+    stop_pct: float,
+    target_pct: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """依停損與停利出場。
+
+    空手時 ``signals`` 為正進多、為負進空，以當根收盤價為進場價；持有時
+    報酬跌破 ``-stop_pct`` 或超過 ``target_pct`` 即出場，出場當根不再進場。
+    回傳各時點的方向（1、0、-1）與出場原因（``STOP_EXIT``、``TARGET_EXIT``）。
+    """
+    return _stop_target_exits(
+        np.asarray(close, dtype=np.float64),
+        np.asarray(signals, dtype=np.float64),
+        float(stop_pct),
+        float(target_pct),
+    )
+
+
+def trailing_stop(
+    close: np.ndarray, signals: np.ndarray, trail_pct: float
+) -> np.ndarray:
+    """移動停損：價格自進場後的最高（空單為最低）點回檔 ``trail_pct`` 即出場。"""
+    return _trailing_stop(
+        np.asarray(close, dtype=np.float64),
+        np.asarray(signals, dtype=np.float64),
+        float(trail_pct),
+    )
+
+
+def volatility_sizing(
+    close: np.ndarray,
+    direction: np.ndarray,
+    capital: float,
+    target_vol: float,
+    window: int = 20,
+    max_weight: float = 1.0,
+) -> np.ndarray:
+    """依近期波動度調整部位股數。
+
+    權重為 ``target_vol`` 除以最近 ``window`` 期報酬標準差，上限為
+    ``max_weight``；同一時點總權重超過 1 時等比例縮減，確保不超過資金。
+    波動度資料不足的時點不持有部位。
+    """
+    return _volatility_sizing(
+        np.asarray(close, dtype=np.float64),
+        np.asarray(direction, dtype=np.float64),
+        float(capital),
+        float(target_vol),
+        int(window),
+        float(max_weight),
+    )
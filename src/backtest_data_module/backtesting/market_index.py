@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+import polars as pl
+
+from backtest_data_module.backtesting.vectorized import as_of_prices, close_matrix
+
+
+class MarketIndex:
+    """回測資料的預先計算索引，避免每次查詢都掃描整個資料表。
+
+    - ``asset_ranges``：依 (asset, date) 排序後，各資產所佔的列範圍。
+    - ``date_slices``：依 (date, asset) 排序後，各時間點所佔的列範圍。
+    - ``close``：時間 × 資產的收盤價矩陣，缺值為 NaN。
+    """
+
+    def __init__(self, data: pl.DataFrame) -> None:
+        self.dates, self.assets, self.close = close_matrix(data)
+        self.asset_ids: Dict[Any, int] = {a: j for j, a in enumerate(self.assets)}
+        self.date_ids: Dict[Any, int] = {
+            d: i for i, d in enumerate(self.dates.to_list())
+        }
+
+        self.by_asset = data.sort(["asset", "date"], maintain_order=True)
+        self.asset_ranges: Dict[Any, slice] = self._ranges(self.by_asset["asset"])
+        self.by_date = data.sort(["date", "asset"], maintain_order=True)
+        self.date_slices: Dict[Any, slice] = self._ranges(self.by_date["date"])
+
+        self._first_times = {
+            asset: self.by_asset["date"][rows.start]
+            for asset, rows in self.asset_ranges.items()
+        }
+        self._as_of: np.ndarray | None = None
+
+    @staticmethod
+    def _ranges(keys: pl.Series) -> Dict[Any, slice]:
+        """排序後的鍵值 → 連續列範圍。"""
+        values = keys.to_list()
+        if not values:
+            return {}
+        bounds = np.flatnonzero(keys.ne_missing(keys.shift(1)).to_numpy())
+        ends = np.append(bounds[1:], len(values))
+        return {values[s]: slice(int(s), int(e)) for s, e in zip(bounds, ends)}
+
+    def first_timestamp(self, asset: Any) -> Any:
+        """資產第一筆資料的時間。"""
+        return self._first_times[asset]
+
+    def asset_frame(self, asset: Any) -> pl.DataFrame:
+        """單一資產依時間排序的資料，為零複製切片。"""
+        rows = self.asset_ranges[asset]
+        return self.by_asset.slice(rows.start, rows.stop - rows.start)
+
+    def date_frame(self, timestamp: Any) -> pl.DataFrame:
+        rows = self.date_slices[timestamp]
+        return self.by_date.slice(rows.start, rows.stop - rows.start)
+
+    def snapshot(self, timestamp: Any) -> Dict[Any, Dict[str, float]]:
+        """指定時間點各資產的報價，格式與 ``Execution.process_orders`` 相同。"""
+        return self.snapshot_row(self.date_ids[timestamp])
+
+    def snapshot_row(self, i: int) -> Dict[Any, Dict[str, float]]:
+        row = self.close[i]
+        valid = np.flatnonzero(np.isfinite(row))
+        return {self.assets[j]: {"close": float(row[j])} for j in valid}
+
+    def as_of(self) -> np.ndarray:
+        """以最近一筆有效報價補值的收盤價矩陣，首次呼叫後快取。"""
+        if self._as_of is None:
+            self._as_of = as_of_prices(self.close)
+        return self._as_of
+
+    def last_prices(self) -> Dict[Any, float]:
+        """各資產最後一筆有效收盤價。"""
+        if not len(self.dates):
+            return {}
+        last = self.as_of()[-1]
+        has_price = np.isfinite(self.close).any(axis=0)
+        return {
+            asset: float(last[j])
+            for j, asset in enumerate(self.assets)
+            if has_price[j]
+        }
+
+    def ids(self, assets: List[Any]) -> np.ndarray:
+        """將資產名稱轉為矩陣欄位編號，未知資產為 -1。"""
+        return np.array([self.asset_ids.get(a, -1) for a in assets], dtype=np.int64)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 import os
-from typing import List, Type
+from typing import Any, List, Type
 from pathlib import Path
 
 import httpx
@@ -12,6 +12,11 @@ import ray
 
 from backtest_data_module.backtesting.engine import Backtest
 from backtest_data_module.backtesting.execution import Execution
+from backtest_data_module.backtesting.indicator_cache import (
+    IndicatorCache,
+    RemoteIndicatorCache,
+    shared_indicator_cache,
+)
 from backtest_data_module.backtesting.performance import Performance
 from backtest_data_module.backtesting.portfolio import Portfolio
 from backtest_data_module.backtesting.strategy import StrategyBase
@@ -37,12 +42,14 @@ def run_backtest_slice(
     train_data: pd.DataFrame,
     test_data: pd.DataFrame,
     slice_id: int,
+    indicator_cache: IndicatorCache | None = None,
 ) -> dict:
     """
     在獨立的 Ray 程序中執行單一回測切片。
     """
     strategy_cls = strategy_registry.get_strategy(strategy_name)
     strategy = strategy_cls(**strategy_params)
+    strategy.indicator_cache = indicator_cache
     portfolio = portfolio_cls(**portfolio_params)
     execution = execution_cls(**execution_params)
     performance = performance_cls()
@@ -86,6 +93,9 @@ class Orchestrator:
         self.run_id = None
         self.hyperparams = None
         self.register_api = register_api
+        self.indicator_cache: IndicatorCache | None = None
+        self.remote_indicator_cache: RemoteIndicatorCache | None = None
+        self._remote_cache_job: str | None = None
         if self.register_api:
             self.api_client = httpx.Client(
                 base_url=self.register_api,
@@ -163,12 +173,19 @@ class Orchestrator:
         try:
             results = []
             slices = self._get_slices(config, data)
+            # 快取保留在 Orchestrator 上：之後以相同資料再次執行（例如參數掃描）時，
+            # 同一切片中參數相同的指標直接沿用；切片之間資料不同，指紋不同不會命中
+            if self.indicator_cache is None:
+                self.indicator_cache = IndicatorCache(
+                    config.get("indicator_cache_bytes", 256 * 1024 * 1024)
+                )
 
             for i, (train_indices, test_indices) in enumerate(slices):
                 train_data = data.iloc[train_indices]
                 test_data = data.iloc[test_indices]
 
                 strategy = self.strategy_cls(**self.hyperparams)
+                strategy.indicator_cache = self.indicator_cache
                 portfolio = self.portfolio_cls(**config.get("portfolio_params", {}))
                 execution = self.execution_cls(**config.get("execution_params", {}))
                 performance = self.performance_cls()
@@ -207,8 +224,10 @@ class Orchestrator:
         self._create_run("walk_forward" if "walk_forward" in config else "cpcv")
         self._update_run_status("RUNNING")
 
+        owns_ray = not ray.is_initialized()
         try:
             ray.init(ignore_reinit_error=True)
+            indicator_cache = self._remote_cache(config)
 
             results_refs = []
             slices = self._get_slices(config, data)
@@ -218,7 +237,8 @@ class Orchestrator:
                 test_data = data.iloc[test_indices]
 
                 results_refs.append(
-                    run_backtest_slice.remote(
+                    # Ray 的型別定義最多只涵蓋 10 個參數
+                    run_backtest_slice.remote(  # type: ignore[call-arg]
                         self.strategy_name,
                         self.portfolio_cls,
                         self.execution_cls,
@@ -229,6 +249,7 @@ class Orchestrator:
                         train_data,
                         test_data,
                         i,
+                        indicator_cache=indicator_cache,
                     )
                 )
 
@@ -237,12 +258,25 @@ class Orchestrator:
             metrics_uri = f"metrics/{self.run_id}_summary.json"
             self.to_json(metrics_uri)
             self._update_run_status("COMPLETED", metrics_uri=metrics_uri)
-            ray.shutdown()
             return results
         except Exception as e:
             self._update_run_status("FAILED", error_message=str(e))
-            ray.shutdown()
             raise
+        finally:
+            # 由呼叫端啟動的 Ray 保持運作，快取 actor 留待下次執行沿用
+            if owns_ray:
+                ray.shutdown()
+                self.remote_indicator_cache = None
+
+    def _remote_cache(self, config: dict[str, Any]) -> RemoteIndicatorCache:
+        """取得所有切片共用的 actor 快取，同一個 Ray 工作階段內重複使用。"""
+        job = ray.get_runtime_context().get_job_id()
+        if self.remote_indicator_cache is None or self._remote_cache_job != job:
+            self.remote_indicator_cache = shared_indicator_cache(
+                config.get("indicator_cache_bytes", 256 * 1024 * 1024)
+            )
+            self._remote_cache_job = job
+        return self.remote_indicator_cache
 
     def to_json(self, filepath: str):
         with open(filepath, "w") as f:
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
+import polars as pl
 import pyarrow as pa
 from scipy.stats import kurtosis, norm, skew
 
@@ -50,21 +52,28 @@ class Performance:
             downside_std_dev * np.sqrt(periods_in_year)
         )
 
-    def _max_drawdown(self) -> Tuple[float, int]:
-        if not self.nav_series:
-            return 0.0, 0
+    def _drawdowns(self) -> np.ndarray:
+        """各期相對於歷史高點的回落幅度。"""
         nav_series = np.array(self.nav_series)
         cumulative_max = np.maximum.accumulate(nav_series)
-        drawdowns = (nav_series - cumulative_max) / cumulative_max
+        drawdowns: np.ndarray = (nav_series - cumulative_max) / cumulative_max
+        return drawdowns
+
+    def _max_drawdown(
+        self, drawdowns: np.ndarray | None = None
+    ) -> Tuple[float, int]:
+        if not self.nav_series:
+            return 0.0, 0
+        if drawdowns is None:
+            drawdowns = self._drawdowns()
         max_drawdown = np.min(drawdowns) if len(drawdowns) > 0 else 0.0
         return max_drawdown, np.argmin(drawdowns) if len(drawdowns) > 0 else 0
 
-    def _max_drawdown_duration(self) -> int:
+    def _max_drawdown_duration(self, drawdowns: np.ndarray | None = None) -> int:
         if not self.nav_series:
             return 0
-        nav_series = np.array(self.nav_series)
-        cumulative_max = np.maximum.accumulate(nav_series)
-        drawdowns = (nav_series - cumulative_max) / cumulative_max
+        if drawdowns is None:
+            drawdowns = self._drawdowns()
 
         in_drawdown = drawdowns < 0
         if not np.any(in_drawdown):
@@ -93,18 +102,166 @@ class Performance:
             return np.percentile(np.abs(self.returns), confidence_level * 100)
 
     def compute_metrics(self) -> PerformanceSummary:
-        max_drawdown, _ = self._max_drawdown()
+        # 回撤序列只計算一次，供兩項回撤指標共用
+        drawdowns = self._drawdowns() if self.nav_series else None
+        max_drawdown, _ = self._max_drawdown(drawdowns)
         return PerformanceSummary(
             {
                 "total_return": self._total_return(),
                 "sharpe": self._sharpe(),
                 "sortino": self._sortino(),
                 "max_drawdown": max_drawdown,
-                "max_drawdown_duration": self._max_drawdown_duration(),
+                "max_drawdown_duration": self._max_drawdown_duration(drawdowns),
                 "var_95_cornish_fisher": self._var(0.95, "cornish-fisher"),
             }
         )
 
+    def confidence_intervals(
+        self,
+        n_resamples: int = 10_000,
+        *,
+        method: str = "stationary",
+        block_size: int | None = None,
+        level: float = 0.95,
+        seed: int | None = None,
+        workers: int = 1,
+    ) -> pl.DataFrame:
+        """以重抽樣報酬估計各項指標的信賴區間，參數見 ``bootstrap_metrics``。"""
+        samples = bootstrap_metrics(
+            self.returns,
+            n_resamples,
+            method=method,
+            block_size=block_size,
+            seed=seed,
+            workers=workers,
+        )
+        return confidence_intervals(
+            samples, self.compute_metrics().metrics, level=level
+        )
+
+
+class OnlineMetrics:
+    """逐期更新的績效指標，每次 ``update`` 為 O(1)，不需保存 NAV 序列。
+
+    報酬的平均與變異數以 Welford 法累計，並累計三、四階中央動差供
+    Cornish-Fisher VaR 使用；下檔報酬另外累計以計算 Sortino。
+    ``compute_metrics`` 的欄位與公式與 ``Performance`` 相同。
+    """
+
+    def __init__(self, periods_in_year: int = 252, risk_free_rate: float = 0.0):
+        self.periods_in_year = periods_in_year
+        self.risk_free_rate = risk_free_rate
+        self.first_nav: float | None = None
+        self.last_nav: float | None = None
+        self.peak = -np.inf
+        self.max_drawdown = 0.0
+        self.drawdown_length = 0
+        self.max_drawdown_duration = 0
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.down_n = 0
+        self.down_mean = 0.0
+        self.down_m2 = 0.0
+
+    def update(self, nav: float) -> None:
+        if self.last_nav is None:
+            self.first_nav = nav
+        else:
+            self._add_return(nav / self.last_nav - 1)
+        self.last_nav = nav
+
+        self.peak = max(self.peak, nav)
+        drawdown = (nav - self.peak) / self.peak
+        self.max_drawdown = min(self.max_drawdown, drawdown)
+        self.drawdown_length = self.drawdown_length + 1 if drawdown < 0 else 0
+        self.max_drawdown_duration = max(
+            self.max_drawdown_duration, self.drawdown_length
+        )
+
+    def _add_return(self, r: float) -> None:
+        n1 = self.n
+        self.n += 1
+        delta = r - self.mean
+        delta_n = delta / self.n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        self.mean += delta_n
+        self.m4 += (
+            term1 * delta_n2 * (self.n * self.n - 3 * self.n + 3)
+            + 6 * delta_n2 * self.m2
+            - 4 * delta_n * self.m3
+        )
+        self.m3 += term1 * delta_n * (self.n - 2) - 3 * delta_n * self.m2
+        self.m2 += term1
+
+        if r < 0:
+            self.down_n += 1
+            down_delta = r - self.down_mean
+            self.down_mean += down_delta / self.down_n
+            self.down_m2 += down_delta * (r - self.down_mean)
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / self.n)) if self.n else 0.0
+
+    def total_return(self) -> float:
+        if self.first_nav is None or self.last_nav is None:
+            return 0.0
+        return self.last_nav / self.first_nav - 1
+
+    def sharpe(self) -> float:
+        if self.n == 0 or self.std == 0:
+            return 0.0
+        return float(
+            (self.mean * self.periods_in_year - self.risk_free_rate)
+            / (self.std * np.sqrt(self.periods_in_year))
+        )
+
+    def sortino(self) -> float:
+        if self.n == 0:
+            return 0.0
+        if self.down_n == 0:
+            return np.inf
+        down_std = np.sqrt(self.down_m2 / self.down_n)
+        if down_std == 0.0:
+            return np.inf
+        return float(
+            (self.mean * self.periods_in_year - self.risk_free_rate)
+            / (down_std * np.sqrt(self.periods_in_year))
+        )
+
+    def var(self, confidence_level: float = 0.95) -> float:
+        """Cornish-Fisher VaR，偏態與峰態與 scipy 預設（有偏估計）相同。"""
+        if self.n == 0:
+            return 0.0
+        variance = self.m2 / self.n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = (self.m3 / self.n) / variance**1.5
+            k = (self.m4 / self.n) / variance**2
+        z = norm.ppf(confidence_level)
+        t = (
+            z
+            + (z**2 - 1) * s / 6
+            + (z**3 - 3 * z) * (k - 3) / 24
+            - (2 * z**3 - 5 * z) * s**2 / 36
+        )
+        return float(-(self.mean + t * self.std))
+
+    def compute_metrics(self) -> PerformanceSummary:
+        return PerformanceSummary(
+            {
+                "total_return": self.total_return(),
+                "sharpe": self.sharpe(),
+                "sortino": self.sortino(),
+                "max_drawdown": self.max_drawdown,
+                "max_drawdown_duration": self.max_drawdown_duration,
+                "var_95_cornish_fisher": self.var(0.95),
+            }
+        )
+
 
 class PerformanceSummary:
     def __init__(self, metrics: Dict[str, float]):
@@ -120,3 +277,229 @@ class PerformanceSummary:
 
     def to_dataframe(self) -> pd.DataFrame:
         return pd.DataFrame([self.metrics])
+
+
+def pad_nav_series(
+    nav_series: Sequence[Sequence[float]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """將長度不一的 NAV 序列補齊為序列 × 時間陣列，回傳 (陣列, 有效遮罩)。"""
+    width = max((len(series) for series in nav_series), default=0)
+    nav = np.full((len(nav_series), width), np.nan)
+    mask = np.zeros((len(nav_series), width), dtype=bool)
+    for i, series in enumerate(nav_series):
+        nav[i, : len(series)] = series
+        mask[i, : len(series)] = True
+    return nav, mask
+
+
+def batch_metrics(
+    nav: np.ndarray,
+    mask: np.ndarray | None = None,
+    *,
+    ids: Sequence[Any] | None = None,
+    risk_free_rate: float = 0.0,
+    periods_in_year: int = 252,
+) -> pl.DataFrame:
+    """一次計算多條 NAV 序列的績效，每條序列一列。
+
+    ``nav`` 為序列 × 時間陣列，``mask`` 標記有效的時點（預設為非 NaN），
+    無效時點會被略過，報酬以相鄰的有效時點計算。欄位與公式與
+    ``Performance.compute_metrics`` 相同；指定 ``ids`` 時加上 ``series`` 欄。
+    """
+    nav = np.atleast_2d(np.asarray(nav, dtype=np.float64))
+    mask = np.isfinite(nav) if mask is None else np.asarray(mask, dtype=bool)
+    n_series, width = nav.shape
+    rows = np.arange(n_series)[:, None]
+    if not mask.all():
+        # 有效時點移到每列前端，之後只需處理前綴
+        order = np.argsort(~mask, axis=1, kind="stable")
+        nav = nav[rows, order]
+    lengths = mask.sum(axis=1)
+    valid = np.arange(width)[None, :] < lengths[:, None]
+    values = np.where(valid, nav, 1.0)
+    last = values[np.arange(n_series), np.maximum(lengths - 1, 0)]
+    total_return = np.where(lengths > 0, last / values[:, 0] - 1, 0.0)
+
+    n = np.maximum(lengths - 1, 0)
+    r_valid = valid[:, 1:]
+    returns = np.where(r_valid, values[:, 1:] / values[:, :-1] - 1, 0.0)
+    safe_n = np.maximum(n, 1)
+    mean = returns.sum(axis=1) / safe_n
+    dev = np.where(r_valid, returns - mean[:, None], 0.0)
+    m2 = (dev**2).sum(axis=1) / safe_n
+    m3 = (dev**3).sum(axis=1) / safe_n
+    m4 = (dev**4).sum(axis=1) / safe_n
+    std = np.sqrt(m2)
+    excess = mean * periods_in_year - risk_free_rate
+    scale = np.sqrt(periods_in_year)
+    has_returns = n > 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(has_returns & (std != 0), excess / (std * scale), 0.0)
+
+        down = r_valid & (returns < 0)
+        down_n = down.sum(axis=1)
+        down_mean = np.where(down, returns, 0.0).sum(axis=1) / np.maximum(down_n, 1)
+        down_std = np.sqrt(
+            np.where(down, (returns - down_mean[:, None]) ** 2, 0.0).sum(axis=1)
+            / np.maximum(down_n, 1)
+        )
+        sortino = np.where(down_std != 0, excess / (down_std * scale), np.inf)
+        sortino = np.where(has_returns, sortino, 0.0)
+
+        s = m3 / m2**1.5
+        k = m4 / m2**2
+        z = norm.ppf(0.95)
+        t = (
+            z
+            + (z**2 - 1) * s / 6
+            + (z**3 - 3 * z) * (k - 3) / 24
+            - (2 * z**3 - 5 * z) * s**2 / 36
+        )
+        var = np.where(has_returns, -(mean + t * std), 0.0)
+
+    # 補值為 1.0 且位於有效前綴之後，不影響有效時點的歷史高點
+    peak = np.maximum.accumulate(values, axis=1)
+    drawdowns = np.where(valid, (values - peak) / peak, 0.0)
+    max_drawdown = drawdowns.min(axis=1) if width else np.zeros(n_series)
+    # 連續回撤長度：累計回撤期數，於非回撤時點歸零
+    in_drawdown = drawdowns < 0
+    count = np.cumsum(in_drawdown, axis=1)
+    reset = np.maximum.accumulate(np.where(in_drawdown, 0, count), axis=1)
+    run = count - reset
+    duration = run.max(axis=1) if width else np.zeros(n_series, dtype=np.int64)
+
+    table = pl.DataFrame(
+        {
+            "total_return": total_return,
+            "sharpe": sharpe,
+            "sortino": sortino,
+            "max_drawdown": max_drawdown,
+            "max_drawdown_duration": duration,
+            "var_95_cornish_fisher": var,
+        }
+    )
+    if ids is not None:
+        table = table.insert_column(0, pl.Series("series", list(ids)))
+    return table
+
+
+BOOTSTRAP_METHODS = ("stationary", "block", "iid", "normal")
+
+
+def bootstrap_indices(
+    n: int,
+    n_resamples: int,
+    rng: np.random.Generator,
+    *,
+    method: str = "stationary",
+    block_size: int | None = None,
+) -> np.ndarray:
+    """一次產生所有重抽樣的索引，回傳重抽樣 × 時間的整數陣列。
+
+    ``block`` 為環狀移動區塊，區塊長度固定；``stationary`` 為
+    Politis-Romano 平穩 bootstrap，區塊長度服從平均 ``block_size`` 的
+    幾何分配；``iid`` 為逐期獨立抽樣。區塊預設長度為 ``n ** (1/3)``。
+    """
+    if block_size is None:
+        block_size = max(1, round(n ** (1 / 3)))
+    if method == "iid":
+        return rng.integers(0, n, (n_resamples, n))
+    if method == "block":
+        n_blocks = -(-n // block_size)
+        starts = rng.integers(0, n, (n_resamples, n_blocks))
+        idx = starts[:, :, None] + np.arange(block_size)
+        return (idx.reshape(n_resamples, -1)[:, :n] % n).astype(np.int64)
+    if method == "stationary":
+        steps = np.arange(n)
+        new_block = rng.random((n_resamples, n)) < 1 / block_size
+        new_block[:, 0] = True
+        starts = rng.integers(0, n, (n_resamples, n))
+        # 每個時點所屬區塊的起點位置
+        block_start = np.maximum.accumulate(np.where(new_block, steps, 0), axis=1)
+        first = np.take_along_axis(starts, block_start, axis=1)
+        positions: np.ndarray = (first + steps - block_start) % n
+        return positions
+    raise ValueError(f"未知的重抽樣方法: {method}")
+
+
+def bootstrap_metrics(
+    returns: np.ndarray,
+    n_resamples: int = 10_000,
+    *,
+    method: str = "stationary",
+    block_size: int | None = None,
+    seed: int | np.random.SeedSequence | None = None,
+    chunk_size: int = 1_000,
+    workers: int = 1,
+    risk_free_rate: float = 0.0,
+    periods_in_year: int = 252,
+) -> pl.DataFrame:
+    """對報酬序列重抽樣並以 ``batch_metrics`` 計算每組樣本的指標。
+
+    ``method`` 為 ``BOOTSTRAP_METHODS`` 之一，``normal`` 以樣本平均與標準差
+    抽取常態報酬（Monte Carlo）。重抽樣依 ``chunk_size`` 分塊，每塊使用由
+    ``seed`` 衍生的獨立亂數流，相同 ``seed`` 與 ``chunk_size`` 的結果與
+    ``workers`` 數量無關。
+    """
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"未知的重抽樣方法: {method}")
+    returns = np.asarray(returns, dtype=np.float64)
+    returns = returns[np.isfinite(returns)]
+    n = len(returns)
+    sizes = [
+        min(chunk_size, n_resamples - start)
+        for start in range(0, n_resamples, chunk_size)
+    ]
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(len(sizes))
+
+    def run_chunk(args: Tuple[int, np.random.SeedSequence]) -> pl.DataFrame:
+        size, chunk_seed = args
+        rng = np.random.default_rng(chunk_seed)
+        if method == "normal":
+            sample = rng.normal(returns.mean(), returns.std(), (size, n))
+        else:
+            idx = bootstrap_indices(
+                n, size, rng, method=method, block_size=block_size
+            )
+            sample = returns[idx]
+        nav = np.ones((size, n + 1))
+        np.cumprod(1 + sample, axis=1, out=nav[:, 1:])
+        return batch_metrics(
+            nav, risk_free_rate=risk_free_rate, periods_in_year=periods_in_year
+        )
+
+    if n == 0 or not sizes:
+        return batch_metrics(np.ones((n_resamples, 1)))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        chunks = list(executor.map(run_chunk, zip(sizes, seeds)))
+    return pl.concat(chunks)
+
+
+def confidence_intervals(
+    samples: pl.DataFrame,
+    estimates: Dict[str, float] | None = None,
+    *,
+    level: float = 0.95,
+) -> pl.DataFrame:
+    """由重抽樣指標計算百分位數信賴區間，每項指標一列；非有限值不計入。"""
+    alpha = (1 - level) / 2
+    rows = []
+    for name in samples.columns:
+        values = samples[name].cast(pl.Float64).to_numpy()
+        values = values[np.isfinite(values)]
+        lower, upper = (
+            np.quantile(values, [alpha, 1 - alpha]) if len(values) else (np.nan,) * 2
+        )
+        rows.append(
+            {
+                "metric": name,
+                "estimate": float((estimates or {}).get(name, np.nan)),
+                "lower": float(lower),
+                "upper": float(upper),
+                "std_error": float(values.std()) if len(values) else np.nan,
+            }
+        )
+    return pl.DataFrame(rows)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict, List, Any
+from typing import Any, Dict, List, Mapping, Protocol, Sequence
+
+import numpy as np
 
 
 class Position:
@@ -32,11 +34,20 @@ class Position:
         return (current_price - self.cost_basis) * self.quantity
 
 
+class PortfolioView(Protocol):
+    """``RiskManager`` 檢查成交時可讀取的投資組合狀態。"""
+
+    cash: float
+
+    @property
+    def positions(self) -> Mapping[str, Position]: ...
+
+
 class RiskManager:
     def __init__(self, position_limit: int = 100):
         self.position_limit = position_limit
 
-    def check_risk(self, portfolio: Portfolio, asset: str, quantity: float) -> bool:
+    def check_risk(self, portfolio: PortfolioView, asset: str, quantity: float) -> bool:
         if asset in portfolio.positions:
             current_quantity = portfolio.positions[asset].quantity
             if abs(current_quantity + quantity) > self.position_limit:
@@ -52,11 +63,13 @@ class Portfolio:
     ):
         self.cash = initial_cash
         self.positions: Dict[str, Position] = {}
-        self.fills: List[Dict] = []
+        self.fills: List[Dict[str, Any]] = []
         self.risk_manager = risk_manager
         self.context: Dict[str, Any] = {}
 
-    def update(self, fills: List[Dict]):
+    def update(self, fills: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """依序套用成交並回傳通過風控的成交。"""
+        accepted = []
         for fill in fills:
             asset = fill["asset"]
             quantity = fill["quantity"]
@@ -72,6 +85,8 @@ class Portfolio:
                 self.positions[asset] = Position(asset)
             self.positions[asset].update(quantity, price)
             self.fills.append(fill)
+            accepted.append(fill)
+        return accepted
 
     def get_pnl(self, market_data: Dict[str, float]) -> float:
         realized_pnl = sum(
@@ -82,3 +97,239 @@ class Portfolio:
             for asset, position in self.positions.items()
         )
         return realized_pnl + unrealized_pnl
+
+
+FILL_DTYPE = np.dtype(
+    [
+        ("asset_id", np.int64),
+        ("quantity", np.float64),
+        ("price", np.float64),
+        ("commission", np.float64),
+    ]
+)
+
+
+class FillBook:
+    """預先配置的成交紀錄結構陣列，容量不足時倍增。"""
+
+    def __init__(self, capacity: int = 1024):
+        self._data = np.empty(max(capacity, 1), dtype=FILL_DTYPE)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._data[: self._size]
+
+    def append(
+        self,
+        asset_ids: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        commissions: np.ndarray,
+    ) -> None:
+        end = self._size + len(asset_ids)
+        if end > len(self._data):
+            data = np.empty(max(end, 2 * len(self._data)), dtype=FILL_DTYPE)
+            data[: self._size] = self.array
+            self._data = data
+        block = self._data[self._size : end]
+        block["asset_id"] = asset_ids
+        block["quantity"] = quantities
+        block["price"] = prices
+        block["commission"] = commissions
+        self._size = end
+
+
+class ColumnarPortfolio:
+    """以資產編號索引 NumPy 陣列保存部位的投資組合。
+
+    數量、成本與已實現損益存於 ``quantity``、``cost_basis``、``realized_pnl``
+    陣列，成交寫入 ``FillBook``。``update`` 接受與 ``Portfolio`` 相同的成交
+    dict 清單，或 ``FILL_DTYPE`` 結構陣列；同一批次內同一資產的多筆成交
+    依原順序處理，結果與 ``Portfolio`` 相同。
+
+    使用預設 ``RiskManager`` 時以陣列批次檢查部位上限；自訂的風控則逐筆
+    呼叫 ``check_risk``，每筆成交後即更新現金與 ``positions``。
+    """
+
+    def __init__(
+        self,
+        initial_cash: float = 100000.0,
+        risk_manager: RiskManager = RiskManager(),
+        assets: Sequence[str] | None = None,
+        capacity: int = 1024,
+    ):
+        self.cash = initial_cash
+        self.risk_manager = risk_manager
+        self.context: Dict[str, Any] = {}
+        self.assets: List[str] = []
+        self.asset_ids: Dict[str, int] = {}
+        self.quantity = np.zeros(0)
+        self.cost_basis = np.zeros(0)
+        self.realized_pnl = np.zeros(0)
+        # 是否曾有成交，對應 ``Portfolio.positions`` 的鍵
+        self.held = np.zeros(0, dtype=bool)
+        self.book = FillBook(capacity)
+        self._positions: Dict[str, Position] | None = None
+        if assets:
+            self.ids(assets)
+
+    def ids(self, assets: Sequence[str]) -> np.ndarray:
+        """取得資產編號，新資產會自動註冊。"""
+        new = [a for a in dict.fromkeys(assets) if a not in self.asset_ids]
+        if new:
+            for asset in new:
+                self.asset_ids[asset] = len(self.assets)
+                self.assets.append(asset)
+            pad = np.zeros(len(new))
+            self.quantity = np.append(self.quantity, pad)
+            self.cost_basis = np.append(self.cost_basis, pad)
+            self.realized_pnl = np.append(self.realized_pnl, pad)
+            self.held = np.append(self.held, np.zeros(len(new), dtype=bool))
+        return np.array([self.asset_ids[a] for a in assets], dtype=np.int64)
+
+    def _position(self, j: int) -> Position:
+        position = Position(self.assets[j], self.quantity[j], self.cost_basis[j])
+        position.realized_pnl = self.realized_pnl[j]
+        return position
+
+    @property
+    def positions(self) -> Dict[str, Position]:
+        """以 ``Position`` 物件呈現的部位快照，成交後才重新建立。"""
+        if self._positions is None:
+            self._positions = {
+                self.assets[j]: self._position(j) for j in np.flatnonzero(self.held)
+            }
+        return self._positions
+
+    @property
+    def fills_array(self) -> np.ndarray:
+        return self.book.array
+
+    @property
+    def fills(self) -> List[Dict[str, Any]]:
+        """與 ``Portfolio.fills`` 相同格式的成交紀錄。"""
+        array = self.book.array
+        return [
+            {
+                "asset": self.assets[j],
+                "quantity": q,
+                "price": p,
+                "commission": c,
+            }
+            for j, q, p, c in zip(
+                array["asset_id"].tolist(),
+                array["quantity"].tolist(),
+                array["price"].tolist(),
+                array["commission"].tolist(),
+            )
+        ]
+
+    def _check(self, cols: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        limit = self.risk_manager.position_limit
+        ok: np.ndarray = ~self.held[cols] | (
+            np.abs(self.quantity[cols] + quantities) <= limit
+        )
+        return ok
+
+    def _apply(self, cols: np.ndarray, q: np.ndarray, p: np.ndarray) -> None:
+        """套用每個資產至多一筆的成交，公式與 ``Position.update`` 相同。"""
+        current = self.quantity[cols]
+        cost = self.cost_basis[cols]
+        new = current + q
+        closing = new == 0
+        self.realized_pnl[cols] += np.where(closing, p * q + cost * current, 0.0)
+        self.cost_basis[cols] = np.where(
+            closing, 0.0, (cost * current + p * q) / np.where(closing, 1.0, new)
+        )
+        self.quantity[cols] = new
+        self.held[cols] = True
+
+    def _update_rounds(
+        self, cols: np.ndarray, quantities: np.ndarray, prices: np.ndarray
+    ) -> np.ndarray:
+        """以預設部位上限批次檢查並套用成交，回傳各筆是否通過。"""
+        accepted = np.zeros(len(cols), dtype=bool)
+        if not len(cols):
+            return accepted
+        # 同一資產的第 k 筆成交在第 k 輪處理，每輪內資產不重複
+        order = np.argsort(cols, kind="stable")
+        sorted_cols = cols[order]
+        starts = np.ones(len(cols), dtype=bool)
+        starts[1:] = sorted_cols[1:] != sorted_cols[:-1]
+        first = np.maximum.accumulate(np.where(starts, np.arange(len(cols)), 0))
+        rank = np.empty(len(cols), dtype=np.int64)
+        rank[order] = np.arange(len(cols)) - first
+        for r in range(int(rank.max()) + 1):
+            idx = np.flatnonzero(rank == r)
+            idx = idx[self._check(cols[idx], quantities[idx])]
+            accepted[idx] = True
+            self._apply(cols[idx], quantities[idx], prices[idx])
+        return accepted
+
+    def _update_each(
+        self,
+        cols: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        commissions: np.ndarray,
+    ) -> np.ndarray:
+        """逐筆呼叫自訂風控，與 ``Portfolio.update`` 看到相同的現金與部位。"""
+        accepted = np.zeros(len(cols), dtype=bool)
+        positions = self.positions
+        for k, j in enumerate(cols.tolist()):
+            asset = self.assets[j]
+            quantity = quantities[k]
+            if not self.risk_manager.check_risk(self, asset, quantity):
+                continue
+            accepted[k] = True
+            self.cash -= quantity * prices[k] + commissions[k]
+            self._apply(cols[k : k + 1], quantities[k : k + 1], prices[k : k + 1])
+            positions[asset] = self._position(j)
+        return accepted
+
+    def update(
+        self, fills: List[Dict[str, Any]] | np.ndarray
+    ) -> List[Dict[str, Any]] | np.ndarray:
+        """批次套用成交並回傳通過風控的成交，格式與輸入相同。"""
+        if isinstance(fills, np.ndarray):
+            cols = fills["asset_id"].astype(np.int64)
+            quantities = fills["quantity"].astype(np.float64)
+            prices = fills["price"].astype(np.float64)
+            commissions = fills["commission"].astype(np.float64)
+        else:
+            cols = self.ids([f["asset"] for f in fills])
+            quantities = np.array([f["quantity"] for f in fills], dtype=np.float64)
+            prices = np.array([f["price"] for f in fills], dtype=np.float64)
+            commissions = np.array(
+                [f["commission"] for f in fills], dtype=np.float64
+            )
+        if type(self.risk_manager).check_risk is RiskManager.check_risk:
+            accepted = self._update_rounds(cols, quantities, prices)
+            keep = np.flatnonzero(accepted)
+            flows = quantities[keep] * prices[keep] + commissions[keep]
+            # subtract.reduce 依序相減，與逐筆更新現金的結果相同
+            self.cash = float(np.subtract.reduce(np.append(self.cash, flows)))
+            if len(keep):
+                self._positions = None
+        else:
+            accepted = self._update_each(cols, quantities, prices, commissions)
+            keep = np.flatnonzero(accepted)
+        self.book.append(
+            cols[keep], quantities[keep], prices[keep], commissions[keep]
+        )
+        if isinstance(fills, np.ndarray):
+            return fills[keep]
+        return [fills[k] for k in keep]
+
+    def get_pnl(self, market_data: Mapping[str, float] | np.ndarray) -> float:
+        """``market_data`` 可為資產價格 dict 或依資產編號排列的價格陣列。"""
+        if isinstance(market_data, np.ndarray):
+            prices = market_data
+        else:
+            prices = np.array([market_data.get(a, 0) for a in self.assets], dtype=float)
+        unrealized = (prices - self.cost_basis) * self.quantity
+        return float(np.sum(self.realized_pnl) + np.sum(unrealized))
@@ -1,54 +1,58 @@
 from __future__ import annotations
 
-from typing import List
-
 import polars as pl
 
 from backtest_data_module.backtesting.events import SignalEvent
-from backtest_data_module.backtesting.strategy import StrategyBase
+from backtest_data_module.backtesting.indicators import rolling_std, sma
+from backtest_data_module.backtesting.strategy import (
+    Signals,
+    StrategyBase,
+    signal_changes,
+)
 
 
 class MeanReversion(StrategyBase):
-    def __init__(self, window: int = 20, threshold: float = 1.5):
+    def __init__(
+        self, window: int = 20, threshold: float = 1.5, columnar: bool = False
+    ):
         super().__init__({})
+        # columnar=True 時回傳 date、asset、quantity 訊號表，只在狀態改變時下單；
+        # 舊式輸出為每根非零訊號一筆不含時間的訊號，兩者回測結果不同
+        self.columnar = columnar
         self.window = window
         self.threshold = threshold
 
-    def on_data(self, data: pl.DataFrame) -> List[SignalEvent]:
-        signals = []
-        for asset in data["asset"].unique():
-            asset_data = data.filter(pl.col("asset") == asset)
-
-            # Calculate rolling mean and std
-            asset_data = asset_data.with_columns(
-                pl.col("close").rolling_mean(window_size=self.window).alias("mean"),
-                pl.col("close").rolling_std(window_size=self.window).alias("std"),
+    def on_data(self, data: pl.DataFrame) -> Signals:
+        # Calculate rolling mean and std for all assets at once
+        frame = self.indicators(
+            data,
+            {"mean": sma(self.window), "std": rolling_std(self.window)},
+        )
+
+        # Generate signals
+        keys = ["date", "asset"] if self.columnar else ["asset"]
+        band = self.threshold * pl.col("std")
+        states = frame.select(
+            *keys,
+            pl.when(pl.col("close") > pl.col("mean") + band)
+            .then(-1)
+            .when(pl.col("close") < pl.col("mean") - band)
+            .then(1)
+            .otherwise(0)
+            .alias("signal"),
+        )
+        if self.columnar:
+            return signal_changes(states)
+        signals = states.filter(pl.col("signal") != 0)
+
+        # Create SignalEvents
+        return [
+            SignalEvent(
+                asset=asset,
+                quantity=100 * signal,
+                direction="long" if signal > 0 else "short",
             )
-
-            # Generate signals
-            asset_data = asset_data.with_columns(
-                pl.when(
-                    asset_data["close"]
-                    > asset_data["mean"] + self.threshold * asset_data["std"]
-                )
-                .then(-1)
-                .when(
-                    asset_data["close"]
-                    < asset_data["mean"] - self.threshold * asset_data["std"]
-                )
-                .then(1)
-                .otherwise(0)
-                .alias("signal")
+            for asset, signal in zip(
+                signals["asset"].to_list(), signals["signal"].to_list()
             )
-
-            # Create SignalEvents
-            for row in asset_data.iter_rows(named=True):
-                if row["signal"] == 1:
-                    signals.append(
-                        SignalEvent(asset=asset, quantity=100, direction="long")
-                    )
-                elif row["signal"] == -1:
-                    signals.append(
-                        SignalEvent(asset=asset, quantity=-100, direction="short")
-                    )
-        return signals
+        ]
@@ -1,54 +1,60 @@
 from __future__ import annotations
 
-from typing import List
-
 import polars as pl
 
 from backtest_data_module.backtesting.events import SignalEvent
-from backtest_data_module.backtesting.strategy import StrategyBase
+from backtest_data_module.backtesting.indicators import sma
+from backtest_data_module.backtesting.strategy import (
+    Signals,
+    StrategyBase,
+    signal_changes,
+)
 
 
 class SmaCrossover(StrategyBase):
-    def __init__(self, short_window: int = 10, long_window: int = 30):
+    def __init__(
+        self, short_window: int = 10, long_window: int = 30, columnar: bool = False
+    ):
         super().__init__({})
+        # columnar=True 時回傳 date、asset、quantity 訊號表，只在狀態改變時下單；
+        # 舊式輸出為每根非零訊號一筆不含時間的訊號，兩者回測結果不同
+        self.columnar = columnar
         self.short_window = short_window
         self.long_window = long_window
 
-    def on_data(self, data: pl.DataFrame) -> List[SignalEvent]:
-        signals = []
-        for asset in data["asset"].unique():
-            asset_data = data.filter(pl.col("asset") == asset)
-
-            # Calculate SMAs
-            asset_data = asset_data.with_columns(
-                pl.col("close")
-                .rolling_mean(window_size=self.short_window)
-                .alias("short_sma")
+    def on_data(self, data: pl.DataFrame) -> Signals:
+        # 一次計算所有資產的短、長均線
+        frame = self.indicators(
+            data,
+            {
+                "short_sma": sma(self.short_window),
+                "long_sma": sma(self.long_window),
+            },
+        )
+
+        # Generate signals
+        keys = ["date", "asset"] if self.columnar else ["asset"]
+        states = frame.select(
+            *keys,
+            pl.when(pl.col("short_sma") > pl.col("long_sma"))
+            .then(1)
+            .when(pl.col("short_sma") < pl.col("long_sma"))
+            .then(-1)
+            .otherwise(0)
+            .alias("signal"),
+        )
+        if self.columnar:
+            return signal_changes(states)
+        signals = states.filter(pl.col("signal") != 0)
+
+        # Create SignalEvents
+        return [
+            SignalEvent(
+                asset=asset,
+                quantity=100 * signal,
+                direction="long" if signal > 0 else "short",
             )
-            asset_data = asset_data.with_columns(
-                pl.col("close")
-                .rolling_mean(window_size=self.long_window)
-                .alias("long_sma")
+            for asset, signal in zip(
+                signals["asset"].to_list(), signals["signal"].to_list()
             )
-
-            # Generate signals
-            asset_data = asset_data.with_columns(
-                pl.when(asset_data["short_sma"] > asset_data["long_sma"])
-                .then(1)
-                .when(asset_data["short_sma"] < asset_data["long_sma"])
-                .then(-1)
-                .otherwise(0)
-                .alias("signal")
-            )
-
-            # Create SignalEvents
-            for row in asset_data.iter_rows(named=True):
-                if row["signal"] == 1:
-                    signals.append(
-                        SignalEvent(asset=asset, quantity=100, direction="long")
-                    )
-                elif row["signal"] == -1:
-                    signals.append(
-                        SignalEvent(asset=asset, quantity=-100, direction="short")
-                    )
-        return signals
+        ]
@@ -1,15 +1,86 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import TYPE_CHECKING, Any, Hashable, List, Mapping, Union
 
 import numpy as np
 import polars as pl
+import pyarrow as pa
 
+from backtest_data_module.backtesting import indicators as ind
 from backtest_data_module.backtesting.events import SignalEvent
+from backtest_data_module.backtesting.indicator_cache import (
+    IndicatorCache,
+    compute_indicator,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - only for type hints
+    from backtest_data_module.backtesting.streaming import BarWindow
+
+# 策略輸出：SignalEvent 清單，或 date、asset 加上 quantity 或 target 欄位的表格
+Signals = Union[List[SignalEvent], pl.DataFrame, pa.Table]
+
+
+def is_signal_frame(signals: Any) -> bool:
+    return isinstance(signals, (pl.DataFrame, pa.Table))
+
+
+def signal_frame(signals: Signals) -> pl.DataFrame:
+    """將策略輸出轉為欄位式訊號表，舊式 SignalEvent 清單的 date 取其 timestamp。"""
+    if isinstance(signals, pa.Table):
+        signals = pl.from_arrow(signals)
+    if isinstance(signals, pl.DataFrame):
+        columns = set(signals.columns)
+        if not {"date", "asset"} <= columns or not columns & {"quantity", "target"}:
+            raise ValueError(
+                "訊號表需有 date、asset 欄位，以及 quantity 或 target 欄位"
+            )
+        return signals
+    return pl.DataFrame(
+        {
+            "date": [s.timestamp for s in signals],
+            "asset": [s.asset for s in signals],
+            "quantity": [s.quantity for s in signals],
+        }
+    )
+
+
+def signal_changes(states: pl.DataFrame, size: float = 100) -> pl.DataFrame:
+    """將每根 K 線的 -1、0、1 ``signal`` 狀態轉為只在狀態改變時下單的訊號表。
+
+    ``states`` 需依資產、時間排序；下單量為前後狀態差乘以 ``size``，
+    因此累計部位等於 ``size`` 乘以當下狀態。
+    """
+    previous = pl.col("signal").shift(1, fill_value=0).over("asset")
+    return states.select(
+        "date", "asset", ((pl.col("signal") - previous) * size).alias("quantity")
+    ).filter(pl.col("quantity") != 0)
+
+
+def signal_events(frame: pl.DataFrame) -> List[SignalEvent]:
+    """將 quantity 訊號表轉回 SignalEvent 清單，供只接受事件的流程使用。"""
+    if "quantity" not in frame.columns:
+        raise ValueError("只有 quantity 訊號表可轉為 SignalEvent")
+    return [
+        SignalEvent(
+            asset=asset,
+            quantity=quantity,
+            direction="long" if quantity > 0 else "short",
+            timestamp=timestamp,
+        )
+        for timestamp, asset, quantity in zip(
+            frame["date"].to_list(),
+            frame["asset"].to_list(),
+            frame["quantity"].to_list(),
+        )
+        if quantity
+    ]
 
 
 class StrategyBase(ABC):
+    # 串流模式下保留的 K 線數量
+    lookback: int = 1
+
     def __init__(
         self,
         params: dict,
@@ -21,13 +92,42 @@ class StrategyBase(ABC):
         self.device = device
         self.precision = precision
         self.quantization_bits = quantization_bits
+        self.indicator_cache: IndicatorCache | None = None
 
     @abstractmethod
-    def on_data(self, event: Union[np.ndarray, pl.DataFrame]) -> List[SignalEvent]:
-        pass
+    def on_data(self, event: Union[np.ndarray, pl.DataFrame]) -> Signals:
+        """回傳 SignalEvent 清單或欄位式訊號表（見 ``signal_frame``）。"""
+
+    def indicator(
+        self,
+        data: pl.DataFrame,
+        name: str,
+        asset: Hashable | None = None,
+        **params: Any,
+    ) -> pl.Series:
+        """取得指標，設定 ``indicator_cache`` 時會重複使用已計算的結果。"""
+        if self.indicator_cache is None:
+            return compute_indicator(data, name, asset, **params)
+        return self.indicator_cache.indicator(data, name, asset, **params)
+
+    def indicators(
+        self, data: pl.DataFrame, exprs: Mapping[str, pl.Expr]
+    ) -> pl.DataFrame:
+        """以單一查詢計算 ``backtesting.indicators`` 運算式，並依資產、時間排序。"""
+        if self.indicator_cache is None:
+            return ind.compute(data, exprs)
+        return self.indicator_cache.compute(data, exprs)
+
+    def on_bar(
+        self, timestamp: Any, bar: pl.DataFrame, window: BarWindow
+    ) -> Signals:
+        """串流模式逐根 K 線呼叫，``window`` 為最近 ``lookback`` 根 K 線。"""
+        raise NotImplementedError(
+            f"{type(self).__name__} 未實作 on_bar，無法使用串流模式"
+        )
 
-    def on_start(self, context):
+    def on_start(self, context: Any) -> None:
         pass
 
-    def on_finish(self, context):
+    def on_finish(self, context: Any) -> None:
         pass
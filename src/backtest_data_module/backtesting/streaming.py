@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+
+from backtest_data_module.backtesting.events import OrderEvent, SignalEvent
+from backtest_data_module.backtesting.execution import Execution
+from backtest_data_module.backtesting.performance import OnlineMetrics, Performance
+from backtest_data_module.backtesting.portfolio import Portfolio
+from backtest_data_module.backtesting.strategy import (
+    Signals,
+    StrategyBase,
+    is_signal_frame,
+    signal_events,
+    signal_frame,
+)
+from backtest_data_module.data_handler import DataHandler
+
+
+class BarWindow:
+    """最近 ``lookback`` 根 K 線的滾動視窗，較舊的 K 線會被丟棄。"""
+
+    def __init__(self, lookback: int) -> None:
+        if lookback < 1:
+            raise ValueError("lookback 必須大於 0")
+        self.lookback = lookback
+        self._bars: deque[pl.DataFrame] = deque(maxlen=lookback)
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    @property
+    def full(self) -> bool:
+        return len(self._bars) == self.lookback
+
+    def append(self, bar: pl.DataFrame) -> None:
+        self._bars.append(bar)
+
+    def frame(self) -> pl.DataFrame:
+        """視窗內所有 K 線依時間串接的資料。"""
+        if not self._bars:
+            return pl.DataFrame()
+        return pl.concat(list(self._bars), how="vertical_relaxed")
+
+    def closes(self, asset: Any) -> np.ndarray:
+        """單一資產在視窗內的收盤價，依時間排序。"""
+        values = [
+            bar.filter(pl.col("asset") == asset)["close"] for bar in self._bars
+        ]
+        if not values:
+            return np.array([], dtype=float)
+        return pl.concat(values).cast(pl.Float64).to_numpy()
+
+
+class StreamingBacktest:
+    """逐根 K 線執行的串流回測。
+
+    資料來源為依 ``date`` 排序的 Arrow ``RecordBatch`` 或 Polars DataFrame，
+    同一時間點跨越批次邊界時會併入下一批處理。每根 K 線呼叫策略的
+    ``on_bar``，記憶體只保留 ``lookback`` 根 K 線與各資產最新狀態，
+    與歷史長度無關。訂單與成交沿用 ``Execution`` 與 ``Portfolio``。
+    績效指標逐根以 ``OnlineMetrics`` 累計；``store_nav=False`` 時不保存
+    NAV 序列，``results["performance"]`` 直接取自累計結果。
+    """
+
+    def __init__(
+        self,
+        strategy: StrategyBase,
+        portfolio: Portfolio,
+        execution: Execution,
+        performance: Performance,
+        source: Iterable[pa.RecordBatch | pl.DataFrame],
+        *,
+        lookback: int | None = None,
+        store_nav: bool = True,
+    ) -> None:
+        self.strategy = strategy
+        self.portfolio = portfolio
+        self.execution = execution
+        self.performance = performance
+        self.source = source
+        self.lookback = lookback or strategy.lookback
+        self.store_nav = store_nav
+        self.online = OnlineMetrics()
+        self.results: Dict[str, Any] = {}
+
+    @classmethod
+    def from_storage(
+        cls,
+        strategy: StrategyBase,
+        portfolio: Portfolio,
+        execution: Execution,
+        performance: Performance,
+        data_handler: DataHandler,
+        table: str,
+        *,
+        columns: List[str] | None = None,
+        batch_size: int = 65_536,
+        lookback: int | None = None,
+        store_nav: bool = True,
+    ) -> StreamingBacktest:
+        """由 ``DataHandler`` 逐批讀取儲存層中的表格。
+
+        表格寫入時可能依 ``asset`` 等排序鍵分群，因此讀取時依 ``date`` 重新排序。
+        """
+        source = data_handler.iter_batches(
+            table, columns=columns, sort_by=["date"], batch_size=batch_size
+        )
+        return cls(
+            strategy,
+            portfolio,
+            execution,
+            performance,
+            source,
+            lookback=lookback,
+            store_nav=store_nav,
+        )
+
+    def _bars(self) -> Iterator[pl.DataFrame]:
+        pending: pl.DataFrame | None = None
+        for batch in self.source:
+            df = batch if isinstance(batch, pl.DataFrame) else pl.from_arrow(batch)
+            assert isinstance(df, pl.DataFrame)
+            if pending is not None:
+                df = pl.concat([pending, df], how="vertical_relaxed")
+            if not df.height:
+                continue
+            times = df["date"]
+            if not times.is_sorted():
+                raise ValueError("串流資料必須依 date 排序")
+            # 最後一個時間點可能延續到下一批
+            tail = times.search_sorted(times[-1], side="left")
+            pending = df.slice(tail)
+            if tail:
+                yield from df.slice(0, tail).partition_by(
+                    "date", maintain_order=True
+                )
+        if pending is not None and pending.height:
+            yield pending
+
+    @staticmethod
+    def _signal_events(
+        signals: Signals,
+        positions: np.ndarray,
+        asset_ids: Dict[Any, int],
+    ) -> List[SignalEvent]:
+        """欄位式訊號轉為事件；target 表依目前部位換算下單量。"""
+        if not is_signal_frame(signals):
+            return list(signals or [])
+        frame = signal_frame(signals)
+        if "quantity" not in frame.columns:
+            current = [
+                positions[asset_ids[a]] if a in asset_ids else 0.0
+                for a in frame["asset"].to_list()
+            ]
+            frame = frame.with_columns(
+                (pl.col("target") - pl.Series(current, dtype=pl.Float64)).alias(
+                    "quantity"
+                )
+            )
+        return signal_events(frame)
+
+    def run(self) -> None:
+        asset_ids: Dict[Any, int] = {}
+        last_close = np.zeros(0)
+        positions = np.zeros(0)
+        start = {asset: p.quantity for asset, p in self.portfolio.positions.items()}
+        nav: List[float] = []
+        window = BarWindow(self.lookback)
+
+        self.strategy.on_start(self.portfolio.context)
+        for bar in self._bars():
+            timestamp = bar["date"][0]
+            assets = bar["asset"].to_list()
+            new = [a for a in dict.fromkeys(assets) if a not in asset_ids]
+            if new:
+                for asset in new:
+                    asset_ids[asset] = len(asset_ids)
+                last_close = np.append(last_close, np.zeros(len(new)))
+                positions = np.append(
+                    positions, [start.get(asset, 0.0) for asset in new]
+                )
+            cols = np.array([asset_ids[a] for a in assets], dtype=np.int64)
+            close = np.full(len(asset_ids), np.nan)
+            close[cols] = bar["close"].cast(pl.Float64).to_numpy()
+            valid = np.isfinite(close)
+            last_close[valid] = close[valid]
+
+            window.append(bar)
+            signals = self.strategy.on_bar(timestamp, bar, window)
+            for signal in self._signal_events(signals, positions, asset_ids):
+                order = OrderEvent(
+                    asset=signal.asset,
+                    quantity=signal.quantity,
+                    timestamp=(
+                        timestamp if signal.timestamp is None else signal.timestamp
+                    ),
+                )
+                self.execution.place_order(order, order.timestamp)
+
+            fills = self.execution.process_orders_batch(timestamp, close, asset_ids)
+            for fill in self.portfolio.update(fills):
+                positions[asset_ids[fill["asset"]]] += fill["quantity"]
+            value = float(self.portfolio.cash + positions @ last_close)
+            self.online.update(value)
+            if self.store_nav:
+                nav.append(value)
+        self.strategy.on_finish(self.portfolio.context)
+
+        if self.store_nav:
+            self.performance.nav_series.extend(nav)
+            series = np.asarray(self.performance.nav_series)
+            self.performance.returns = (
+                np.diff(series) / series[:-1] if len(series) > 1 else np.array([])
+            )
+            metrics = self.performance.compute_metrics()
+        else:
+            metrics = self.online.compute_metrics()
+        last_prices = {asset: float(last_close[j]) for asset, j in asset_ids.items()}
+        self.results = {
+            "pnl": self.portfolio.get_pnl(last_prices),
+            "fills": self.portfolio.fills,
+            "performance": metrics,
+        }
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import itertools
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+import numpy as np
+import polars as pl
+
+from backtest_data_module.backtesting.execution import CommissionModel, FlatCommission
+from backtest_data_module.backtesting.vectorized import as_of_prices, close_matrix
+
+TargetFn = Callable[[Dict[str, np.ndarray], "ParameterSweep"], np.ndarray]
+
+
+def parameter_grid(grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """展開參數網格，順序與 ``itertools.product`` 相同。"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def rolling_means(
+    close: np.ndarray, windows: Sequence[int] | np.ndarray
+) -> np.ndarray:
+    """一次計算多個視窗的簡單移動平均，回傳視窗 × 時間 × 資產。
+
+    視窗內有缺值或資料不足時為 NaN，與 Polars ``rolling_mean`` 相同。
+    """
+    sizes = np.asarray(windows, dtype=np.int64)
+    valid = np.isfinite(close)
+    n = close.shape[0]
+    sums = np.zeros((n + 1,) + close.shape[1:])
+    counts = np.zeros((n + 1,) + close.shape[1:])
+    np.cumsum(np.where(valid, close, 0.0), axis=0, out=sums[1:])
+    np.cumsum(valid, axis=0, out=counts[1:])
+    start = np.arange(1, n + 1)[None, :] - sizes[:, None]
+    ok = start >= 0
+    start = np.where(ok, start, 0)
+    total = sums[1:][None] - sums[start]
+    count = counts[1:][None] - counts[start]
+    full = ok[..., None] & (count == sizes[:, None, None])
+    return np.where(full, total / sizes[:, None, None], np.nan)
+
+
+def sma_crossover_targets(
+    params: Dict[str, np.ndarray], sweep: ParameterSweep
+) -> np.ndarray:
+    """短均線高於長均線時持有 ``quantity``，低於時放空，否則空手。"""
+    short = params["short_window"]
+    long = params["long_window"]
+    quantity = params.get("quantity", np.full(len(short), 100.0))
+    windows, inverse = np.unique(np.concatenate([short, long]), return_inverse=True)
+    means = rolling_means(sweep.close, windows)
+    diff = means[inverse[: len(short)]] - means[inverse[len(short):]]
+    targets: np.ndarray = np.nan_to_num(np.sign(diff)) * quantity[:, None, None]
+    return targets
+
+
+class ParameterSweep:
+    """以參數 × 時間 × 資產陣列一次評估整個參數網格。
+
+    目標部位由 ``targets`` 函式批次產生，於當根收盤價成交並扣除手續費，
+    不模擬滑價與延遲。網格依 ``chunk_size`` 分塊計算以限制記憶體用量，
+    未指定時依 ``max_bytes`` 與資料大小估算。
+    """
+
+    def __init__(
+        self,
+        data: pl.DataFrame,
+        *,
+        initial_cash: float = 100000.0,
+        commission_model: CommissionModel | None = None,
+        chunk_size: int | None = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        periods_in_year: int = 252,
+    ) -> None:
+        self.dates, self.assets, self.close = close_matrix(data)
+        self.prices = as_of_prices(self.close)
+        self.initial_cash = initial_cash
+        self.commission_model = commission_model or FlatCommission()
+        self.periods_in_year = periods_in_year
+        if chunk_size is None:
+            # 每組參數約需 8 個時間 × 資產的 float64 暫存陣列
+            per_combo = max(self.close.size, 1) * 8 * 8
+            chunk_size = max(1, max_bytes // per_combo)
+        self.chunk_size = chunk_size
+
+    def evaluate(self, targets: np.ndarray) -> Dict[str, np.ndarray]:
+        """計算參數 × 時間 × 資產目標部位的 NAV 與交易統計。"""
+        # 無報價或目標為 NaN 時維持前一期部位
+        rows = np.arange(targets.shape[1])[None, :, None]
+        active = np.isfinite(self.close)[None] & np.isfinite(targets)
+        idx = np.where(active, rows, 0)
+        np.maximum.accumulate(idx, axis=1, out=idx)
+        held = np.take_along_axis(np.where(active, targets, 0.0), idx, axis=1)
+        trades = np.diff(held, axis=1, prepend=0.0)
+
+        nz = np.nonzero(trades)
+        costs = np.zeros(trades.shape)
+        costs[nz] = self.commission_model.calculate_batch(
+            trades[nz], self.prices[nz[1], nz[2]]
+        )
+        flow = np.sum(trades * self.prices + costs, axis=2)
+        cash = self.initial_cash - np.cumsum(flow, axis=1)
+        nav = cash + np.sum(held * self.prices, axis=2)
+        return {
+            "nav": nav,
+            "trades": np.count_nonzero(trades, axis=(1, 2)),
+            "commission": costs.sum(axis=(1, 2)),
+        }
+
+    def _metrics(self, nav: np.ndarray) -> Dict[str, np.ndarray]:
+        returns = np.diff(nav, axis=1) / nav[:, :-1]
+        mean = returns.mean(axis=1) if returns.shape[1] else np.zeros(len(nav))
+        std = returns.std(axis=1) if returns.shape[1] else np.zeros(len(nav))
+        sharpe = np.divide(
+            mean * np.sqrt(self.periods_in_year),
+            std,
+            out=np.zeros(len(nav)),
+            where=std != 0,
+        )
+        peak = np.maximum.accumulate(nav, axis=1)
+        return {
+            "final_nav": nav[:, -1],
+            "pnl": nav[:, -1] - self.initial_cash,
+            "total_return": nav[:, -1] / self.initial_cash - 1,
+            "sharpe": sharpe,
+            "max_drawdown": ((nav - peak) / peak).min(axis=1),
+        }
+
+    def run(
+        self,
+        grid: Mapping[str, Sequence[Any]] | Sequence[Dict[str, Any]],
+        targets: TargetFn = sma_crossover_targets,
+    ) -> pl.DataFrame:
+        """回傳每組參數一列的績效表，欄位為參數加上各項指標。"""
+        combos = parameter_grid(grid) if isinstance(grid, Mapping) else list(grid)
+        if not combos or not len(self.dates):
+            return pl.DataFrame(combos)
+        keys = list(combos[0])
+        columns: Dict[str, List[np.ndarray]] = {}
+        for start in range(0, len(combos), self.chunk_size):
+            chunk = combos[start : start + self.chunk_size]
+            params = {k: np.array([c[k] for c in chunk]) for k in keys}
+            result = self.evaluate(targets(params, self))
+            metrics = self._metrics(result["nav"])
+            metrics["trades"] = result["trades"]
+            metrics["commission"] = result["commission"]
+            for name, values in metrics.items():
+                columns.setdefault(name, []).append(values)
+        table = pl.DataFrame(combos)
+        return table.with_columns(
+            pl.Series(name, np.concatenate(values)) for name, values in columns.items()
+        )
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+import polars as pl
+
+from backtest_data_module.backtesting.execution import (
+    CommissionModel,
+    FlatCommission,
+    GaussianSlippage,
+    SlippageModel,
+)
+
+
+@dataclass
+class VectorizedResult:
+    """向量化回測結果，矩陣皆為時間 × 資產。"""
+
+    dates: pl.Series
+    assets: List[str]
+    positions: np.ndarray
+    cash: np.ndarray
+    commissions: np.ndarray
+    nav: np.ndarray
+    fills: pl.DataFrame
+    pnl: float
+
+    def fill_dicts(self) -> List[Dict[str, Any]]:
+        """轉為與 ``Portfolio.fills`` 相同格式的成交紀錄。"""
+        return self.fills.select(
+            ["asset", "quantity", "price", "commission"]
+        ).to_dicts()
+
+
+def close_matrix(data: pl.DataFrame) -> tuple[pl.Series, List[Any], np.ndarray]:
+    """將 ``date``、``asset``、``close`` 長表轉為時間 × 資產的收盤價矩陣。
+
+    日期與資產皆排序，缺少的報價為 NaN，重複的 (date, asset) 取最後一筆。
+    """
+    assets = data["asset"].unique().sort().to_list()
+    dates = data["date"].unique().sort()
+    date_idx = np.searchsorted(dates.to_numpy(), data["date"].to_numpy())
+    asset_idx = data["asset"].replace_strict(assets, list(range(len(assets))))
+    close = np.full((len(dates), len(assets)), np.nan)
+    close[date_idx, asset_idx.to_numpy()] = data["close"].cast(pl.Float64).to_numpy()
+    return dates, assets, close
+
+
+def as_of_prices(close: np.ndarray) -> np.ndarray:
+    """沿時間軸以最近一筆有效價格補值，尚無價格時為 0。"""
+    rows = np.arange(close.shape[0])[:, None]
+    idx = np.where(np.isfinite(close), rows, 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    filled = close[idx, np.arange(close.shape[1])]
+    prices: np.ndarray = np.nan_to_num(filled, nan=0.0)
+    return prices
+
+
+class VectorizedBacktest:
+    """以 NumPy 陣列一次計算市價單的成交、部位、現金、手續費與 NAV。
+
+    訂單於訊號當根 K 線以收盤價成交，滑價與手續費沿用事件模式的模型。
+    滑價亂數依時間、再依資產欄位順序抽取，事件引擎則依訂單到期的
+    (時間, 下單順序) 抽取；只有在不設延遲、每根 K 線每個資產至多一筆訂單，
+    且訂單依資產欄位順序送出時，兩者的成交結果才會相同。同一根 K 線同一
+    資產的多筆訂單在此會加總為一筆成交。
+    設定 ``position_limit`` 時依 ``RiskManager`` 規則逐根檢查有下單的 K 線，
+    否則整段以累加計算。目標部位模式以實際持有部位換算下單量。
+    """
+
+    def __init__(
+        self,
+        data: pl.DataFrame,
+        *,
+        initial_cash: float = 100000.0,
+        commission_model: CommissionModel | None = None,
+        slippage_model: SlippageModel | None = None,
+        position_limit: float | None = None,
+    ) -> None:
+        self.dates, self.assets, self.close = close_matrix(data)
+        self.initial_cash = initial_cash
+        self.commission_model = commission_model or FlatCommission()
+        self.slippage_model = slippage_model or GaussianSlippage(seed=42)
+        self.position_limit = position_limit
+
+    def signal_matrix(
+        self, signals: pl.DataFrame, value: str = "quantity", fill: float = 0.0
+    ) -> np.ndarray:
+        """將 ``date``、``asset``、``value`` 欄位的長表轉為對齊的矩陣，重複者加總。
+
+        沒有訊號的位置填入 ``fill``；目標部位應填 NaN 以沿用前一期目標。
+        """
+        index = pl.DataFrame({"date": self.dates})
+        wide = signals.pivot(
+            on="asset", index="date", values=value, aggregate_function="sum"
+        )
+        for asset in self.assets:
+            if asset not in wide.columns:
+                wide = wide.with_columns(pl.lit(None, dtype=pl.Float64).alias(asset))
+        aligned = index.join(wide, on="date", how="left").select(self.assets)
+        return aligned.fill_null(fill).to_numpy().astype(np.float64)
+
+    def _target_orders(
+        self, signals: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """以目標部位減去實際持有部位換算下單量，與 ``StreamingBacktest`` 相同。
+
+        目標部位的缺值視為維持前一期目標；無報價或被風控拒絕而未達成的
+        差額，會在之後有報價的 K 線再次下單。回傳下單的列、欄、數量與
+        是否通過部位上限檢查。
+        """
+        n_dates, n_assets = signals.shape
+        rows = np.arange(n_dates)[:, None]
+        columns = np.arange(n_assets)
+        idx = np.where(np.isfinite(signals), rows, 0)
+        np.maximum.accumulate(idx, axis=0, out=idx)
+        held = np.nan_to_num(signals[idx, columns], nan=0.0)
+        quoted = np.isfinite(self.close)
+        if self.position_limit is None:
+            # 每根有報價的 K 線都成交至目標，部位即最近一次有報價時的目標
+            last = np.where(quoted, rows, -1)
+            np.maximum.accumulate(last, axis=0, out=last)
+            position = np.where(last >= 0, held[np.maximum(last, 0), columns], 0.0)
+            orders = np.diff(position, axis=0, prepend=0.0)
+            r, c = np.nonzero(orders)
+            return r, c, orders[r, c], np.ones(len(r), dtype=bool)
+
+        position = np.zeros(n_assets)
+        seen = np.zeros(n_assets, dtype=bool)
+        parts: List[tuple[np.ndarray, ...]] = []
+        for t in range(n_dates):
+            c = np.flatnonzero(quoted[t] & (held[t] != position))
+            if not len(c):
+                continue
+            q = held[t, c] - position[c]
+            ok = ~seen[c] | (np.abs(held[t, c]) <= self.position_limit)
+            position[c[ok]] = held[t, c[ok]]
+            seen[c[ok]] = True
+            parts.append((np.full(len(c), t), c, q, ok))
+        if not parts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0), np.zeros(0, dtype=bool)
+        r, c, q, ok = (np.concatenate(p) for p in zip(*parts))
+        return r, c, q, ok
+
+    def _accept(
+        self, rows: np.ndarray, cols: np.ndarray, quantities: np.ndarray
+    ) -> np.ndarray:
+        """依 ``RiskManager`` 規則判斷成交是否被接受。
+
+        與 ``Portfolio.update`` 相同：資產第一次成交不檢查，之後若成交後部位
+        絕對值超過上限則拒絕，且被拒絕的成交不影響部位。
+        """
+        accepted = np.ones(len(quantities), dtype=bool)
+        if self.position_limit is None or not len(quantities):
+            return accepted
+        position = np.zeros(len(self.assets))
+        seen = np.zeros(len(self.assets), dtype=bool)
+        bounds = np.flatnonzero(np.diff(rows)) + 1
+        for start, end in zip(
+            np.concatenate(([0], bounds)), np.concatenate((bounds, [len(rows)]))
+        ):
+            c = cols[start:end]
+            q = quantities[start:end]
+            ok = ~seen[c] | (np.abs(position[c] + q) <= self.position_limit)
+            accepted[start:end] = ok
+            position[c[ok]] += q[ok]
+            seen[c[ok]] = True
+        return accepted
+
+    def _pnl(
+        self,
+        cols: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        final_positions: np.ndarray,
+        last_close: np.ndarray,
+    ) -> float:
+        """依 ``Position`` 的成本與已實現損益規則計算總損益。"""
+        n_assets = len(self.assets)
+        if not len(quantities):
+            return 0.0
+        order = np.argsort(cols, kind="stable")
+        c = cols[order]
+        q = quantities[order]
+        flow = (prices * quantities)[order]
+        cum = np.cumsum(q)
+        group_start = np.ones(len(c), dtype=bool)
+        group_start[1:] = c[1:] != c[:-1]
+        offsets = np.where(group_start, cum - q, 0.0)
+        start_idx = np.maximum.accumulate(np.where(group_start, np.arange(len(c)), 0))
+        position = cum - offsets[start_idx]
+        flat = position == 0
+        # 部位歸零後的下一筆成交開啟新的成本區段
+        new_segment = group_start.copy()
+        new_segment[1:] |= flat[:-1] & ~group_start[1:]
+        segment = np.cumsum(new_segment) - 1
+        segment_cost = np.bincount(segment, weights=flow)
+        total_flow = np.bincount(c, weights=flow, minlength=n_assets)
+        last = np.flatnonzero(np.append(group_start[1:], True))
+        open_cost = np.zeros(n_assets)
+        open_cost[c[last]] = np.where(flat[last], 0.0, segment_cost[segment[last]])
+        realized = total_flow - open_cost
+        unrealized = final_positions * last_close - open_cost
+        return float(np.sum(realized + unrealized))
+
+    def run(
+        self, signals: np.ndarray | pl.DataFrame, *, targets: bool = False
+    ) -> VectorizedResult:
+        """``signals`` 為下單量矩陣，``targets=True`` 時視為目標部位矩陣。"""
+        if isinstance(signals, pl.DataFrame):
+            value = "target" if targets and "target" in signals.columns else "quantity"
+            signals = self.signal_matrix(
+                signals, value, fill=np.nan if targets else 0.0
+            )
+        signals = np.asarray(signals, dtype=np.float64)
+        if signals.shape != self.close.shape:
+            raise ValueError(
+                f"signals 形狀 {signals.shape} 與資料 {self.close.shape} 不符"
+            )
+        n_dates, n_assets = self.close.shape
+        if targets:
+            rows, cols, quantities, ok = self._target_orders(signals)
+        else:
+            orders = np.nan_to_num(signals, nan=0.0)
+            # 無價格的資產略過，與事件引擎相同且不抽取滑價亂數
+            rows, cols = np.nonzero((orders != 0) & np.isfinite(self.close))
+            quantities = orders[rows, cols]
+            ok = self._accept(rows, cols, quantities)
+        prices = self.slippage_model.apply_batch(self.close[rows, cols], quantities)
+        commissions = self.commission_model.calculate_batch(quantities, prices)
+
+        rows, cols = rows[ok], cols[ok]
+        quantities, prices, commissions = quantities[ok], prices[ok], commissions[ok]
+
+        delta = np.zeros((n_dates, n_assets))
+        np.add.at(delta, (rows, cols), quantities)
+        positions = np.cumsum(delta, axis=0)
+        cash_flow = np.bincount(
+            rows, weights=quantities * prices + commissions, minlength=n_dates
+        )
+        cash = self.initial_cash - np.cumsum(cash_flow)
+        commission_per_bar = np.bincount(rows, weights=commissions, minlength=n_dates)
+        last_close = as_of_prices(self.close)
+        nav = cash + np.sum(positions * last_close, axis=1)
+
+        fills = pl.DataFrame(
+            {
+                "date": self.dates.gather(rows),
+                "asset": [self.assets[c] for c in cols],
+                "quantity": quantities,
+                "price": prices,
+                "commission": commissions,
+            }
+        )
+        final = positions[-1] if n_dates else np.zeros(n_assets)
+        pnl = self._pnl(
+            cols,
+            quantities,
+            prices,
+            final,
+            last_close[-1] if n_dates else np.zeros(n_assets),
+        )
+        return VectorizedResult(
+            dates=self.dates,
+            assets=self.assets,
+            positions=positions,
+            cash=cash,
+            commissions=commission_per_bar,
+            nav=nav,
+            fills=fills,
+            pnl=pnl,
+        )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import AsyncIterator, TYPE_CHECKING, Any
+from typing import AsyncIterator, Iterator, TYPE_CHECKING, Any
 
 import polars as pl
 import pyarrow as pa
@@ -30,6 +30,7 @@ class DataHandler:
     - ``quantize``：將 CuPy 陣列量化成較低精度。
     - ``migrate``：在儲存層之間搬移資料。
     - ``stream``：以非同步方式串流資料批次。
+    - ``iter_batches``：逐批讀取表格，供串流回測使用。
     - ``register_arrow``：在熱儲存層註冊 Arrow 批次。
     - ``validate_schema``：驗證 DataFrame 符合預期結構。
     """
@@ -101,6 +102,24 @@ class DataHandler:
         """將資料寫入 warm 儲存層。"""
         self.storage_manager.write(df, table, tier="warm")
 
+    def iter_batches(
+        self,
+        table: str,
+        *,
+        columns: list[str] | None = None,
+        sort_by: list[str] | None = None,
+        batch_size: int = 65_536,
+        tiers: list[str] | None = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """依優先順序從儲存層逐批讀取表格，可依 ``sort_by`` 排序。"""
+        return self.storage_manager.read_batches(
+            table,
+            columns=columns,
+            sort_by=sort_by,
+            batch_size=batch_size,
+            tiers=tiers,
+        )
+
     async def stream(
         self, symbols: list[str], freq: str
     ) -> AsyncIterator[pa.RecordBatch]:
@@ -1,3 +1,8 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+import polars as pl
+
 from backtest_data_module.data_ingestion.py.api_client import ApiClient
 from backtest_data_module.data_ingestion.py.rate_limiter import RateLimiter
 from backtest_data_module.data_ingestion.py.caching import ICache
@@ -7,6 +12,9 @@ from backtest_data_module.data_ingestion.metrics import (
     CACHE_HIT_RATIO,
 )
 
+if TYPE_CHECKING:  # pragma: no cover - type checking imports
+    from backtest_data_module.data_storage import HybridStorageManager
+
 
 class APIDataSource:
     """透過 API 擷取資料的資料來源，支援速率限制與快取。"""
@@ -33,7 +41,7 @@ class APIDataSource:
         if rate_limiter is not None:
             api_client.limiters[endpoint] = rate_limiter
 
-    async def read(self, params: dict = None):
+    async def read(self, params: dict[str, Any] | None = None):
         """非同步取得資料。
 
         Args:
@@ -64,3 +72,45 @@ class APIDataSource:
         total_misses = miss_metric._value.get()
         ratio_metric.set(total_hits / (total_hits + total_misses))
         return data
+
+    async def ingest(
+        self,
+        requests: Iterable[tuple[str, dict[str, Any] | None]],
+        manager: "HybridStorageManager",
+        *,
+        tier: str = "hot",
+        to_frame: Callable[[Any], pl.DataFrame] = pl.DataFrame,
+        max_pending_writes: int = 4,
+    ) -> list[str]:
+        """依序擷取 ``(table, params)`` 並寫入儲存層，寫入與下一筆擷取重疊進行。
+
+        最多同時保留 ``max_pending_writes`` 筆尚未完成的寫入，超過時先等待寫入完成，
+        避免擷取速度高於寫入時無限制累積資料。
+
+        Returns:
+            已寫入的表格名稱。
+        """
+        pending: set[asyncio.Task[None]] = set()
+        written: list[str] = []
+        try:
+            for table, params in requests:
+                data = await self.read(params)
+                if len(pending) >= max(max_pending_writes, 1):
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        task.result()
+                pending.add(
+                    asyncio.create_task(
+                        manager.awrite(to_frame(data), table, tier=tier)
+                    )
+                )
+                written.append(table)
+            await asyncio.gather(*pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise
+        return written
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
 import json
+import warnings
+from dataclasses import dataclass
 from itertools import combinations
-from typing import Callable, Dict, Iterator, List
+from math import comb
+from typing import Callable, Dict, Iterator, List, Sequence
 
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
+from scipy.stats import norm
 from sklearn.model_selection import KFold
 
-from backtest_data_module.backtesting.performance import PerformanceSummary
+from backtest_data_module.backtesting.performance import (
+    Performance,
+    PerformanceSummary,
+)
+
+EULER_GAMMA = 0.5772156649015329
 
 
 class CPCVResult:
@@ -17,8 +27,37 @@ class CPCVResult:
     儲存 Combinatorial Purged Cross-Validation 結果的容器。
     """
 
-    def __init__(self, results: List[PerformanceSummary]):
+    def __init__(
+        self,
+        results: List[PerformanceSummary],
+        returns: List[np.ndarray] | None = None,
+        n_splits: int | None = None,
+        n_test_splits: int | None = None,
+        n_samples: int | None = None,
+    ):
         self.results = results
+        self.returns = returns
+        self.n_splits = n_splits
+        self.n_test_splits = n_test_splits
+        self.n_samples = n_samples
+
+    def paths(self) -> np.ndarray:
+        """
+        將各組合的測試期報酬組成 φ 條完整回測路徑。
+
+        Returns:
+            路徑 × 樣本的報酬陣列，見 ``assemble_cpcv_paths``。
+        """
+        if (
+            self.returns is None
+            or self.n_splits is None
+            or self.n_test_splits is None
+            or self.n_samples is None
+        ):
+            raise ValueError("結果未包含各組合的測試期報酬")
+        return assemble_cpcv_paths(
+            self.returns, self.n_splits, self.n_test_splits, self.n_samples
+        )
 
     def to_parquet(self, path: str):
         """
@@ -96,6 +135,18 @@ def purged_k_fold(
         yield purged_train_index, test_index
 
 
+def _folds(n_samples: int, n_splits: int) -> List[List[int]]:
+    """等分為 ``n_splits`` 折，餘數併入最後一折。"""
+    fold_size = n_samples // n_splits
+    indices = list(range(n_samples))
+    folds = [
+        indices[i * fold_size : (i + 1) * fold_size] for i in range(n_splits)
+    ]
+    if n_samples % n_splits:
+        folds[-1].extend(indices[n_splits * fold_size :])
+    return folds
+
+
 def combinatorial_purged_cv(
     n_splits: int,
     n_samples: int,
@@ -122,13 +173,7 @@ def combinatorial_purged_cv(
             "n_test_splits must be between 1 and n_splits-1"
         )
 
-    fold_size = n_samples // n_splits
-    indices = list(range(n_samples))
-    folds = [
-        indices[i * fold_size : (i + 1) * fold_size] for i in range(n_splits)
-    ]
-    if n_samples % n_splits:
-        folds[-1].extend(indices[n_splits * fold_size :])
+    folds = _folds(n_samples, n_splits)
 
     for combo in combinations(range(n_splits), n_test_splits):
         test_indices = sorted([i for idx in combo for i in folds[idx]])
@@ -198,6 +243,7 @@ def run_cpcv(
     n_samples = len(data)
     embargo = int(n_samples * embargo_pct)
     results = []
+    returns = []
 
     for train_indices, test_indices in combinatorial_purged_cv(
         n_splits, n_samples, n_test_splits, embargo
@@ -205,11 +251,193 @@ def run_cpcv(
         train_data = data.iloc[train_indices]
         test_data = data.iloc[test_indices]
 
-        # 直接執行策略函式，目前僅示範用途
-        strategy_func(train_data, test_data)
+        nav_series = strategy_func(train_data, test_data)
+        if nav_series is None:
+            continue
+        nav = np.asarray(nav_series, dtype=np.float64)
+        results.append(Performance(nav_series=nav.tolist()).compute_metrics())
+        # 測試期第一筆沒有前一期 NAV，報酬記為 0
+        previous = np.concatenate([nav[:1], nav[:-1]])
+        returns.append(np.diff(nav, prepend=nav[:1]) / previous)
+
+    missing = comb(n_splits, n_test_splits) - len(returns)
+    if missing:
+        warnings.warn(
+            f"{missing} 個組合未回傳 NAV，結果不含測試期報酬，無法組成回測路徑"
+        )
+        return CPCVResult(results)
+    return CPCVResult(results, returns, n_splits, n_test_splits, n_samples)
+
+
+def cpcv_path_map(n_splits: int, n_test_splits: int) -> np.ndarray:
+    """
+    CPCV 回測路徑對照表。
+
+    每一折在 C(N-1, k-1) 個組合中屬於測試集，依組合順序分配給
+    φ = C(N-1, k-1) 條路徑，使每條路徑恰好涵蓋每一折一次。
+
+    Args:
+        n_splits: 分割的折數 N。
+        n_test_splits: 每次組合用於測試的折數 k。
+
+    Returns:
+        路徑 × 折的陣列，值為提供該折測試結果的組合索引，
+        組合順序與 ``combinatorial_purged_cv`` 相同。
+    """
+    combos = np.array(list(combinations(range(n_splits), n_test_splits)))
+    member = np.zeros((len(combos), n_splits), dtype=bool)
+    member[np.arange(len(combos))[:, None], combos] = True
+    n_paths = comb(n_splits - 1, n_test_splits - 1)
+    return np.argsort(~member, axis=0, kind="stable")[:n_paths].astype(np.int64)
+
 
-        # 如需計算績效，可將返回的 nav_series 轉為 Performance 物件
-        # performance = Performance(nav_series=nav_series.tolist())
-        # results.append(performance.compute_metrics())
+def assemble_cpcv_paths(
+    combo_returns: Sequence[np.ndarray],
+    n_splits: int,
+    n_test_splits: int,
+    n_samples: int,
+) -> np.ndarray:
+    """
+    將各組合的測試期報酬組成 φ 條完整回測路徑。
+
+    Args:
+        combo_returns: 依 ``combinatorial_purged_cv`` 順序排列的各組合
+            測試期報酬，長度與該組合的測試索引相同。
+        n_splits: 分割的折數。
+        n_test_splits: 每次組合用於測試的折數。
+        n_samples: 資料的總樣本數。
+
+    Returns:
+        路徑 × 樣本的報酬陣列。
+    """
+    folds = _folds(n_samples, n_splits)
+    fold_of = np.empty(n_samples, dtype=np.int64)
+    for j, fold in enumerate(folds):
+        fold_of[fold] = j
+
+    # 先展開為組合 × 樣本矩陣，再依對照表逐樣本取值
+    full = np.full((len(combo_returns), n_samples), np.nan)
+    for c, combo in enumerate(combinations(range(n_splits), n_test_splits)):
+        test_indices = np.concatenate([folds[j] for j in combo])
+        full[c, test_indices] = combo_returns[c]
+    path_map = cpcv_path_map(n_splits, n_test_splits)
+    paths: np.ndarray = full[path_map[:, fold_of], np.arange(n_samples)]
+    return paths
+
+
+@dataclass
+class PBOResult:
+    """CSCV 過度擬合機率的計算結果，陣列皆依組合排列。"""
+
+    pbo: float
+    logits: np.ndarray
+    best: np.ndarray
+    is_performance: np.ndarray
+    oos_performance: np.ndarray
+
+
+def probability_of_backtest_overfitting(
+    performance: np.ndarray, n_test_splits: int | None = None
+) -> PBOResult:
+    """
+    以 CSCV 計算回測過度擬合機率（PBO）。
+
+    對所有 C(S, S/2) 種切分，以樣本內平均績效最佳的設定在樣本外的
+    相對排名 ω 計算 logit λ = ln(ω / (1 - ω))，PBO 為 λ ≤ 0 的比例。
+    所有切分以一次矩陣乘法計算。
+
+    Args:
+        performance: 設定 × 區塊的績效矩陣，例如各區塊的報酬或 Sharpe。
+        n_test_splits: 樣本外區塊數，預設為區塊數的一半。
+
+    Returns:
+        ``PBOResult``，含 PBO、各切分的 logit、選中的設定，以及該設定的
+        樣本內與樣本外績效。
+    """
+    performance = np.asarray(performance, dtype=np.float64)
+    n_configs, n_blocks = performance.shape
+    if n_test_splits is None:
+        n_test_splits = n_blocks // 2
+    if n_configs < 2 or not 0 < n_test_splits < n_blocks:
+        raise ValueError("至少需要 2 組設定，且 n_test_splits 需介於 1 與區塊數-1")
+
+    combos = np.array(list(combinations(range(n_blocks), n_blocks - n_test_splits)))
+    in_sample = np.zeros((len(combos), n_blocks))
+    in_sample[np.arange(len(combos))[:, None], combos] = 1.0
+    is_perf = performance @ (in_sample / in_sample.sum(axis=1, keepdims=True)).T
+    out_sample = 1.0 - in_sample
+    oos_perf = performance @ (out_sample / out_sample.sum(axis=1, keepdims=True)).T
+
+    columns = np.arange(len(combos))
+    best = np.argmax(is_perf, axis=0)
+    best_oos = oos_perf[best, columns]
+    # 排名 1..N，同分取平均
+    ties = (oos_perf == best_oos).sum(axis=0)
+    rank = (oos_perf < best_oos).sum(axis=0) + (ties + 1) / 2
+    omega = rank / (n_configs + 1)
+    logits = np.log(omega / (1 - omega))
+    return PBOResult(
+        pbo=float(np.mean(logits <= 0)),
+        logits=logits,
+        best=best,
+        is_performance=is_perf[best, columns],
+        oos_performance=best_oos,
+    )
+
+
+def expected_max_sharpe(n_trials: int, variance: float) -> float:
+    """
+    在 Sharpe 真值為 0 時，``n_trials`` 次試驗中最大 Sharpe 的期望值。
+
+    Args:
+        n_trials: 試驗（設定）數。
+        variance: 各試驗 Sharpe 的變異數。
+
+    Returns:
+        期望最大 Sharpe，單位與輸入的 Sharpe 相同。
+    """
+    if n_trials < 2:
+        return 0.0
+    return float(
+        np.sqrt(variance)
+        * (
+            (1 - EULER_GAMMA) * norm.ppf(1 - 1 / n_trials)
+            + EULER_GAMMA * norm.ppf(1 - 1 / (n_trials * np.e))
+        )
+    )
 
-    return CPCVResult(results)
+
+def deflated_sharpe_ratio(
+    returns: np.ndarray, n_trials: int | None = None
+) -> np.ndarray:
+    """
+    計算各設定的 Deflated Sharpe Ratio。
+
+    以各列的每期 Sharpe 變異數估計多重試驗下的期望最大 Sharpe，
+    再依偏態、峰態與樣本數校正，回傳 Sharpe 真值大於該基準的機率。
+    缺值（NaN）不計入該列的統計。
+
+    Args:
+        returns: 設定 × 期數的報酬矩陣。
+        n_trials: 試驗總數，預設為設定數。
+
+    Returns:
+        每個設定的 DSR，介於 0 與 1。
+    """
+    returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+    valid = np.isfinite(returns)
+    count = valid.sum(axis=1)
+    safe = np.maximum(count, 1)
+    mean = np.where(valid, returns, 0.0).sum(axis=1) / safe
+    dev = np.where(valid, returns - mean[:, None], 0.0)
+    m2 = (dev**2).sum(axis=1) / safe
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = mean / np.sqrt(m2)
+        skewness = (dev**3).sum(axis=1) / safe / m2**1.5
+        kurt = (dev**4).sum(axis=1) / safe / m2**2
+        n_trials = n_trials or len(returns)
+        variance = np.nanvar(sharpe, ddof=1) if len(sharpe) > 1 else 0.0
+        sr0 = expected_max_sharpe(n_trials, float(variance))
+        denom = np.sqrt(1 - skewness * sharpe + (kurt - 1) / 4 * sharpe**2)
+        psr: np.ndarray = norm.cdf((sharpe - sr0) * np.sqrt(count - 1) / denom)
+        return psr
@@ -9,6 +9,11 @@ from .storage_backend import (
 )
 from .catalog import Catalog, CatalogEntry, send_slack_alert, check_drift
 from .migrations import init_duck, init_timescale, ensure_bucket
+from .compaction import CompactionService, CompactionResult
+from .rollups import RollupSpec
+from .layout import CompressionSpec, TableLayout
+from .retention import RetentionAction, RetentionRule, RetentionService
+from .flight import FlightStorageBackend, StorageFlightServer
 
 __all__ = [
     "StorageBackend",
@@ -23,4 +28,14 @@ __all__ = [
     "init_duck",
     "init_timescale",
     "ensure_bucket",
+    "CompactionService",
+    "CompactionResult",
+    "RollupSpec",
+    "TableLayout",
+    "CompressionSpec",
+    "RetentionRule",
+    "RetentionService",
+    "RetentionAction",
+    "StorageFlightServer",
+    "FlightStorageBackend",
 ]
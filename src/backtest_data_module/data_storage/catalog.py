@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import hashlib
 import sqlite3
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from typing import TYPE_CHECKING
@@ -28,10 +29,11 @@ class CatalogEntry:
 
 
 class Catalog:
-    """使用 SQLite 紀錄資料表所在層級與 schema。"""
+    """使用 SQLite 紀錄資料表所在層級與 schema，可跨執行緒共用。"""
 
     def __init__(self, db_path: str = ":memory:") -> None:
-        self.conn = sqlite3.connect(db_path)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
         self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS catalog (
@@ -52,38 +54,47 @@ class Catalog:
 
     def upsert(self, entry: CatalogEntry) -> None:
         """新增一筆表格版本紀錄。"""
-        with self.conn:
-            cur = self.conn.execute(
-                "SELECT COALESCE(MAX(version), 0) + 1 FROM catalog WHERE table_name=?",
-                (entry.table_name,),
-            )
-            version = cur.fetchone()[0]
-            entry.version = version
-            entry.created_at = entry.created_at or datetime.utcnow().isoformat()
-            self.conn.execute(
-                """
-                INSERT INTO catalog (
-                    table_name, version, tier, location, schema_hash,
-                    row_count, partition_keys, lineage, created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    entry.table_name,
-                    entry.version,
-                    entry.tier,
-                    entry.location,
-                    entry.schema_hash,
-                    entry.row_count,
-                    entry.partition_keys,
-                    entry.lineage,
-                    entry.created_at,
-                ),
+        with self._lock, self.conn:
+            self._insert(entry)
+
+    def _insert(self, entry: CatalogEntry) -> None:
+        cur = self.conn.execute(
+            "SELECT COALESCE(MAX(version), 0) + 1 FROM catalog WHERE table_name=?",
+            (entry.table_name,),
+        )
+        version = cur.fetchone()[0]
+        entry.version = version
+        entry.created_at = entry.created_at or datetime.utcnow().isoformat()
+        self.conn.execute(
+            """
+            INSERT INTO catalog (
+                table_name, version, tier, location, schema_hash,
+                row_count, partition_keys, lineage, created_at
             )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                entry.table_name,
+                entry.version,
+                entry.tier,
+                entry.location,
+                entry.schema_hash,
+                entry.row_count,
+                entry.partition_keys,
+                entry.lineage,
+                entry.created_at,
+            ),
+        )
+
+    def upsert_many(self, entries: list[CatalogEntry]) -> None:
+        """於單一交易內新增多筆紀錄，任一筆失敗則全部回復。"""
+        with self._lock, self.conn:
+            for entry in entries:
+                self._insert(entry)
 
     def update_tier(self, table_name: str, tier: str, location: str) -> None:
         """更新表格所在層級。"""
-        with self.conn:
+        with self._lock, self.conn:
             self.conn.execute(
                 """
                 UPDATE catalog
@@ -95,19 +106,39 @@ class Catalog:
             )
 
     def get(self, table_name: str) -> CatalogEntry | None:
-        cur = self.conn.execute(
-            (
-                "SELECT table_name, version, tier, location, schema_hash, row_count,"
-                " partition_keys, lineage, created_at FROM catalog"
-                " WHERE table_name=? ORDER BY version DESC LIMIT 1"
-            ),
-            (table_name,),
-        )
-        row = cur.fetchone()
+        with self._lock:
+            cur = self.conn.execute(
+                (
+                    "SELECT table_name, version, tier, location, schema_hash,"
+                    " row_count, partition_keys, lineage, created_at FROM catalog"
+                    " WHERE table_name=? ORDER BY version DESC LIMIT 1"
+                ),
+                (table_name,),
+            )
+            row = cur.fetchone()
         if row:
             return CatalogEntry(*row)
         return None
 
+    def latest_entries(self, tier: str | None = None) -> list[CatalogEntry]:
+        """取得每個表格的最新版本，依建立時間由舊到新排序。"""
+        query = (
+            "SELECT c.table_name, c.version, c.tier, c.location, c.schema_hash,"
+            " c.row_count, c.partition_keys, c.lineage, c.created_at"
+            " FROM catalog c"
+            " JOIN (SELECT table_name, MAX(version) AS ver FROM catalog"
+            " GROUP BY table_name) m"
+            " ON c.table_name = m.table_name AND c.version = m.ver"
+        )
+        params: tuple[str, ...] = ()
+        if tier is not None:
+            query += " WHERE c.tier=?"
+            params = (tier,)
+        query += " ORDER BY c.created_at, c.table_name"
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [CatalogEntry(*row) for row in rows]
+
 
 def send_slack_alert(message: str, webhook_url: str | None = None) -> None:
     """已廢棄：改用 Notifier 介面。"""
@@ -135,7 +166,11 @@ def check_drift(
     )
     mismatches = []
     for table, tier, stored_hash in cur.fetchall():
-        backend = manager._backend_for(tier)
+        try:
+            backend = manager._backend_for(tier)
+        except ValueError:
+            # 例如已被壓縮合併的片段，不再對應任何層級
+            continue
         try:
             df = backend.read(table)
         except KeyError:
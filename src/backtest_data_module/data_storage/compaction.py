@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from typing import Any, Sequence
+
+import polars as pl
+
+from backtest_data_module.data_storage.catalog import CatalogEntry
+from backtest_data_module.data_storage.predicates import encode_filters
+from backtest_data_module.data_storage.storage_backend import (
+    COMPACTED_TIER,
+    HybridStorageManager,
+    compacted_part_name,
+    is_compacted_part,
+)
+
+# 片段鍵值少於此數量時以 ``in`` 記錄，否則記錄最小與最大值
+_MAX_FRAGMENT_VALUES = 64
+
+
+@dataclass
+class CompactionResult:
+    """單次壓縮合併的結果摘要。"""
+
+    target: str
+    tier: str
+    fragments: list[str] = field(default_factory=list)
+    parts: list[str] = field(default_factory=list)
+    row_count: int = 0
+
+
+class CompactionService:
+    """將增量寫入產生的小表格合併為固定大小的分段。
+
+    符合 ``pattern`` 的小表格會依 ``sort_by`` 排序後寫成 ``{target}__partNNNNN``，
+    每個分段約 ``target_bytes``（以 ``estimated_size`` 估計），``target_rows``
+    可另外限制筆數。新分段與片段的 ``compacted`` 標記於同一個 Catalog 交易中
+    登記，標記記錄合併目標與片段的鍵值範圍，讀取 ``target`` 或原片段名稱時
+    ``HybridStorageManager`` 會改由分段提供資料。
+    已合併的片段會從儲存層刪除，因此下次執行只會處理新的片段；
+    若最後一個分段尚未達到目標大小，會與新片段一併重寫。
+    """
+
+    def __init__(
+        self,
+        manager: HybridStorageManager,
+        *,
+        target_bytes: int = 128 * 1024 * 1024,
+        target_rows: int | None = None,
+        sort_by: Sequence[str] = ("asset", "date"),
+    ) -> None:
+        if target_bytes <= 0:
+            raise ValueError("target_bytes must be positive")
+        if target_rows is not None and target_rows <= 0:
+            raise ValueError("target_rows must be positive")
+        self.manager = manager
+        self.target_bytes = target_bytes
+        self.target_rows = target_rows
+        self.sort_by = list(sort_by)
+
+    @staticmethod
+    def part_name(target: str, index: int) -> str:
+        return compacted_part_name(target, index)
+
+    def _is_part(self, table: str, target: str) -> bool:
+        return is_compacted_part(table, target)
+
+    def find_fragments(self, pattern: str, target: str, tier: str) -> list[str]:
+        """列出尚未合併的片段，依寫入時間排序。
+
+        設定 ``target_rows`` 時略過已達該筆數的表格。
+        """
+        return [
+            e.table_name
+            for e in self.manager.catalog.latest_entries(tier)
+            if fnmatch(e.table_name, pattern)
+            and not self._is_part(e.table_name, target)
+            and (self.target_rows is None or e.row_count < self.target_rows)
+        ]
+
+    def _rows_per_part(self, df: pl.DataFrame) -> int:
+        """依每筆平均位元組數換算分段筆數。"""
+        row_bytes = df.estimated_size() / max(df.height, 1)
+        rows = max(1, int(self.target_bytes / max(row_bytes, 1)))
+        return rows if self.target_rows is None else min(rows, self.target_rows)
+
+    def _fragment_filters(self, df: pl.DataFrame, keys: list[str]) -> list[Any]:
+        """記錄片段在排序鍵上的範圍，供以原名稱讀取時篩選分段。"""
+        filters: list[Any] = []
+        for key in keys:
+            if key not in df.columns:
+                continue
+            values = df[key].drop_nulls().unique().sort()
+            if values.is_empty():
+                continue
+            if values.len() <= _MAX_FRAGMENT_VALUES:
+                filters.append((key, "in", values.to_list()))
+            else:
+                filters.append((key, ">=", values.min()))
+                filters.append((key, "<=", values.max()))
+        return encode_filters(filters)
+
+    def _existing_parts(self, target: str, tier: str) -> list[CatalogEntry]:
+        return sorted(
+            (
+                e
+                for e in self.manager.catalog.latest_entries(tier)
+                if self._is_part(e.table_name, target)
+            ),
+            key=lambda e: e.table_name,
+        )
+
+    def compact(
+        self,
+        pattern: str,
+        target: str,
+        *,
+        tier: str = "cold",
+        dry_run: bool = False,
+    ) -> CompactionResult:
+        """合併 ``tier`` 中符合 ``pattern`` 的片段。"""
+        result = CompactionResult(target=target, tier=tier)
+        fragments = self.find_fragments(pattern, target, tier)
+        result.fragments = fragments
+        if not fragments or dry_run:
+            return result
+
+        manager = self.manager
+        manager._backend_for(tier)
+        locks = manager._locks
+        frames: list[pl.DataFrame] = []
+        for table in fragments:
+            with locks.read(table):
+                frames.append(manager._tier_read(tier, table, "compact_read"))
+        fragment_rows = self._rows_per_part(pl.concat(frames, how="diagonal_relaxed"))
+
+        parts = self._existing_parts(target, tier)
+        start_index = len(parts)
+        reopened: pl.DataFrame | None = None
+        if parts and parts[-1].row_count < fragment_rows:
+            # 最後一個分段未滿，與新片段合併後重寫
+            start_index -= 1
+            with locks.read(parts[-1].table_name):
+                reopened = manager._tier_read(
+                    tier, parts[-1].table_name, "compact_read"
+                )
+
+        merged = pl.concat(
+            [reopened, *frames] if reopened is not None else frames,
+            how="diagonal_relaxed",
+        )
+        keys = [c for c in self.sort_by if c in merged.columns]
+        if keys:
+            merged = merged.sort(keys)
+        schema_hash = hashlib.sha256(str(merged.schema).encode()).hexdigest()
+        rows_per_part = self._rows_per_part(merged)
+
+        entries: list[CatalogEntry] = []
+        for offset in range(0, merged.height, rows_per_part):
+            chunk = merged.slice(offset, rows_per_part)
+            name = self.part_name(target, start_index + len(result.parts))
+            with locks.write(name):
+                manager._tier_write(
+                    tier, chunk, name, "compact_write", manager._layout_metadata(name)
+                )
+            partition_data = {
+                key: [str(chunk[key].min()), str(chunk[key].max())] for key in keys
+            }
+            entries.append(
+                CatalogEntry(
+                    table_name=name,
+                    version=0,
+                    tier=tier,
+                    location=tier,
+                    schema_hash=schema_hash,
+                    row_count=chunk.height,
+                    partition_keys=json.dumps(partition_data, ensure_ascii=False),
+                    lineage="compact",
+                )
+            )
+            result.parts.append(name)
+        result.row_count = merged.height
+
+        entries.extend(
+            CatalogEntry(
+                table_name=table,
+                version=0,
+                tier=COMPACTED_TIER,
+                location=target,
+                schema_hash="",
+                row_count=frame.height,
+                partition_keys=json.dumps(
+                    {"filters": self._fragment_filters(frame, keys)},
+                    ensure_ascii=False,
+                ),
+                lineage=f"compacted into {target}",
+            )
+            for table, frame in zip(fragments, frames)
+        )
+        # 新分段與片段狀態於同一交易登記，失敗時移除新寫入的分段
+        try:
+            manager.catalog.upsert_many(entries)
+        except Exception:
+            new_parts = result.parts
+            if reopened is not None:
+                manager._tier_write(tier, reopened, result.parts[0], "compact_write")
+                new_parts = result.parts[1:]
+            for name in new_parts:
+                manager._tier_delete(tier, name)
+            raise
+
+        for name in result.parts:
+            if tier == "hot":
+                manager._record_lru(manager._hot_lru, name)
+            elif tier == "warm":
+                manager._record_lru(manager._warm_lru, name)
+        for table in fragments:
+            manager.delete(table)
+        manager._check_capacity()
+        return result
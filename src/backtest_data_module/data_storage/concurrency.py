@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class ReadWriteLock:
+    """允許多個讀者或單一寫者的鎖，等待中的寫者優先以避免飢餓。"""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def try_acquire_read(self) -> bool:
+        """不等待地嘗試取得讀取鎖，成功時回傳 ``True``。"""
+        with self._cond:
+            if self._writer or self._waiting_writers:
+                return False
+            self._readers += 1
+            return True
+
+    def release_read(self) -> None:
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._cond:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+
+    def try_acquire_write(self) -> bool:
+        """不等待地嘗試取得寫入鎖，成功時回傳 ``True``。"""
+        with self._cond:
+            if self._writer or self._readers:
+                return False
+            self._writer = True
+            return True
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class TableLocks:
+    """依表格名稱配發 ``ReadWriteLock``，同一表格共用同一把鎖。"""
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._locks: dict[str, ReadWriteLock] = {}
+
+    def get(self, table: str) -> ReadWriteLock:
+        with self._guard:
+            lock = self._locks.get(table)
+            if lock is None:
+                lock = self._locks[table] = ReadWriteLock()
+            return lock
+
+    @contextmanager
+    def read(self, table: str) -> Iterator[None]:
+        with self.get(table).read_locked():
+            yield
+
+    @contextmanager
+    def write(self, table: str) -> Iterator[None]:
+        with self.get(table).write_locked():
+            yield
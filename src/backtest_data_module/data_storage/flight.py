@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Iterator, Sequence
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.flight as flight
+from polars.io.plugins import register_io_source
+
+from backtest_data_module.data_storage.predicates import (
+    decode_filters,
+    encode_filters,
+    split_predicate,
+)
+from backtest_data_module.data_storage.storage_backend import (
+    HybridStorageManager,
+    StorageBackend,
+)
+
+Filter = Sequence[Any]
+
+_OPS = {
+    "==": lambda c, v: c == v,
+    "!=": lambda c, v: c != v,
+    "<": lambda c, v: c < v,
+    "<=": lambda c, v: c <= v,
+    ">": lambda c, v: c > v,
+    ">=": lambda c, v: c >= v,
+    "in": lambda c, v: c.is_in(v),
+    "not in": lambda c, v: ~c.is_in(v),
+}
+
+
+def filters_to_expr(filters: Sequence[Filter] | None) -> pl.Expr | None:
+    """將 ``[(column, op, value), ...]`` 轉為以 AND 串接的 Polars 條件。"""
+    expr: pl.Expr | None = None
+    for column, op, value in filters or []:
+        if op not in _OPS:
+            raise ValueError(f"不支援的篩選運算子: {op}")
+        cond = _OPS[op](pl.col(column), value)
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def encode_ticket(
+    table: str,
+    *,
+    columns: list[str] | None = None,
+    filters: Sequence[Filter] | None = None,
+    sort_by: list[str] | None = None,
+    batch_size: int | None = None,
+    tiers: list[str] | None = None,
+) -> flight.Ticket:
+    """將讀取請求編碼為 Flight ticket。"""
+    payload = {
+        "table": table,
+        "columns": columns,
+        "filters": encode_filters(filters),
+        "sort_by": sort_by,
+        "batch_size": batch_size,
+        "tiers": tiers,
+    }
+    return flight.Ticket(json.dumps(payload).encode())
+
+
+def decode_ticket(ticket: flight.Ticket) -> dict[str, Any]:
+    payload: dict[str, Any] = json.loads(ticket.ticket.decode())
+    payload["filters"] = decode_filters(payload.get("filters"))
+    return payload
+
+
+class _ArrowCache:
+    """以位元組上限淘汰的 Arrow Table 快取，依 Catalog 版本判斷是否過期。"""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[tuple[Any, ...], pa.Table] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[Any, ...]) -> pa.Table | None:
+        with self._lock:
+            table = self._items.get(key)
+            if table is not None:
+                self._items.move_to_end(key)
+            return table
+
+    def put(self, key: tuple[Any, ...], table: pa.Table) -> None:
+        if table.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._items[key] = table
+            self._bytes += table.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def invalidate(self, table: str) -> None:
+        with self._lock:
+            for key in [k for k in self._items if k[0] == table]:
+                self._bytes -= self._items.pop(key).nbytes
+
+
+class StorageFlightServer(flight.FlightServerBase):  # type: ignore[misc]
+    """以 Arrow Flight 對外提供 ``HybridStorageManager`` 的讀取服務。
+
+    多個 worker 共用同一組儲存連線。未快取的請求經由
+    ``HybridStorageManager.read_batches`` 將投影、篩選與排序下推至後端並逐批
+    傳送；完整表格讀取在傳送的同時依 Catalog 版本快取在記憶體中，之後的請求
+    若命中快取則直接在快取上計算。
+    建構後即開始監聽，``serve()`` 會阻塞直到 ``shutdown()``。
+    """
+
+    def __init__(
+        self,
+        manager: HybridStorageManager,
+        location: str = "grpc://0.0.0.0:0",
+        *,
+        cache_bytes: int = 512 * 1024 * 1024,
+        batch_size: int = 65_536,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(location, **kwargs)
+        self.manager = manager
+        self.batch_size = batch_size
+        self._cache = _ArrowCache(cache_bytes)
+
+    def _version(self, table: str) -> int | None:
+        entry = self.manager.catalog.get(table)
+        return entry.version if entry else None
+
+    def _key(self, request: dict[str, Any]) -> tuple[Any, ...]:
+        table = request["table"]
+        return (table, self._version(table), tuple(request.get("tiers") or ()))
+
+    def _from_cache(self, request: dict[str, Any]) -> pa.Table | None:
+        """若完整表格已快取，於快取上計算投影、篩選與排序。"""
+        cached = self._cache.get(self._key(request))
+        if cached is None:
+            return None
+        columns = request.get("columns")
+        predicate = filters_to_expr(request.get("filters"))
+        sort_by = request.get("sort_by")
+        if columns is None and predicate is None and not sort_by:
+            return cached
+        lazy = pl.from_arrow(cached).lazy()  # type: ignore[union-attr]
+        if predicate is not None:
+            lazy = lazy.filter(predicate)
+        if sort_by:
+            lazy = lazy.sort(sort_by, maintain_order=True)
+        if columns:
+            lazy = lazy.select(columns)
+        return lazy.collect().to_arrow()
+
+    def _caching(
+        self,
+        key: tuple[Any, ...],
+        schema: pa.Schema,
+        batches: Iterator[pa.RecordBatch],
+    ) -> Iterator[pa.RecordBatch]:
+        """邊傳送邊保留完整表格的批次，未超過快取上限時於結束後放入快取。"""
+        kept: list[pa.RecordBatch] | None = []
+        size = 0
+        for batch in batches:
+            if kept is not None:
+                size += batch.nbytes
+                if size > self._cache.max_bytes:
+                    kept = None
+                else:
+                    kept.append(batch)
+            yield batch
+        if kept is not None:
+            self._cache.put(key, pa.Table.from_batches(kept, schema))
+
+    def _schema(self, table: str) -> pa.Schema:
+        schema = self.manager.schema(table)
+        return pl.DataFrame(schema=schema).to_arrow().schema
+
+    def _flight_info(self, table: str) -> flight.FlightInfo:
+        descriptor = flight.FlightDescriptor.for_path(table)
+        entry = self.manager.catalog.get(table)
+        endpoint = flight.FlightEndpoint(encode_ticket(table).ticket, [])
+        return flight.FlightInfo(
+            self._schema(table),
+            descriptor,
+            [endpoint],
+            entry.row_count if entry else -1,
+            -1,
+        )
+
+    def list_flights(
+        self, context: flight.ServerCallContext, criteria: bytes
+    ) -> Iterator[flight.FlightInfo]:
+        for entry in self.manager.catalog.latest_entries():
+            if entry.tier not in ("hot", "warm", "cold"):
+                continue
+            try:
+                yield self._flight_info(entry.table_name)
+            except KeyError:
+                continue
+
+    def get_flight_info(
+        self, context: flight.ServerCallContext, descriptor: flight.FlightDescriptor
+    ) -> flight.FlightInfo:
+        return self._flight_info(descriptor.path[0].decode())
+
+    def do_get(
+        self, context: flight.ServerCallContext, ticket: flight.Ticket
+    ) -> flight.FlightDataStream:
+        request = decode_ticket(ticket)
+        batch_size = request.get("batch_size") or self.batch_size
+        cached = self._from_cache(request)
+        if cached is not None:
+            return flight.GeneratorStream(
+                cached.schema, iter(cached.to_batches(max_chunksize=batch_size))
+            )
+        table = request["table"]
+        columns = request.get("columns")
+        sort_by = request.get("sort_by")
+        key = self._key(request)
+        batches = self.manager.read_batches(
+            table,
+            columns=columns,
+            predicate=filters_to_expr(request.get("filters")),
+            sort_by=sort_by,
+            batch_size=batch_size,
+            tiers=request.get("tiers"),
+        )
+        first = next(batches, None)
+        if first is None:
+            schema = self._schema(table)
+            if columns:
+                schema = pa.schema([schema.field(c) for c in columns])
+            return flight.GeneratorStream(schema, iter([]))
+        stream: Iterator[pa.RecordBatch] = itertools.chain([first], batches)
+        if columns is None and not request.get("filters") and not sort_by:
+            stream = self._caching(key, first.schema, stream)
+        return flight.GeneratorStream(first.schema, stream)
+
+    def do_put(
+        self,
+        context: flight.ServerCallContext,
+        descriptor: flight.FlightDescriptor,
+        reader: flight.MetadataRecordBatchReader,
+        writer: flight.FlightMetadataWriter,
+    ) -> None:
+        table = descriptor.path[0].decode()
+        tier = descriptor.path[1].decode() if len(descriptor.path) > 1 else "hot"
+        df = pl.from_arrow(reader.read_all())
+        self.manager.write(df, table, tier=tier)  # type: ignore[arg-type]
+        self._cache.invalidate(table)
+
+    def do_action(
+        self, context: flight.ServerCallContext, action: flight.Action
+    ) -> Iterator[bytes]:
+        if action.type == "delete":
+            table = action.body.to_pybytes().decode()
+            self.manager.delete(table)
+            self._cache.invalidate(table)
+            return iter([])
+        raise KeyError(f"未知的 action: {action.type}")
+
+    def list_actions(
+        self, context: flight.ServerCallContext
+    ) -> list[tuple[str, str]]:
+        return [("delete", "刪除表格")]
+
+
+class FlightStorageBackend(StorageBackend):
+    """透過 ``StorageFlightServer`` 讀寫資料的儲存後端。
+
+    ``read_batches`` 以串流方式逐批接收 Arrow 資料；``scan`` 會將欄位投影，
+    以及條件中欄位與常數的比較、``is_in`` 以 ticket 的 ``filters`` 送至伺服器
+    處理，其餘 Polars 條件於接收後套用。
+    """
+
+    def __init__(
+        self, location: str, *, tier: str = "hot", batch_size: int = 65_536
+    ) -> None:
+        self.location = location
+        self.tier = tier
+        self.batch_size = batch_size
+        self.client = flight.FlightClient(location)
+
+    def _reader(
+        self, table: str, **kwargs: Any
+    ) -> flight.FlightStreamReader:
+        try:
+            return self.client.do_get(encode_ticket(table, **kwargs))
+        except KeyError as e:
+            raise KeyError(table) from e
+
+    def list_tables(self) -> list[str]:
+        return [
+            info.descriptor.path[0].decode() for info in self.client.list_flights()
+        ]
+
+    def read_arrow(
+        self,
+        table: str,
+        *,
+        columns: list[str] | None = None,
+        filters: Sequence[Filter] | None = None,
+    ) -> pa.Table:
+        reader = self._reader(table, columns=columns, filters=filters)
+        try:
+            return reader.read_all()
+        except KeyError as e:
+            raise KeyError(table) from e
+
+    def read(self, table: str) -> pl.DataFrame:
+        return pl.from_arrow(self.read_arrow(table))  # type: ignore[return-value]
+
+    def read_batches(
+        self,
+        table: str,
+        *,
+        columns: list[str] | None = None,
+        filters: Sequence[Filter] | None = None,
+        predicate: pl.Expr | None = None,
+        sort_by: list[str] | None = None,
+        batch_size: int | None = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """逐批接收查詢結果。
+
+        ``predicate`` 中可下推的比較與 ``filters`` 一併送至伺服器，其餘條件於
+        接收後套用；``sort_by`` 由伺服器排序，同值保留寫入順序。
+        """
+        pushed, rest = split_predicate(predicate)
+        requested = columns
+        if columns and rest is not None:
+            requested = list(dict.fromkeys([*columns, *rest.meta.root_names()]))
+        reader = self._reader(
+            table,
+            columns=requested,
+            filters=[*(filters or []), *pushed],
+            sort_by=sort_by,
+            batch_size=batch_size or self.batch_size,
+        )
+        try:
+            for chunk in reader:
+                if rest is None:
+                    yield chunk.data
+                    continue
+                df = pl.from_arrow(chunk.data)
+                assert isinstance(df, pl.DataFrame)
+                df = df.filter(rest)
+                if columns:
+                    df = df.select(columns)
+                if df.height:
+                    yield from df.to_arrow().to_batches()
+        except KeyError as e:
+            raise KeyError(table) from e
+
+    def scan(self, table: str) -> pl.LazyFrame:
+        try:
+            info = self.client.get_flight_info(
+                flight.FlightDescriptor.for_path(table)
+            )
+        except KeyError as e:
+            raise KeyError(table) from e
+        empty = info.schema.empty_table()
+        schema = pl.from_arrow(empty).schema  # type: ignore[union-attr]
+
+        def source(
+            with_columns: list[str] | None,
+            predicate: pl.Expr | None,
+            n_rows: int | None,
+            batch_size: int | None,
+        ) -> Iterator[pl.DataFrame]:
+            remaining = n_rows
+            for batch in self.read_batches(
+                table,
+                columns=with_columns,
+                predicate=predicate,
+                batch_size=batch_size,
+            ):
+                df = pl.from_arrow(batch)
+                assert isinstance(df, pl.DataFrame)
+                if remaining is not None:
+                    df = df.head(remaining)
+                    remaining -= df.height
+                yield df
+                if remaining is not None and remaining <= 0:
+                    return
+
+        return register_io_source(source, schema=schema)
+
+    def write(
+        self, df: pl.DataFrame, table: str, *, metadata: dict[str, object] | None = None
+    ) -> None:
+        arrow = df.to_arrow()
+        descriptor = flight.FlightDescriptor.for_path(table, self.tier)
+        writer, _ = self.client.do_put(descriptor, arrow.schema)
+        writer.write_table(arrow)
+        writer.close()
+
+    def delete(self, table: str) -> None:
+        list(self.client.do_action(flight.Action("delete", table.encode())))
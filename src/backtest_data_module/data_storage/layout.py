@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+
+import polars as pl
+
+
+@dataclass
+class TableLayout:
+    """表格寫入時的排序鍵與 Parquet row group 大小。
+
+    依 ``cluster_by`` 排序後，同一資產與相鄰時間的資料會落在同一 row group，
+    min/max 統計更緊密，篩選時可略過更多資料，壓縮率也較佳。
+    """
+
+    cluster_by: list[str] = field(default_factory=lambda: ["asset", "date"])
+    row_group_size: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.row_group_size is not None and self.row_group_size <= 0:
+            raise ValueError("row_group_size must be positive")
+
+    def apply(self, df: pl.DataFrame) -> pl.DataFrame:
+        """依存在於 ``df`` 的排序鍵排序，缺少的鍵會被略過。"""
+        keys = [c for c in self.cluster_by if c in df.columns]
+        if not keys:
+            return df
+        return df.sort(keys, maintain_order=True)
+
+    def metadata(self) -> dict[str, object]:
+        """傳給後端 ``write`` 的 metadata。"""
+        if self.row_group_size is None:
+            return {}
+        return {"row_group_size": self.row_group_size}
+
+
+@dataclass
+class CompressionSpec:
+    """單一層級的壓縮設定。"""
+
+    codec: str
+    level: int | None = None
+
+
+def match_layout(layouts: dict[str, TableLayout], table: str) -> TableLayout | None:
+    """回傳第一個符合 ``table`` 的樣式設定。"""
+    for pattern, layout in layouts.items():
+        if fnmatch(table, pattern):
+            return layout
+    return None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from typing import Any
 
 import boto3
@@ -7,9 +8,23 @@ import duckdb
 import psycopg
 
 
-def init_duck(path: str = ":memory:") -> duckdb.DuckDBPyConnection:
-    """初始化 DuckDB 資料庫"""
-    conn = duckdb.connect(path)
+def init_duck(
+    path: str = ":memory:",
+    *,
+    memory_limit: str | None = None,
+    threads: int | None = None,
+    temp_directory: str | None = None,
+) -> duckdb.DuckDBPyConnection:
+    """初始化 DuckDB 資料庫，可設定記憶體上限、執行緒數與溢寫目錄"""
+    config: dict[str, Any] = {}
+    if memory_limit:
+        config["memory_limit"] = memory_limit
+    if threads:
+        config["threads"] = threads
+    if temp_directory:
+        os.makedirs(temp_directory, exist_ok=True)
+        config["temp_directory"] = temp_directory
+    conn = duckdb.connect(path, config=config)
     return conn
 
 
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Sequence
+
+import polars as pl
+
+# (column, op, value) 形式的篩選條件
+Filter = Sequence[Any]
+
+_OPS = {
+    "==": lambda c, v: c == v,
+    "!=": lambda c, v: c != v,
+    "<": lambda c, v: c < v,
+    "<=": lambda c, v: c <= v,
+    ">": lambda c, v: c > v,
+    ">=": lambda c, v: c >= v,
+    "in": lambda c, v: c.is_in(v),
+    "not in": lambda c, v: ~c.is_in(v),
+}
+
+# Polars 序列化後的比較運算子，以及欄位在右側時的對應運算子
+_BINARY_OPS = {
+    "Eq": "==",
+    "NotEq": "!=",
+    "Lt": "<",
+    "LtEq": "<=",
+    "Gt": ">",
+    "GtEq": ">=",
+}
+_FLIPPED = {"==": "==", "!=": "!=", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+_SQL_OPS = {"==": "=", "!=": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+
+def filters_to_expr(filters: Sequence[Filter] | None) -> pl.Expr | None:
+    """將 ``[(column, op, value), ...]`` 轉為以 AND 串接的 Polars 條件。"""
+    expr: pl.Expr | None = None
+    for column, op, value in filters or []:
+        if op not in _OPS:
+            raise ValueError(f"不支援的篩選運算子: {op}")
+        cond = _OPS[op](pl.col(column), value)
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    if isinstance(value, (list, tuple, set)):
+        return [_encode_value(v) for v in value]
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "datetime" in value:
+            return datetime.fromisoformat(value["datetime"])
+        if "date" in value:
+            return date.fromisoformat(value["date"])
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    return value
+
+
+def encode_filters(filters: Sequence[Filter] | None) -> list[list[Any]]:
+    """將篩選條件轉為可 JSON 序列化的串列，日期以 ISO 字串保存。"""
+    return [[c, op, _encode_value(v)] for c, op, v in filters or []]
+
+
+def decode_filters(data: Sequence[Sequence[Any]] | None) -> list[tuple[str, str, Any]]:
+    """``encode_filters`` 的反向轉換。"""
+    return [(c, op, _decode_value(v)) for c, op, v in data or []]
+
+
+def _node_expr(node: Any) -> pl.Expr:
+    return pl.Expr.deserialize(io.StringIO(json.dumps(node)), format="json")
+
+
+def _literal(node: Any) -> pl.Series | None:
+    """若節點不含欄位則求值為 Series，否則回傳 ``None``。"""
+    expr = _node_expr(node)
+    if expr.meta.root_names():
+        return None
+    return pl.select(expr.alias("value")).to_series()
+
+
+def _scalar(value: Any) -> bool:
+    # 帶時區的時間在各後端的比較規則不一，交由 Polars 處理
+    if isinstance(value, datetime):
+        return value.tzinfo is None
+    return isinstance(value, (bool, int, float, str, date))
+
+
+def _to_filter(node: Any) -> tuple[str, str, Any] | None:
+    if "BinaryExpr" in node:
+        binary = node["BinaryExpr"]
+        op = _BINARY_OPS.get(binary["op"])
+        if op is None:
+            return None
+        left, right = binary["left"], binary["right"]
+        if "Column" not in left:
+            left, right, op = right, left, _FLIPPED[op]
+        if "Column" not in left:
+            return None
+        series = _literal(right)
+        if series is None or series.len() != 1:
+            return None
+        value = series.item()
+        if value is None or not _scalar(value):
+            return None
+        return left["Column"], op, value
+    if "Function" in node:
+        function = node["Function"]
+        kind = function.get("function")
+        if not (isinstance(kind, dict) and "IsIn" in kind.get("Boolean", {})):
+            return None
+        column, values = function["input"]
+        if "Column" not in column:
+            return None
+        series = _literal(values)
+        if series is None:
+            return None
+        if isinstance(series.dtype, pl.List):
+            series = series.explode()
+        items = series.drop_nulls().to_list()
+        if not all(_scalar(v) for v in items):
+            return None
+        return column["Column"], "in", items
+    return None
+
+
+def _conjuncts(node: Any) -> list[Any]:
+    binary = node.get("BinaryExpr") if isinstance(node, dict) else None
+    if binary is not None and binary["op"] == "And":
+        return _conjuncts(binary["left"]) + _conjuncts(binary["right"])
+    return [node]
+
+
+def split_predicate(
+    predicate: pl.Expr | None,
+) -> tuple[list[tuple[str, str, Any]], pl.Expr | None]:
+    """拆出可下推的條件。
+
+    以 AND 串接的欄位與常數比較、``is_in`` 轉為 ``(column, op, value)``，
+    其餘部分以 Polars 條件回傳，需於讀回後自行套用；無法解析時整個條件留給 Polars。
+    """
+    if predicate is None:
+        return [], None
+    try:
+        tree = json.loads(predicate.meta.serialize(format="json"))
+        filters: list[tuple[str, str, Any]] = []
+        rest: pl.Expr | None = None
+        for node in _conjuncts(tree):
+            item = _to_filter(node)
+            if item is not None:
+                filters.append(item)
+                continue
+            expr = _node_expr(node)
+            rest = expr if rest is None else rest & expr
+    except Exception:  # noqa: BLE001
+        return [], predicate
+    return filters, rest
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def filters_to_sql(
+    filters: Sequence[Filter], placeholder: str = "?"
+) -> tuple[str, list[Any]]:
+    """將篩選條件轉為 SQL ``WHERE`` 子句與參數，沒有條件時回傳空字串。"""
+    clauses: list[str] = []
+    params: list[Any] = []
+    for column, op, value in filters:
+        name = quote_ident(column)
+        if op in ("in", "not in"):
+            values = list(value)
+            if not values:
+                clauses.append("FALSE" if op == "in" else "TRUE")
+                continue
+            marks = ", ".join([placeholder] * len(values))
+            keyword = "IN" if op == "in" else "NOT IN"
+            clauses.append(f"{name} {keyword} ({marks})")
+            params.extend(values)
+        elif op in _SQL_OPS:
+            clauses.append(f"{name} {_SQL_OPS[op]} {placeholder}")
+            params.append(value)
+        else:
+            raise ValueError(f"不支援的篩選運算子: {op}")
+    if not clauses:
+        return "", []
+    return " WHERE " + " AND ".join(clauses), params
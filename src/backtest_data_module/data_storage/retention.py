@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from fnmatch import fnmatch
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from backtest_data_module.data_storage.catalog import CatalogEntry
+
+if TYPE_CHECKING:  # pragma: no cover - type checking imports
+    from backtest_data_module.data_storage.storage_backend import HybridStorageManager
+
+EXPIRED_TIER = "expired"
+RETENTION_ACTIONS = ("delete", "demote")
+
+_AGE_UNITS = {"h": 1 / 24, "d": 1, "w": 7, "y": 365}
+
+
+def parse_age(age: str) -> timedelta:
+    """將 ``7d``、``12w``、``2y`` 等保留期限轉為 ``timedelta``。"""
+    match = re.fullmatch(r"(\d+)([hdwy])", age)
+    if not match:
+        raise ValueError(f"不支援的保留期限: {age}")
+    return timedelta(days=int(match.group(1)) * _AGE_UNITS[match.group(2)])
+
+
+@dataclass
+class RetentionRule:
+    """符合 ``pattern`` 的表格在 ``tier`` 中最多保留 ``max_age``。
+
+    ``action`` 為 ``delete`` 時刪除整個表格，``demote`` 則搬移至 ``tier_order``
+    中的下一層；``tier`` 為 ``None`` 表示套用至所有層級。
+    """
+
+    pattern: str
+    max_age: str
+    tier: str | None = None
+    action: str = "delete"
+    _age: timedelta = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.action not in RETENTION_ACTIONS:
+            raise ValueError(f"不支援的保留動作: {self.action}")
+        self._age = parse_age(self.max_age)
+
+    @property
+    def age(self) -> timedelta:
+        return self._age
+
+    def matches(self, entry: CatalogEntry) -> bool:
+        if self.tier is not None and entry.tier != self.tier:
+            return False
+        return fnmatch(entry.table_name, self.pattern)
+
+
+@dataclass
+class RetentionAction:
+    """單一表格的過期處理紀錄。"""
+
+    table: str
+    tier: str
+    action: str
+    data_end: datetime
+    rule: str
+    target_tier: str | None = None
+
+
+def _parse_time(value: object) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def data_end(entry: CatalogEntry) -> datetime | None:
+    """由 Catalog 的日期範圍取得資料最晚時間。
+
+    沒有日期欄位的表格使用建立時間；舊版只記錄單一日期（首筆資料的日期）
+    無法代表資料結束時間，回傳 ``None`` 表示未知。
+    """
+    try:
+        partition = json.loads(entry.partition_keys or "{}")
+    except ValueError:
+        partition = {}
+    value = partition.get("date")
+    if isinstance(value, list):
+        return _parse_time(value[-1]) if value else None
+    if value is not None:
+        return None
+    return _parse_time(entry.created_at) or datetime.max
+
+
+class RetentionService:
+    """依保留規則整表刪除或下移過期的分割區與分段。
+
+    每個表格視為一個分割區，只有其最新資料也已超過期限時才處理，
+    因此不需逐列刪除。Catalog 缺少日期範圍時改讀取表格的 ``date`` 最大值。
+    處理結果會以新版本寫入 Catalog：刪除的表格與隨之刪除的 rollup 皆標記為
+    ``expired`` 層級，下移的表格則記錄新層級。
+    """
+
+    def __init__(
+        self,
+        manager: HybridStorageManager,
+        rules: list[RetentionRule] | None = None,
+    ) -> None:
+        self.manager = manager
+        self.rules = list(rules if rules is not None else manager.retention_rules)
+
+    def _rule_for(self, entry: CatalogEntry) -> RetentionRule | None:
+        for rule in self.rules:
+            if rule.matches(entry):
+                return rule
+        return None
+
+    def _next_tier(self, tier: str) -> str | None:
+        order = self.manager.tier_order
+        if tier not in order or order.index(tier) + 1 >= len(order):
+            return None
+        return order[order.index(tier) + 1]
+
+    def _data_end(self, entry: CatalogEntry) -> datetime | None:
+        end = data_end(entry)
+        if end is not None:
+            return end
+        # 直接讀取後端，不計入存取次數
+        try:
+            lazy = self.manager._backend_for(entry.tier).scan(entry.table_name)
+            value = lazy.select(pl.col("date").max()).collect().item()
+        except (KeyError, pl.exceptions.PolarsError):
+            return None
+        if isinstance(value, datetime):
+            return value.replace(tzinfo=None)
+        if isinstance(value, date):
+            return datetime.combine(value, time.min)
+        return _parse_time(value)
+
+    def plan(self, now: datetime | None = None) -> list[RetentionAction]:
+        """列出目前已過期、將被處理的表格。"""
+        now = now or datetime.utcnow()
+        actions: list[RetentionAction] = []
+        for entry in self.manager.catalog.latest_entries():
+            if entry.tier not in ("hot", "warm", "cold"):
+                continue
+            rule = self._rule_for(entry)
+            if rule is None:
+                continue
+            end = self._data_end(entry)
+            if end is None or end >= now - rule.age:
+                continue
+            target = None
+            if rule.action == "demote":
+                target = self._next_tier(entry.tier)
+                if target is None:
+                    continue
+            actions.append(
+                RetentionAction(
+                    table=entry.table_name,
+                    tier=entry.tier,
+                    action=rule.action,
+                    data_end=end,
+                    rule=f"{rule.pattern}:{rule.max_age}",
+                    target_tier=target,
+                )
+            )
+        return actions
+
+    def enforce(
+        self, now: datetime | None = None, *, dry_run: bool = False
+    ) -> list[RetentionAction]:
+        """執行保留規則並回傳已處理的表格。"""
+        actions = self.plan(now)
+        if dry_run:
+            return actions
+        manager = self.manager
+        done: list[RetentionAction] = []
+        for action in actions:
+            if action.action == "demote":
+                try:
+                    manager.migrate(
+                        action.table, action.tier, str(action.target_tier)
+                    )
+                except KeyError:
+                    continue
+                done.append(action)
+                continue
+
+            # 刪除基礎表格時其 rollup 會一併刪除，同樣需留下紀錄
+            tables = [action.table, *manager._rollup_tables(action.table)]
+            entries = [manager.catalog.get(table) for table in tables]
+            manager.delete(action.table)
+            manager.catalog.upsert_many(
+                [
+                    CatalogEntry(
+                        table_name=table,
+                        version=0,
+                        tier=EXPIRED_TIER,
+                        location="",
+                        schema_hash=entry.schema_hash if entry else "",
+                        row_count=entry.row_count if entry else 0,
+                        partition_keys=entry.partition_keys if entry else "",
+                        lineage=f"retention {action.rule}",
+                    )
+                    for table, entry in zip(tables, entries)
+                    if table == action.table
+                    or (entry is not None and entry.tier != EXPIRED_TIER)
+                ]
+            )
+            done.append(action)
+        return done
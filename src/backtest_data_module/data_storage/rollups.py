@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable
+
+import polars as pl
+
+# OHLCV 欄位與可遞迴合併的聚合方式
+_OHLCV_AGGS: dict[str, Callable[[str], pl.Expr]] = {
+    "open": lambda c: pl.col(c).first(),
+    "high": lambda c: pl.col(c).max(),
+    "low": lambda c: pl.col(c).min(),
+    "close": lambda c: pl.col(c).last(),
+    "volume": lambda c: pl.col(c).sum(),
+}
+
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def interval_seconds(interval: str) -> int:
+    """將 ``5m``、``1h`` 等間隔字串轉為秒數。"""
+    match = re.fullmatch(r"(\d+)([smhd])", interval)
+    if not match:
+        raise ValueError(f"不支援的時間間隔: {interval}")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+def rollup_table_name(table: str, interval: str) -> str:
+    return f"{table}__{interval}"
+
+
+@dataclass
+class RollupSpec:
+    """描述基礎 K 線表格與需物化的較粗時間間隔。
+
+    ``levels`` 需由細到粗排列，每一層都由前一層聚合而來（1m→5m→1h→1d）。
+    """
+
+    table: str
+    interval: str = "1m"
+    levels: list[str] = field(default_factory=lambda: ["5m", "1h", "1d"])
+    time_column: str = "date"
+    group_by: list[str] = field(default_factory=lambda: ["asset"])
+
+    def __post_init__(self) -> None:
+        chain = [self.interval, *self.levels]
+        seconds = [interval_seconds(i) for i in chain]
+        for finer, coarser in zip(seconds, seconds[1:]):
+            if coarser <= finer or coarser % finer:
+                raise ValueError(f"rollup 間隔需逐層整除: {chain}")
+
+    def tables(self) -> dict[str, str]:
+        """各層間隔對應的 rollup 表格名稱。"""
+        return {level: rollup_table_name(self.table, level) for level in self.levels}
+
+    def closest(self, interval: str) -> str:
+        """回傳能整除 ``interval`` 的最粗已物化間隔。"""
+        target = interval_seconds(interval)
+        best = None
+        for level in [self.interval, *self.levels]:
+            if target % interval_seconds(level) == 0:
+                best = level
+        if best is None:
+            raise ValueError(
+                f"{interval} 無法由 {self.table} 的 {self.interval} 資料聚合而得"
+            )
+        return best
+
+
+def aggregate_ohlcv(df: pl.DataFrame, spec: RollupSpec, interval: str) -> pl.DataFrame:
+    """以 ``interval`` 聚合 OHLCV 欄位，其他欄位會被捨棄。"""
+    aggs = [agg(c) for c, agg in _OHLCV_AGGS.items() if c in df.columns]
+    keys = [c for c in spec.group_by if c in df.columns]
+    return (
+        df.sort([*keys, spec.time_column])
+        .group_by_dynamic(
+            spec.time_column, every=interval, group_by=keys or None
+        )
+        .agg(aggs)
+    )
+
+
+def refresh_rollup(
+    existing: pl.DataFrame | None,
+    source: pl.DataFrame,
+    spec: RollupSpec,
+    interval: str,
+) -> pl.DataFrame:
+    """增量更新 rollup：保留各群組水位線前已完成的區間，只重算水位線之後的資料。
+
+    水位線為每個群組最後一個區間的起點，該區間可能尚未完整，因此一併重算；
+    rollup 中尚無紀錄的群組（例如新加入的資產）以完整資料重算，
+    來源中已不存在的群組則一併移除。
+    """
+    time_col = spec.time_column
+    if existing is None or existing.is_empty():
+        return aggregate_ohlcv(source, spec, interval)
+    keys = [c for c in spec.group_by if c in existing.columns]
+    if not keys:
+        watermark = existing[time_col].max()
+        kept = existing.filter(pl.col(time_col) < watermark)
+        fresh = source.filter(pl.col(time_col) >= watermark)
+    else:
+        marks = existing.group_by(keys).agg(
+            pl.col(time_col).max().alias("_watermark")
+        )
+        kept = (
+            existing.join(marks, on=keys)
+            .filter(pl.col(time_col) < pl.col("_watermark"))
+            .drop("_watermark")
+            .join(source.select(keys).unique(), on=keys, how="semi")
+        )
+        fresh = (
+            source.join(marks, on=keys, how="left")
+            .filter(
+                pl.col("_watermark").is_null()
+                | (pl.col(time_col) >= pl.col("_watermark"))
+            )
+            .drop("_watermark")
+        )
+    delta = aggregate_ohlcv(fresh, spec, interval)
+    return pl.concat([kept, delta.select(kept.columns)]).sort([*keys, time_col])
@@ -1,32 +1,224 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import asyncio
 import hashlib
 import os
+import weakref
 from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
 import json
-from typing import Any, cast, DefaultDict
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar, cast, DefaultDict
 from datetime import datetime, timedelta
 
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from polars.io.plugins import register_io_source
 import yaml
 import duckdb
 import psycopg
 import boto3
 import io
+import itertools
+import threading
 
 from backtest_data_module.data_storage.catalog import Catalog, CatalogEntry
+from backtest_data_module.data_storage.concurrency import TableLocks
+from backtest_data_module.data_storage.layout import (
+    CompressionSpec,
+    TableLayout,
+    match_layout,
+)
+from backtest_data_module.data_storage.migrations import init_duck
+from backtest_data_module.data_storage.predicates import (
+    decode_filters,
+    filters_to_expr,
+    filters_to_sql,
+    quote_ident,
+    split_predicate,
+)
+from backtest_data_module.data_storage.retention import RetentionRule
+from backtest_data_module.data_storage.rollups import (
+    RollupSpec,
+    aggregate_ohlcv,
+    refresh_rollup,
+)
 from backtest_data_module.metrics import (
     STORAGE_WRITE_COUNTER,
     STORAGE_READ_COUNTER,
     MIGRATION_LATENCY_MS,
+    observe_storage_op,
     update_tier_hit_rate,
 )
-from time import perf_counter
+from time import monotonic, perf_counter
+
+T = TypeVar("T")
+
+# 已合併片段在 Catalog 中的層級，``location`` 記錄合併目標
+COMPACTED_TIER = "compacted"
+
+
+def compacted_part_name(target: str, index: int) -> str:
+    return f"{target}__part{index:05d}"
+
+
+def is_compacted_part(table: str, target: str) -> bool:
+    return table.startswith(f"{target}__part")
+
+
+def _select_sql(
+    table: str,
+    columns: list[str] | None,
+    filters: list[tuple[str, str, Any]],
+    *,
+    placeholder: str = "?",
+    order_by: list[str] | None = None,
+    limit: int | None = None,
+) -> tuple[str, list[Any]]:
+    """組出投影、篩選、排序與筆數限制皆由資料庫執行的 ``SELECT``。
+
+    ``order_by`` 為 SQL 排序運算式，呼叫端負責加上欄位引號。
+    """
+    selected = ", ".join(quote_ident(c) for c in columns) if columns else "*"
+    where, params = filters_to_sql(filters, placeholder)
+    sql = f"SELECT {selected} FROM {table}{where}"
+    if order_by:
+        sql += " ORDER BY " + ", ".join(order_by)
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return sql, params
+
+
+def _filter_batches(
+    batches: Iterator[pa.RecordBatch],
+    rest: pl.Expr | None,
+    n_rows: int | None,
+    columns: list[str] | None = None,
+) -> Iterator[pl.DataFrame]:
+    """對逐批讀回的資料套用無法下推的條件、欄位投影與筆數限制。"""
+    remaining = n_rows
+    for batch in batches:
+        df = pl.from_arrow(batch)
+        assert isinstance(df, pl.DataFrame)
+        if rest is not None:
+            df = df.filter(rest)
+        if columns:
+            df = df.select(columns)
+        if remaining is not None:
+            df = df.head(remaining)
+            remaining -= df.height
+        yield df
+        if remaining is not None and remaining <= 0:
+            return
+
+
+def _query_columns(columns: list[str] | None, rest: pl.Expr | None) -> list[str] | None:
+    """查詢需取回的欄位：投影欄位加上 Polars 端條件用到的欄位。"""
+    if not columns or rest is None:
+        return columns
+    return list(dict.fromkeys([*columns, *rest.meta.root_names()]))
+
+
+def _to_record_batches(frames: Iterator[pl.DataFrame]) -> Iterator[pa.RecordBatch]:
+    for df in frames:
+        if df.height:
+            yield from df.to_arrow().to_batches()
+
+
+def _duckdb_batches(
+    connect: Callable[[], duckdb.DuckDBPyConnection],
+    table: str,
+    *,
+    columns: list[str] | None,
+    predicate: pl.Expr | None,
+    sort_by: list[str] | None,
+    batch_size: int,
+) -> Iterator[pa.RecordBatch]:
+    """以 DuckDB 的 ``ORDER BY`` 查詢逐批讀取，同值依寫入順序（rowid）排列。"""
+    filters, rest = split_predicate(predicate)
+    order_by = [quote_ident(c) for c in sort_by] + ["rowid"] if sort_by else None
+    sql, params = _select_sql(
+        table, _query_columns(columns, rest), filters, order_by=order_by
+    )
+    cursor = connect().cursor()
+    try:
+        try:
+            reader = cursor.execute(sql, params).fetch_record_batch(batch_size)
+        except duckdb.CatalogException as e:
+            raise KeyError(table) from e
+        yield from _to_record_batches(_filter_batches(reader, rest, None, columns))
+    finally:
+        cursor.close()
+
+
+def _text_filters(
+    filters: list[tuple[str, str, Any]], rest: pl.Expr | None
+) -> tuple[list[tuple[str, str, Any]], pl.Expr | None]:
+    """只保留值為字串的等值條件，其餘併回由 Polars 套用的條件。"""
+    text: list[tuple[str, str, Any]] = []
+    other: list[tuple[str, str, Any]] = []
+    for column, op, value in filters:
+        values = value if op == "in" else [value]
+        if op in ("==", "!=", "in") and all(isinstance(v, str) for v in values):
+            text.append((column, op, value))
+        else:
+            other.append((column, op, value))
+    extra = filters_to_expr(other)
+    if extra is not None:
+        rest = extra if rest is None else extra & rest
+    return text, rest
+
+
+def _duckdb_scan(
+    connect: Callable[[], duckdb.DuckDBPyConnection], table: str
+) -> pl.LazyFrame:
+    """以 DuckDB 逐批讀取表格，欄位投影、篩選與筆數限制下推至 DuckDB。
+
+    欄位與常數的比較及 ``is_in`` 轉為 SQL ``WHERE``，其餘條件於讀回後以
+    Polars 套用。``connect`` 於 collect 時呼叫，讓每個執行緒使用自己的連線。
+    """
+    try:
+        relation = connect().table(table)
+    except duckdb.CatalogException as e:
+        raise KeyError(table) from e
+    empty = pl.from_arrow(relation.limit(0).fetch_arrow_table())
+    assert isinstance(empty, pl.DataFrame)
+    schema = empty.schema
+
+    def source(
+        with_columns: list[str] | None,
+        predicate: pl.Expr | None,
+        n_rows: int | None,
+        batch_size: int | None,
+    ) -> Iterator[pl.DataFrame]:
+        filters, rest = split_predicate(predicate)
+        sql, params = _select_sql(
+            table, with_columns, filters, limit=n_rows if rest is None else None
+        )
+        # 獨立 cursor，避免同一連線上的其他查詢中斷讀取
+        cursor = connect().cursor()
+        try:
+            reader = cursor.execute(sql, params).fetch_record_batch(
+                batch_size or 65_536
+            )
+            yield from _filter_batches(reader, rest, n_rows)
+        finally:
+            cursor.close()
+
+    return register_io_source(source, schema=schema)
 
 
 class StorageBackend(ABC):
-    """抽象化的儲存後端介面。"""
+    """抽象化的儲存後端介面。
+
+    ``aread``、``awrite`` 與 ``adelete`` 預設於執行緒中呼叫同步方法；
+    具備非同步驅動程式的後端可覆寫並將 ``native_async`` 設為 ``True``。
+    """
+
+    native_async: bool = False
 
     @abstractmethod
     def write(
@@ -45,39 +237,173 @@ class StorageBackend(ABC):
         """刪除指定表格的資料。"""
         raise NotImplementedError
 
+    def scan(self, table: str) -> pl.LazyFrame:
+        """回傳延遲查詢；預設讀入後包成 LazyFrame，後端可覆寫以下推篩選與投影。"""
+        return self.read(table).lazy()
+
+    def read_batches(
+        self,
+        table: str,
+        *,
+        columns: list[str] | None = None,
+        predicate: pl.Expr | None = None,
+        sort_by: list[str] | None = None,
+        batch_size: int = 65_536,
+    ) -> Iterator[pa.RecordBatch]:
+        """逐批回傳查詢結果，``sort_by`` 指定時依該欄位排序，同值保留原順序。
+
+        預設經由 ``scan`` 收集整個結果後切批，後端可覆寫為真正的逐批讀取。
+        """
+        lazy = self.scan(table)
+        if predicate is not None:
+            lazy = lazy.filter(predicate)
+        if columns:
+            lazy = lazy.select(columns)
+        if sort_by:
+            lazy = lazy.sort(sort_by, maintain_order=True)
+        yield from lazy.collect().to_arrow().to_batches(max_chunksize=batch_size)
+
+    async def aread(self, table: str) -> pl.DataFrame:
+        return await asyncio.to_thread(self.read, table)
+
+    async def awrite(
+        self, df: pl.DataFrame, table: str, *, metadata: dict[str, object] | None = None
+    ) -> None:
+        await asyncio.to_thread(self.write, df, table, metadata=metadata)
+
+    async def adelete(self, table: str) -> None:
+        await asyncio.to_thread(self.delete, table)
+
 
 class DuckHot(StorageBackend):
-    """Hot tier 以 DuckDB 儲存，可使用檔案或記憶體資料庫。"""
+    """Hot tier 以 DuckDB 儲存，可使用檔案或記憶體資料庫。
 
-    def __init__(self, path: str = ":memory:") -> None:
-        self.con = duckdb.connect(path)
-        self._tables: set[str] = set()
+    以檔案模式啟動時會從資料庫重建 ``_tables``，重啟後即可直接讀取；
+    ``memory_limit``、``threads`` 與 ``temp_directory`` 用於限制資源並指定溢寫目錄，
+    ``checkpoint_interval``（秒）則控制寫入後自動 checkpoint 的頻率。
+    建立連線的執行緒直接使用 ``con``，其他執行緒各自取得 cursor 以便並行讀取。
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        *,
+        memory_limit: str | None = None,
+        threads: int | None = None,
+        temp_directory: str | None = None,
+        checkpoint_interval: float | None = None,
+    ) -> None:
+        self.path = path
+        self.con = init_duck(
+            path,
+            memory_limit=memory_limit,
+            threads=threads,
+            temp_directory=temp_directory,
+        )
+        self.checkpoint_interval = checkpoint_interval
+        self._last_checkpoint = monotonic()
+        self._owner = threading.get_ident()
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._tables: set[str] = self._load_tables()
+
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        """取得目前執行緒專屬的連線。"""
+        if threading.get_ident() == self._owner:
+            return self.con
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self.con.cursor()
+        return cursor
+
+    def _load_tables(self) -> set[str]:
+        """列出資料庫中既有的表格，供重啟後恢復狀態。"""
+        rows = self.con.execute(
+            "SELECT table_name FROM duckdb_tables() WHERE schema_name = 'main'"
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def checkpoint(self) -> None:
+        """將 WAL 寫回資料庫檔案。"""
+        self._cursor().execute("CHECKPOINT")
+        self._last_checkpoint = monotonic()
+
+    def _maybe_checkpoint(self) -> None:
+        if self.checkpoint_interval is None:
+            return
+        if monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def close(self) -> None:
+        """checkpoint 後關閉連線。"""
+        self.checkpoint()
+        self.con.close()
 
     def write(
         self, df: pl.DataFrame, table: str, *, metadata: dict[str, object] | None = None
     ) -> None:
-        self.con.register("tmp", df.to_arrow())
-        self.con.execute(
-            f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM tmp"
-        )
-        self.con.unregister("tmp")
-        self._tables.add(table)
+        con = self._cursor()
+        # DuckDB 的 DDL 在並行交易間可能衝突，因此寫入依序執行
+        with self._write_lock:
+            con.register("tmp", df.to_arrow())
+            con.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM tmp")
+            con.unregister("tmp")
+            self._tables.add(table)
+            self._maybe_checkpoint()
 
     def read(self, table: str) -> pl.DataFrame:
         try:
-            return self.con.execute(f"SELECT * FROM {table}").pl()
+            return self._cursor().execute(f"SELECT * FROM {table}").pl()
         except duckdb.CatalogException as e:
             raise KeyError(table) from e
 
+    def scan(self, table: str) -> pl.LazyFrame:
+        """逐批讀取的 LazyFrame，欄位投影與簡單篩選條件由 DuckDB 執行。"""
+        return _duckdb_scan(self._cursor, table)
+
+    def read_batches(
+        self,
+        table: str,
+        *,
+        columns: list[str] | None = None,
+        predicate: pl.Expr | None = None,
+        sort_by: list[str] | None = None,
+        batch_size: int = 65_536,
+    ) -> Iterator[pa.RecordBatch]:
+        """排序與可下推的條件由 DuckDB 執行，結果以 Arrow reader 逐批取回。"""
+        return _duckdb_batches(
+            self._cursor,
+            table,
+            columns=columns,
+            predicate=predicate,
+            sort_by=sort_by,
+            batch_size=batch_size,
+        )
+
     def delete(self, table: str) -> None:
-        self.con.execute(f"DROP TABLE IF EXISTS {table}")
-        self._tables.discard(table)
+        with self._write_lock:
+            self._cursor().execute(f"DROP TABLE IF EXISTS {table}")
+            self._tables.discard(table)
+            self._maybe_checkpoint()
 
 
 class TimescaleWarm(StorageBackend):
-    """Warm tier 透過 PostgreSQL/TimescaleDB 儲存。若未提供 DSN 則使用 DuckDB 模擬。"""
+    """Warm tier 透過 PostgreSQL/TimescaleDB 儲存。若未提供 DSN 則使用 DuckDB 模擬。
+
+    建立者執行緒沿用 ``conn``，其他執行緒各自開啟 PostgreSQL 連線或 DuckDB cursor。
+    使用 PostgreSQL 時，非同步方法改以 ``psycopg.AsyncConnection`` 執行，
+    每個 event loop 共用一條連線。``compression`` 設定欄位的 TOAST 壓縮方式
+    （``pglz`` 或 ``lz4``，需 PostgreSQL 14 以上）。
+    """
 
-    def __init__(self, dsn: str | None = None) -> None:
+    _owner: int | None = None
+    use_pg: bool = False
+
+    def __init__(
+        self, dsn: str | None = None, *, compression: str | None = None
+    ) -> None:
+        self.dsn = dsn
+        self.compression = compression
         if dsn:
             self.conn = psycopg.connect(dsn)
             with self.conn.cursor() as cur:
@@ -86,62 +412,330 @@ class TimescaleWarm(StorageBackend):
         else:
             self.conn = duckdb.connect()  # fallback for測試
             self.use_pg = False
+        self._owner = threading.get_ident()
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
         self._tables: set[str] = set()
+        self._aconns: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, psycopg.AsyncConnection
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def native_async(self) -> bool:  # type: ignore[override]
+        return self.use_pg
+
+    async def _aconnection(self) -> psycopg.AsyncConnection:
+        """取得目前 event loop 專屬的非同步連線。"""
+        loop = asyncio.get_running_loop()
+        conn = self._aconns.get(loop)
+        if conn is None or conn.closed:
+            conn = await psycopg.AsyncConnection.connect(cast(str, self.dsn))
+            self._aconns[loop] = conn
+        return conn
+
+    def _column_defs(self, df: pl.DataFrame) -> str:
+        suffix = f" COMPRESSION {self.compression}" if self.compression else ""
+        return ", ".join(f'"{c}" TEXT{suffix}' for c in df.columns)
+
+    def _connection(self) -> Any:
+        """取得目前執行緒專屬的連線。"""
+        if self._owner is None or threading.get_ident() == self._owner:
+            return self.conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = (
+                psycopg.connect(cast(str, self.dsn))
+                if self.use_pg
+                else self.conn.cursor()
+            )
+        return conn
 
     def write(
         self, df: pl.DataFrame, table: str, *, metadata: dict[str, object] | None = None
     ) -> None:
+        conn = self._connection()
         if self.use_pg:
             csv_data = df.write_csv()
             cols = ", ".join(f'"{c}"' for c in df.columns)
-            col_defs = ", ".join(f'"{c}" TEXT' for c in df.columns)
-            with self.conn.cursor() as cur:
+            col_defs = self._column_defs(df)
+            with conn.cursor() as cur:
                 cur.execute(f'DROP TABLE IF EXISTS "{table}"')
                 cur.execute(f'CREATE TABLE "{table}" ({col_defs})')
-                with cur.copy(f'COPY "{table}" ({cols}) FROM STDIN WITH CSV HEADER') as cp:
+                with cur.copy(
+                    f'COPY "{table}" ({cols}) FROM STDIN WITH CSV HEADER'
+                ) as cp:
                     cp.write(csv_data)
-            self.conn.commit()
+            conn.commit()
         else:
-            self.conn.register("tmp", df.to_arrow())
-            self.conn.execute(
-                f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM tmp"
-            )
-            self.conn.unregister("tmp")
+            with self._write_lock:
+                conn.register("tmp", df.to_arrow())
+                conn.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM tmp")
+                conn.unregister("tmp")
         self._tables.add(table)
 
     def read(self, table: str) -> pl.DataFrame:
+        conn = self._connection()
         if self.use_pg:
             try:
-                return pl.read_sql(f"SELECT * FROM {table}", self.conn)
+                return pl.read_sql(f"SELECT * FROM {table}", conn)
             except Exception as e:  # psycopg throws errors for missing table
                 raise KeyError(table) from e
         try:
-            return self.conn.execute(f"SELECT * FROM {table}").pl()
+            return conn.execute(f"SELECT * FROM {table}").pl()
         except duckdb.CatalogException as e:
             raise KeyError(table) from e
 
+    def _pg_batches(
+        self, sql: str, params: list[Any], batch_size: int
+    ) -> Iterator[pa.RecordBatch]:
+        """以伺服器端 cursor 逐批讀取，每批轉為全為字串欄位的 RecordBatch。"""
+        conn = psycopg.connect(cast(str, self.dsn))
+        try:
+            with conn.transaction():
+                with conn.cursor(name="warm_batches") as cur:
+                    cur.itersize = batch_size
+                    cur.execute(sql, params)
+                    while rows := cur.fetchmany(batch_size):
+                        columns = [d.name for d in cur.description or []]
+                        yield pl.DataFrame(
+                            rows,
+                            schema={c: pl.String for c in columns},
+                            orient="row",
+                        ).to_arrow().to_batches()[0]
+        finally:
+            conn.close()
+
+    def scan(self, table: str) -> pl.LazyFrame:
+        """投影、筆數限制與字串欄位的等值條件轉為 SQL，其餘條件於讀回後套用。
+
+        PostgreSQL 表格以 TEXT 欄位儲存，大小比較依文字排序，與原始型別不同，
+        因此只下推值為字串的 ``==``、``!=`` 與 ``is_in`` 條件。
+        """
+        if not self.use_pg:
+            return _duckdb_scan(self._connection, table)
+
+        conn = self._connection()
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT column_name FROM information_schema.columns"
+                " WHERE table_name = %s ORDER BY ordinal_position",
+                (table,),
+            )
+            columns = [row[0] for row in cur.fetchall()]
+        if not columns:
+            raise KeyError(table)
+        # write() 以 TEXT 欄位建立表格
+        schema = pl.Schema({c: pl.String for c in columns})
+
+        def source(
+            with_columns: list[str] | None,
+            predicate: pl.Expr | None,
+            n_rows: int | None,
+            batch_size: int | None,
+        ) -> Iterator[pl.DataFrame]:
+            filters, rest = _text_filters(*split_predicate(predicate))
+            sql, params = _select_sql(
+                quote_ident(table),
+                with_columns or columns,
+                filters,
+                placeholder="%s",
+                limit=n_rows if rest is None else None,
+            )
+            batches = self._pg_batches(sql, params, batch_size or 65_536)
+            yield from _filter_batches(batches, rest, n_rows)
+
+        return register_io_source(source, schema=schema)
+
+    def read_batches(
+        self,
+        table: str,
+        *,
+        columns: list[str] | None = None,
+        predicate: pl.Expr | None = None,
+        sort_by: list[str] | None = None,
+        batch_size: int = 65_536,
+    ) -> Iterator[pa.RecordBatch]:
+        """以 ``ORDER BY`` 查詢的伺服器端 cursor 逐批讀取。
+
+        PostgreSQL 欄位皆為 TEXT，以 ``C`` 定序依字串排序，與讀回的字串欄位在
+        Polars 中的排序相同；同值依實體位置（ctid）排列。
+        """
+        if not self.use_pg:
+            return _duckdb_batches(
+                self._connection,
+                table,
+                columns=columns,
+                predicate=predicate,
+                sort_by=sort_by,
+                batch_size=batch_size,
+            )
+        return self._pg_read_batches(table, columns, predicate, sort_by, batch_size)
+
+    def _pg_read_batches(
+        self,
+        table: str,
+        columns: list[str] | None,
+        predicate: pl.Expr | None,
+        sort_by: list[str] | None,
+        batch_size: int,
+    ) -> Iterator[pa.RecordBatch]:
+        filters, rest = _text_filters(*split_predicate(predicate))
+        order_by = (
+            [f'{quote_ident(c)} COLLATE "C"' for c in sort_by] + ["ctid"]
+            if sort_by
+            else None
+        )
+        sql, params = _select_sql(
+            quote_ident(table),
+            _query_columns(columns, rest),
+            filters,
+            placeholder="%s",
+            order_by=order_by,
+        )
+        try:
+            batches = self._pg_batches(sql, params, batch_size)
+            first = next(batches, None)
+        except psycopg.errors.UndefinedTable as e:
+            raise KeyError(table) from e
+        if first is None:
+            return
+        frames = _filter_batches(
+            itertools.chain([first], batches), rest, None, columns
+        )
+        yield from _to_record_batches(frames)
+
     def delete(self, table: str) -> None:
+        conn = self._connection()
         if self.use_pg:
-            with self.conn.cursor() as cur:
+            with conn.cursor() as cur:
                 cur.execute(f'DROP TABLE IF EXISTS "{table}"')
-            self.conn.commit()
+            conn.commit()
         else:
-            self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            with self._write_lock:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
         self._tables.discard(table)
 
+    async def awrite(
+        self, df: pl.DataFrame, table: str, *, metadata: dict[str, object] | None = None
+    ) -> None:
+        if not self.use_pg:
+            return await super().awrite(df, table, metadata=metadata)
+        conn = await self._aconnection()
+        csv_data = df.write_csv()
+        cols = ", ".join(f'"{c}"' for c in df.columns)
+        col_defs = self._column_defs(df)
+        async with conn.transaction():
+            async with conn.cursor() as cur:
+                await cur.execute(f'DROP TABLE IF EXISTS "{table}"')
+                await cur.execute(f'CREATE TABLE "{table}" ({col_defs})')
+                async with cur.copy(
+                    f'COPY "{table}" ({cols}) FROM STDIN WITH CSV HEADER'
+                ) as cp:
+                    await cp.write(csv_data)
+        self._tables.add(table)
+
+    async def aread(self, table: str) -> pl.DataFrame:
+        if not self.use_pg:
+            return await super().aread(table)
+        conn = await self._aconnection()
+        try:
+            async with conn.transaction():
+                async with conn.cursor() as cur:
+                    await cur.execute(f'SELECT * FROM "{table}"')
+                    rows = await cur.fetchall()
+                    columns = [d.name for d in cur.description or []]
+        except psycopg.errors.UndefinedTable as e:
+            raise KeyError(table) from e
+        return pl.DataFrame(
+            rows, schema={c: pl.String for c in columns}, orient="row"
+        )
+
+    async def adelete(self, table: str) -> None:
+        if not self.use_pg:
+            return await super().adelete(table)
+        conn = await self._aconnection()
+        async with conn.transaction():
+            await conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self._tables.discard(table)
+
+
+def _row_group_min(parquet: pq.ParquetFile, index: int, column: str) -> Any:
+    """回傳 row group 中該欄位的最小值統計，缺少統計或含 null 時回傳 ``None``。"""
+    group = parquet.metadata.row_group(index)
+    for i in range(group.num_columns):
+        chunk = group.column(i)
+        if chunk.path_in_schema != column:
+            continue
+        stats = chunk.statistics
+        if stats is None or not stats.has_min_max or stats.null_count:
+            return None
+        return stats.min
+    return None
+
+
+class _S3File(io.RawIOBase):
+    """以 HTTP Range 請求隨機讀取 S3 物件，供 ``pq.ParquetFile`` 只下載所需區段。"""
+
+    def __init__(self, s3: Any, bucket: str | None, key: str) -> None:
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.size = int(s3.head_object(Bucket=bucket, Key=key)["ContentLength"])
+        self.pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.pos, io.SEEK_END: self.size}
+        self.pos = base[whence] + offset
+        return self.pos
+
+    def readinto(self, buffer: Any) -> int:
+        end = min(self.pos + len(buffer), self.size)
+        if end <= self.pos:
+            return 0
+        obj = self.s3.get_object(
+            Bucket=self.bucket, Key=self.key, Range=f"bytes={self.pos}-{end - 1}"
+        )
+        data = obj["Body"].read()
+        buffer[: len(data)] = data
+        self.pos += len(data)
+        return len(data)
+
 
 class S3Cold(StorageBackend):
-    """Cold tier 以 S3 儲存 Parquet 檔案，預設可在記憶體中模擬。"""
+    """Cold tier 以 S3 儲存 Parquet 檔案，預設可在記憶體中模擬。
+
+    ``storage_options`` 會傳給 ``pl.scan_parquet``，供 ``scan`` 直接以範圍讀取 S3 物件。
+    ``compression``、``compression_level`` 與 ``row_group_size`` 控制 Parquet 寫入，
+    ``metadata["row_group_size"]`` 可針對單一表格覆寫 row group 大小。
+    """
 
     def __init__(
         self,
         bucket: str | None = None,
         prefix: str = "",
         s3_client: Any | None = None,
+        storage_options: dict[str, str] | None = None,
+        *,
+        compression: str = "zstd",
+        compression_level: int | None = None,
+        row_group_size: int | None = None,
     ) -> None:
         bucket = bucket or None
         self.bucket = bucket
         self.prefix = prefix
+        self.storage_options = storage_options
+        self.compression = compression
+        self.compression_level = compression_level
+        self.row_group_size = row_group_size
         self.s3 = s3_client or (boto3.client("s3") if bucket else None)
         self._tables: dict[str, pl.DataFrame] | None = {} if bucket is None else None
 
@@ -152,8 +746,15 @@ class S3Cold(StorageBackend):
         self, df: pl.DataFrame, table: str, *, metadata: dict[str, object] | None = None
     ) -> None:
         if self.s3:
+            row_group_size = (metadata or {}).get("row_group_size", self.row_group_size)
             buf = io.BytesIO()
-            df.write_parquet(buf)
+            df.write_parquet(
+                buf,
+                compression=cast(Any, self.compression),
+                compression_level=self.compression_level,
+                row_group_size=cast(int | None, row_group_size),
+                statistics=True,
+            )
             buf.seek(0)
             self.s3.put_object(
                 Bucket=self.bucket,
@@ -176,6 +777,86 @@ class S3Cold(StorageBackend):
             raise KeyError(table)
         return self._tables[table]
 
+    def scan(self, table: str) -> pl.LazyFrame:
+        """以 ``scan_parquet`` 讀取，僅下載所需欄位並依統計資訊略過 row group。"""
+        if self.s3:
+            try:
+                self.s3.head_object(Bucket=self.bucket, Key=self._key(table))
+            except Exception as e:
+                raise KeyError(table) from e
+            return pl.scan_parquet(
+                f"s3://{self.bucket}/{self._key(table)}",
+                storage_options=self.storage_options,
+            )
+        return self.read(table).lazy()
+
+    def read_batches(
+        self,
+        table: str,
+        *,
+        columns: list[str] | None = None,
+        predicate: pl.Expr | None = None,
+        sort_by: list[str] | None = None,
+        batch_size: int = 65_536,
+    ) -> Iterator[pa.RecordBatch]:
+        """以 Range 請求逐個 row group 讀取 Parquet 檔。
+
+        指定 ``sort_by`` 時依首個排序欄位的 row group 最小值依序讀取，僅保留
+        尚未輸出的資料於記憶體中：鍵值小於下一個 row group 最小值的資料即可
+        排序後輸出。row group 缺少統計資訊時，需讀完所有 row group 才能輸出。
+        """
+        if not self.s3:
+            yield from super().read_batches(
+                table,
+                columns=columns,
+                predicate=predicate,
+                sort_by=sort_by,
+                batch_size=batch_size,
+            )
+            return
+        try:
+            parquet = pq.ParquetFile(_S3File(self.s3, self.bucket, self._key(table)))
+        except Exception as e:
+            raise KeyError(table) from e
+        needed = None
+        if columns:
+            extra = predicate.meta.root_names() if predicate is not None else []
+            needed = list(dict.fromkeys([*columns, *(sort_by or []), *extra]))
+        groups = list(range(parquet.num_row_groups))
+        bounds: list[Any] = [None] * len(groups)
+        if sort_by:
+            bounds = [_row_group_min(parquet, i, sort_by[0]) for i in groups]
+            if any(b is None for b in bounds):
+                bounds = [None] * len(groups)
+            else:
+                groups.sort(key=lambda i: bounds[i])
+        pending: pl.DataFrame | None = None
+        for n, index in enumerate(groups):
+            df = pl.from_arrow(parquet.read_row_group(index, columns=needed))
+            assert isinstance(df, pl.DataFrame)
+            if predicate is not None:
+                df = df.filter(predicate)
+            if not sort_by:
+                if columns:
+                    df = df.select(columns)
+                yield from df.to_arrow().to_batches(max_chunksize=batch_size)
+                continue
+            df = df.with_columns(pl.lit(index, pl.Int64).alias("_row_group"))
+            pending = df if pending is None else pl.concat([pending, df])
+            following = groups[n + 1] if n + 1 < len(groups) else None
+            if following is not None and bounds[following] is None:
+                continue
+            pending = pending.sort([*sort_by, "_row_group"], maintain_order=True)
+            if following is None:
+                ready, pending = pending, None
+            else:
+                key = pl.col(sort_by[0]) < bounds[following]
+                ready, pending = pending.filter(key), pending.filter(~key)
+            ready = ready.drop("_row_group")
+            if columns:
+                ready = ready.select(columns)
+            yield from ready.to_arrow().to_batches(max_chunksize=batch_size)
+
     def delete(self, table: str) -> None:
         if self.s3:
             self.s3.delete_object(Bucket=self.bucket, Key=self._key(table))
@@ -185,7 +866,15 @@ class S3Cold(StorageBackend):
 
 
 class HybridStorageManager(StorageBackend):
-    """管理多層級儲存的介面。"""
+    """管理多層級儲存的介面。
+
+    可由多個執行緒共用：同一表格的讀取可並行，寫入、刪除與遷移則取得該表格的
+    寫入鎖；LRU 與存取紀錄另以 ``_state_lock`` 保護。
+
+    ``aread``、``awrite`` 與 ``amigrate`` 供 asyncio 程式使用：具原生非同步驅動的
+    後端直接於 event loop 上執行 I/O，其餘後端與 Catalog 操作交由大小為
+    ``async_max_workers`` 的執行緒池處理，避免阻塞 event loop。
+    """
 
     def __init__(
         self,
@@ -205,14 +894,47 @@ class HybridStorageManager(StorageBackend):
                 config = yaml.safe_load(f) or {}
 
         duck_path = cast(str, config.get("duckdb_path", ":memory:"))
+        duck_memory_limit = cast(str | None, config.get("duckdb_memory_limit"))
+        duck_threads = cast(int | None, config.get("duckdb_threads"))
+        duck_temp_dir = cast(str | None, config.get("duckdb_temp_directory"))
+        duck_checkpoint = cast(
+            float | None, config.get("duckdb_checkpoint_interval")
+        )
+        catalog_path = cast(str, config.get("catalog_path", ":memory:"))
         pg_dsn = cast(str, config.get("postgres_dsn", ""))
         bucket = cast(str | None, config.get("s3_bucket"))
         prefix = cast(str, config.get("s3_prefix", ""))
+        s3_options = cast(dict[str, str] | None, config.get("s3_storage_options"))
+        s3_row_group_size = cast(int | None, config.get("s3_row_group_size"))
+        compression_cfg = cast(
+            dict[str, dict[str, Any]], config.get("compression") or {}
+        )
+        compression = {
+            tier: CompressionSpec(**opts) for tier, opts in compression_cfg.items()
+        }
+        cold_compression = compression.get("cold", CompressionSpec("zstd"))
+        warm_compression = compression.get("warm")
 
-        self.hot_store = hot_store or DuckHot(duck_path)
-        self.warm_store = warm_store or TimescaleWarm(pg_dsn or None)
-        self.cold_store = cold_store or S3Cold(bucket, prefix)
-        self.catalog = catalog or Catalog()
+        self.hot_store = hot_store or DuckHot(
+            duck_path,
+            memory_limit=duck_memory_limit,
+            threads=duck_threads,
+            temp_directory=duck_temp_dir,
+            checkpoint_interval=duck_checkpoint,
+        )
+        self.warm_store = warm_store or TimescaleWarm(
+            pg_dsn or None,
+            compression=warm_compression.codec if warm_compression else None,
+        )
+        self.cold_store = cold_store or S3Cold(
+            bucket,
+            prefix,
+            storage_options=s3_options,
+            compression=cold_compression.codec,
+            compression_level=cold_compression.level,
+            row_group_size=s3_row_group_size,
+        )
+        self.catalog = catalog or Catalog(catalog_path)
         self.tier_order: list[str] = cast(
             list[str], config.get("tier_order", ["hot", "warm", "cold"])
         )
@@ -239,9 +961,28 @@ class HybridStorageManager(StorageBackend):
         self.hit_stats_schedule = cast(
             str, config.get("hit_stats_schedule", "0 1 * * *")
         )
+        self.metrics_per_table = bool(config.get("metrics_per_table", False))
+        rollup_cfg = cast(dict[str, dict[str, Any]], config.get("rollups") or {})
+        self.rollups: dict[str, RollupSpec] = {
+            name: RollupSpec(table=name, **opts) for name, opts in rollup_cfg.items()
+        }
+        layout_cfg = cast(dict[str, dict[str, Any]], config.get("layouts") or {})
+        self.layouts: dict[str, TableLayout] = {
+            pattern: TableLayout(**opts) for pattern, opts in layout_cfg.items()
+        }
+        retention_cfg = cast(list[dict[str, Any]], config.get("retention") or [])
+        self.retention_rules = [RetentionRule(**opts) for opts in retention_cfg]
+        self.retention_schedule = cast(
+            str, config.get("retention_schedule", "0 2 * * *")
+        )
         self._hot_lru: deque[str] = deque()
         self._warm_lru: deque[str] = deque()
         self.access_log: DefaultDict[str, deque[datetime]] = defaultdict(deque)
+        self.async_max_workers = int(cast(Any, config.get("async_max_workers", 4)))
+        self._executor: ThreadPoolExecutor | None = None
+        self._locks = TableLocks()
+        self._state_lock = threading.RLock()
+        self._restore_lru()
 
     def _backend_for(self, tier: str) -> StorageBackend:
         if tier == "hot":
@@ -252,48 +993,322 @@ class HybridStorageManager(StorageBackend):
             return self.cold_store
         raise ValueError(f"未知的 tier: {tier}")
 
+    def _observe(
+        self, tier: str, op: str, start: float, df: pl.DataFrame, table: str
+    ) -> None:
+        observe_storage_op(
+            tier,
+            op,
+            (perf_counter() - start) * 1000,
+            df,
+            table if self.metrics_per_table else None,
+        )
+
+    def _tier_read(self, tier: str, table: str, op: str = "read") -> pl.DataFrame:
+        """讀取指定層級並記錄耗時、位元組與筆數；找不到時記為 ``read_miss``。"""
+        backend = self._backend_for(tier)
+        start = perf_counter()
+        try:
+            df = backend.read(table)
+        except KeyError:
+            observe_storage_op(tier, "read_miss", (perf_counter() - start) * 1000)
+            raise
+        self._observe(tier, op, start, df, table)
+        return df
+
+    def _tier_write(
+        self,
+        tier: str,
+        df: pl.DataFrame,
+        table: str,
+        op: str = "write",
+        metadata: dict[str, object] | None = None,
+    ) -> None:
+        backend = self._backend_for(tier)
+        start = perf_counter()
+        backend.write(df, table, metadata=metadata)
+        self._observe(tier, op, start, df, table)
+
+    def _tier_delete(self, tier: str, table: str) -> None:
+        backend = self._backend_for(tier)
+        start = perf_counter()
+        backend.delete(table)
+        observe_storage_op(tier, "delete", (perf_counter() - start) * 1000)
+
+    def _async_executor(self) -> ThreadPoolExecutor:
+        with self._state_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(self.async_max_workers, 1),
+                    thread_name_prefix="storage-async",
+                )
+            return self._executor
+
+    async def _run_blocking(
+        self, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """於有界執行緒池中執行同步函式。"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._async_executor(), partial(func, *args, **kwargs)
+        )
+
+    @asynccontextmanager
+    async def _alocked(
+        self, table: str, *, write: bool = False
+    ) -> AsyncIterator[None]:
+        """取得表格鎖而不佔用 I/O 執行緒池。
+
+        未被佔用時直接取得；需等待時另起專用執行緒阻塞，避免等待者佔滿
+        ``async_max_workers`` 個工作執行緒而使持鎖者無法完成 I/O。
+        若等待時被取消，取得後立即釋放。
+        """
+        lock = self._locks.get(table)
+        if write:
+            try_acquire, acquire, release = (
+                lock.try_acquire_write,
+                lock.acquire_write,
+                lock.release_write,
+            )
+        else:
+            try_acquire, acquire, release = (
+                lock.try_acquire_read,
+                lock.acquire_read,
+                lock.release_read,
+            )
+        if not try_acquire():
+            loop = asyncio.get_running_loop()
+            fut: asyncio.Future[None] = loop.create_future()
+
+            def deliver() -> None:
+                if fut.cancelled():
+                    release()
+                else:
+                    fut.set_result(None)
+
+            def wait() -> None:
+                acquire()
+                try:
+                    loop.call_soon_threadsafe(deliver)
+                except RuntimeError:
+                    # event loop 已關閉，無人接手此鎖
+                    release()
+
+            threading.Thread(
+                target=wait, name="storage-lock-wait", daemon=True
+            ).start()
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    release()
+                raise
+        try:
+            yield
+        finally:
+            release()
+
+    async def _atier_read(
+        self, tier: str, table: str, op: str = "read"
+    ) -> pl.DataFrame:
+        backend = self._backend_for(tier)
+        if not backend.native_async:
+            return await self._run_blocking(self._tier_read, tier, table, op)
+        start = perf_counter()
+        try:
+            df = await backend.aread(table)
+        except KeyError:
+            observe_storage_op(tier, "read_miss", (perf_counter() - start) * 1000)
+            raise
+        self._observe(tier, op, start, df, table)
+        return df
+
+    async def _atier_write(
+        self,
+        tier: str,
+        df: pl.DataFrame,
+        table: str,
+        op: str = "write",
+        metadata: dict[str, object] | None = None,
+    ) -> None:
+        backend = self._backend_for(tier)
+        if not backend.native_async:
+            return await self._run_blocking(
+                self._tier_write, tier, df, table, op, metadata
+            )
+        start = perf_counter()
+        await backend.awrite(df, table, metadata=metadata)
+        self._observe(tier, op, start, df, table)
+
+    async def _atier_delete(self, tier: str, table: str) -> None:
+        backend = self._backend_for(tier)
+        if not backend.native_async:
+            return await self._run_blocking(self._tier_delete, tier, table)
+        start = perf_counter()
+        await backend.adelete(table)
+        observe_storage_op(tier, "delete", (perf_counter() - start) * 1000)
+
+    def close(self) -> None:
+        """關閉非同步操作使用的執行緒池。"""
+        with self._state_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _restore_lru(self) -> None:
+        """依 Catalog 建立時間重建 LRU，讓重啟後的容量管理延續先前狀態。"""
+        for tier, lru in (("hot", self._hot_lru), ("warm", self._warm_lru)):
+            tables = getattr(self._backend_for(tier), "_tables", None)
+            if not tables:
+                continue
+            tables = [t for t in tables if not self._is_rollup(t)]
+            known = [
+                e.table_name
+                for e in self.catalog.latest_entries(tier)
+                if e.table_name in tables
+            ]
+            # 未記錄在 Catalog 的表格視為最舊，優先被遷移
+            unknown = sorted(t for t in tables if t not in known)
+            lru.extend(unknown + known)
+
     def _record_lru(self, lru: deque[str], table: str) -> None:
-        if table in lru:
-            lru.remove(table)
-        lru.append(table)
+        with self._state_lock:
+            if table in lru:
+                lru.remove(table)
+            lru.append(table)
 
     def _record_access(self, table: str) -> None:
         """記錄資料表存取時間以便統計命中率。"""
-        self.access_log[table].append(datetime.utcnow())
+        with self._state_lock:
+            self.access_log[table].append(datetime.utcnow())
+
+    def _rollup_tables(self, table: str) -> list[str]:
+        spec = self.rollups.get(table)
+        return list(spec.tables().values()) if spec else []
+
+    def _is_rollup(self, table: str) -> bool:
+        return any(table in self._rollup_tables(base) for base in self.rollups)
+
+    def _table_count(self, backend: StorageBackend) -> int:
+        """層級中的表格數量；rollup 隨基礎表格搬移，不計入容量。"""
+        tables = cast(DuckHot, backend)._tables
+        return sum(1 for t in list(tables) if not self._is_rollup(t))
+
+    def _pop_overflow(
+        self, backend: StorageBackend, lru: deque[str], capacity: int
+    ) -> str | None:
+        """若層級超出容量則取出最久未使用的表格。"""
+        with self._state_lock:
+            if self._table_count(backend) > capacity and lru:
+                return lru.popleft()
+            return None
 
     def _check_capacity(self) -> None:
-        while len(cast(DuckHot, self.hot_store)._tables) > self.hot_capacity:
-            oldest = self._hot_lru.popleft()
-            self.migrate(oldest, "hot", "warm")
-        while len(cast(TimescaleWarm, self.warm_store)._tables) > self.warm_capacity:
-            oldest = self._warm_lru.popleft()
-            self.migrate(oldest, "warm", "cold")
+        # 遷移時不持有其他表格的鎖，避免不同執行緒互相等待
+        while (
+            oldest := self._pop_overflow(
+                self.hot_store, self._hot_lru, self.hot_capacity
+            )
+        ) is not None:
+            self._migrate_evicted(oldest, "hot", "warm")
+        while (
+            oldest := self._pop_overflow(
+                self.warm_store, self._warm_lru, self.warm_capacity
+            )
+        ) is not None:
+            self._migrate_evicted(oldest, "warm", "cold")
+
+    def _migrate_evicted(self, table: str, src_tier: str, dst_tier: str) -> None:
+        try:
+            self.migrate(table, src_tier, dst_tier)
+        except KeyError:
+            # 其他執行緒已搬移或刪除此表格
+            pass
+
+    def set_layout(self, pattern: str, layout: TableLayout) -> None:
+        """設定符合 ``pattern`` 的表格寫入時使用的排序鍵與 row group 大小。"""
+        self.layouts[pattern] = layout
+
+    def layout_for(self, table: str) -> TableLayout | None:
+        return match_layout(self.layouts, table)
+
+    def register_rollup(self, spec: RollupSpec) -> None:
+        """登記需維護 OHLCV rollup 的基礎表格。"""
+        self.rollups[spec.table] = spec
+
+    def _refresh_rollups(
+        self, spec: RollupSpec, df: pl.DataFrame, tier: str, *, full: bool = False
+    ) -> None:
+        """由細到粗逐層更新 rollup，每層只讀取上一層結果。"""
+        source = df
+        for level, name in spec.tables().items():
+            entry = self.catalog.get(name)
+            existing = None
+            if entry is not None and not full:
+                with self._locks.read(name):
+                    try:
+                        existing = self._tier_read(entry.tier, name, "rollup_read")
+                    except (KeyError, ValueError):
+                        existing = None
+            rolled = refresh_rollup(existing, source, spec, level)
+            target_tier = entry.tier if existing is not None and entry else tier
+            self.write(
+                rolled, name, tier=target_tier, metadata={"rollup_of": spec.table}
+            )
+            source = rolled
+
+    def refresh_rollups(self, table: str, *, full: bool = False) -> None:
+        """重新整理 ``table`` 的 rollup，``full=True`` 時由基礎表格完整重建。"""
+        spec = self.rollups[table]
+        entry = self.catalog.get(table)
+        tier = entry.tier if entry else "hot"
+        self._refresh_rollups(spec, self.read(table), tier, full=full)
+
+    def _read_interval(
+        self, table: str, interval: str, tiers: list[str] | None
+    ) -> pl.DataFrame:
+        spec = self.rollups.get(table)
+        if spec is None:
+            raise ValueError(f"{table} 未設定 rollup")
+        source = spec.closest(interval)
+        if source == spec.interval:
+            df = self.read(table, tiers=tiers)
+        else:
+            try:
+                df = self.read(spec.tables()[source], tiers=tiers)
+            except KeyError:
+                # rollup 尚未建立時退回基礎表格
+                source = spec.interval
+                df = self.read(table, tiers=tiers)
+        if source == interval:
+            return df
+        return aggregate_ohlcv(df, spec, interval)
 
     def compute_7day_hits(self) -> dict[str, int]:
         """計算最近七天每個表格的讀取次數。"""
         cutoff = datetime.utcnow() - timedelta(days=7)
         stats: dict[str, int] = {}
-        for table, times in self.access_log.items():
-            while times and times[0] < cutoff:
-                times.popleft()
-            stats[table] = len(times)
+        with self._state_lock:
+            for table, times in self.access_log.items():
+                while times and times[0] < cutoff:
+                    times.popleft()
+                stats[table] = len(times)
         return stats
 
     def migrate_low_hit_tables(self) -> None:
         """根據命中率與容量閾值自動下移低頻表格。"""
-        usage = len(cast(DuckHot, self.hot_store)._tables) / max(self.hot_capacity, 1)
+        usage = self._table_count(self.hot_store) / max(self.hot_capacity, 1)
         if usage <= self.hot_usage_threshold:
             return
         stats = self.compute_7day_hits()
         for table in list(cast(DuckHot, self.hot_store)._tables):
+            if self._is_rollup(table):
+                continue
             if stats.get(table, 0) < self.low_hit_threshold:
                 target = "warm"
-                if (
-                    len(cast(TimescaleWarm, self.warm_store)._tables)
-                    >= self.warm_capacity
-                ):
+                if self._table_count(self.warm_store) >= self.warm_capacity:
                     target = "cold"
-                self.migrate(table, "hot", target)
+                self._migrate_evicted(table, "hot", target)
 
     def write(
         self,
@@ -304,18 +1319,62 @@ class HybridStorageManager(StorageBackend):
         lineage_id: str | None = None,
         metadata: dict[str, object] | None = None,
     ) -> None:
-        backend = self._backend_for(tier)
+        self._backend_for(tier)  # 先驗證 tier
+        df, meta = self._prepare_write(df, table, metadata, lineage_id)
+        with self._locks.write(table):
+            self._tier_write(tier, df, table, metadata=meta)
+            self._commit_write(df, table, tier)
+        self._after_write(df, table, tier)
+
+    async def awrite(
+        self,
+        df: pl.DataFrame,
+        table: str,
+        *,
+        tier: str = "hot",
+        lineage_id: str | None = None,
+        metadata: dict[str, object] | None = None,
+    ) -> None:
+        """``write`` 的非同步版本。"""
+        self._backend_for(tier)
+        df, meta = self._prepare_write(df, table, metadata, lineage_id)
+        async with self._alocked(table, write=True):
+            await self._atier_write(tier, df, table, metadata=meta)
+            await self._run_blocking(self._commit_write, df, table, tier)
+        await self._run_blocking(self._after_write, df, table, tier)
+
+    def _prepare_write(
+        self,
+        df: pl.DataFrame,
+        table: str,
+        metadata: dict[str, object] | None,
+        lineage_id: str | None,
+    ) -> tuple[pl.DataFrame, dict[str, object] | None]:
+        """依表格設定排序資料並合併寫入用的 metadata。"""
         meta = metadata.copy() if metadata else {}
         if lineage_id:
             meta["lineage_id"] = lineage_id
-        backend.write(df, table, metadata=meta or None)
-        STORAGE_WRITE_COUNTER.labels(tier=tier).inc()
+        layout = self.layout_for(table)
+        if layout is not None:
+            df = layout.apply(df)
+            meta.update(layout.metadata())
+        return df, meta or None
+
+    def _layout_metadata(self, table: str) -> dict[str, object] | None:
+        layout = self.layout_for(table)
+        return (layout.metadata() or None) if layout else None
 
+    def _commit_write(self, df: pl.DataFrame, table: str, tier: str) -> None:
+        """寫入成功後登記 Catalog 並更新 LRU，呼叫者需持有表格寫入鎖。"""
         schema_hash = hashlib.sha256(str(df.schema).encode()).hexdigest()
-        partition_data = {}
-        for col in ("date", "asset"):
-            if col in df.columns:
-                partition_data[col] = str(df[col][0])
+        partition_data: dict[str, object] = {}
+        if "date" in df.columns and len(df):
+            # 記錄日期範圍，供保留規則判斷整個表格是否過期
+            partition_data["date"] = [str(df["date"].min()), str(df["date"].max())]
+        if "asset" in df.columns and len(df):
+            partition_data["asset"] = str(df["asset"][0])
+
+        STORAGE_WRITE_COUNTER.labels(tier=tier).inc()
         self.catalog.upsert(
             CatalogEntry(
                 table_name=table,
@@ -324,65 +1383,318 @@ class HybridStorageManager(StorageBackend):
                 location=tier,
                 schema_hash=schema_hash,
                 row_count=len(df),
-                partition_keys=json.dumps(
-                    partition_data, ensure_ascii=False
-                ),
+                partition_keys=json.dumps(partition_data, ensure_ascii=False),
                 lineage="write",
             )
         )
 
+        if self._is_rollup(table):
+            return
         if tier == "hot":
             self._record_lru(self._hot_lru, table)
         elif tier == "warm":
             self._record_lru(self._warm_lru, table)
 
+    def _after_write(self, df: pl.DataFrame, table: str, tier: str) -> None:
         self._check_capacity()
+        if table in self.rollups:
+            self._refresh_rollups(self.rollups[table], df, tier)
 
     def read(
-        self, table: str, *, tiers: list[str] | None = None
+        self,
+        table: str,
+        *,
+        tiers: list[str] | None = None,
+        interval: str | None = None,
     ) -> pl.DataFrame:
+        """讀取表格；指定 ``interval`` 時改由最接近的 rollup 提供資料。"""
+        if interval is not None:
+            return self._read_interval(table, interval, tiers)
         tiers = tiers or self.tier_order
-        for tier in tiers:
-            backend = self._backend_for(tier)
-            try:
-                result = backend.read(table)
+        # 持有讀取鎖以免表格在逐層查找時被搬移
+        with self._locks.read(table):
+            for tier in tiers:
+                try:
+                    result = self._tier_read(tier, table)
+                    STORAGE_READ_COUNTER.labels(tier=tier).inc()
+                    update_tier_hit_rate()
+                    self._record_access(table)
+                    return result
+                except KeyError:
+                    continue
+        return self._read_compacted(table, tiers)
+
+    def _compacted_source(self, table: str) -> tuple[list[str], pl.Expr | None]:
+        """解析壓縮合併後的表格名稱為其分段與篩選條件。
+
+        合併目標對應其全部分段；已合併的片段對應目標分段中落在該片段鍵值
+        範圍內的資料。皆不符合時拋出 ``KeyError``。
+        """
+        entry = self.catalog.get(table)
+        target, predicate = table, None
+        if entry is not None and entry.tier == COMPACTED_TIER:
+            target = entry.location
+            filters = json.loads(entry.partition_keys or "{}").get("filters")
+            predicate = filters_to_expr(decode_filters(filters))
+        parts = sorted(
+            e.table_name
+            for e in self.catalog.latest_entries()
+            if e.tier in self.tier_order and is_compacted_part(e.table_name, target)
+        )
+        if not parts:
+            raise KeyError(table)
+        return parts, predicate
+
+    def _read_compacted(self, table: str, tiers: list[str] | None) -> pl.DataFrame:
+        parts, predicate = self._compacted_source(table)
+        df = pl.concat(
+            [self.read(part, tiers=tiers) for part in parts], how="diagonal_relaxed"
+        )
+        return df if predicate is None else df.filter(predicate)
+
+    async def aread(
+        self,
+        table: str,
+        *,
+        tiers: list[str] | None = None,
+        interval: str | None = None,
+    ) -> pl.DataFrame:
+        """``read`` 的非同步版本。"""
+        if interval is not None:
+            return await self._run_blocking(
+                self._read_interval, table, interval, tiers
+            )
+        tiers = tiers or self.tier_order
+        async with self._alocked(table):
+            for tier in tiers:
+                try:
+                    result = await self._atier_read(tier, table)
+                except KeyError:
+                    continue
                 STORAGE_READ_COUNTER.labels(tier=tier).inc()
                 update_tier_hit_rate()
                 self._record_access(table)
                 return result
+        return await self._run_blocking(self._read_compacted, table, tiers)
+
+    def scan(
+        self, table: str, *, tiers: list[str] | None = None
+    ) -> pl.LazyFrame:
+        """回傳最熱層級中該表格的 LazyFrame，collect 時才實際讀取。
+
+        篩選、投影與聚合會交由各後端最佳化；LazyFrame 不持有表格鎖，
+        若表格在 collect 前被搬移或刪除，collect 可能失敗。
+        """
+        tiers = tiers or self.tier_order
+        for tier in tiers:
+            start = perf_counter()
+            try:
+                lazy = self._backend_for(tier).scan(table)
             except KeyError:
                 continue
-        raise KeyError(table)
+            observe_storage_op(tier, "scan", (perf_counter() - start) * 1000)
+            STORAGE_READ_COUNTER.labels(tier=tier).inc()
+            update_tier_hit_rate()
+            self._record_access(table)
+            return lazy
+        parts, predicate = self._compacted_source(table)
+        lazy = pl.concat(
+            [self.scan(part, tiers=tiers) for part in parts], how="diagonal_relaxed"
+        )
+        return lazy if predicate is None else lazy.filter(predicate)
+
+    def schema(self, table: str, *, tiers: list[str] | None = None) -> pl.Schema:
+        """回傳最熱層級中該表格的欄位結構，不計入讀取次數與命中率。"""
+        for tier in tiers or self.tier_order:
+            try:
+                return self._backend_for(tier).scan(table).collect_schema()
+            except KeyError:
+                continue
+        parts, _ = self._compacted_source(table)
+        return self.schema(parts[0], tiers=tiers)
+
+    def read_arrow(
+        self,
+        table: str,
+        *,
+        columns: list[str] | None = None,
+        predicate: pl.Expr | None = None,
+        tiers: list[str] | None = None,
+    ) -> pa.Table:
+        """以 Arrow Table 回傳，欄位投影與篩選經由 ``scan`` 下推至後端。"""
+        lazy = self.scan(table, tiers=tiers)
+        if predicate is not None:
+            lazy = lazy.filter(predicate)
+        if columns:
+            lazy = lazy.select(columns)
+        return lazy.collect().to_arrow()
+
+    def read_batches(
+        self,
+        table: str,
+        *,
+        columns: list[str] | None = None,
+        predicate: pl.Expr | None = None,
+        sort_by: list[str] | None = None,
+        batch_size: int = 65_536,
+        tiers: list[str] | None = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """逐批回傳最熱層級中該表格的查詢結果，每批最多 ``batch_size`` 筆。
+
+        投影、篩選與排序交由後端逐批執行：DuckDB 與 PostgreSQL 以 ``ORDER BY``
+        查詢的 cursor 取回，S3 依 row group 統計值依序讀取，不會先載入整個表格。
+        ``sort_by`` 指定時依該欄位排序，同值保留寫入順序。
+        """
+        for tier in tiers or self.tier_order:
+            batches = self._backend_for(tier).read_batches(
+                table,
+                columns=columns,
+                predicate=predicate,
+                sort_by=sort_by,
+                batch_size=batch_size,
+            )
+            start = perf_counter()
+            try:
+                first = next(batches, None)
+            except KeyError:
+                continue
+            observe_storage_op(tier, "read_batches", (perf_counter() - start) * 1000)
+            STORAGE_READ_COUNTER.labels(tier=tier).inc()
+            update_tier_hit_rate()
+            self._record_access(table)
+            if first is None:
+                return
+            yield first
+            yield from batches
+            return
+        yield from self._compacted_batches(
+            table, columns, predicate, sort_by, batch_size, tiers
+        )
+
+    def _compacted_batches(
+        self,
+        table: str,
+        columns: list[str] | None,
+        predicate: pl.Expr | None,
+        sort_by: list[str] | None,
+        batch_size: int,
+        tiers: list[str] | None,
+    ) -> Iterator[pa.RecordBatch]:
+        """依序逐批讀取各分段。
+
+        分段依合併時的排序鍵切分，``sort_by`` 與之不同且有多個分段時，
+        無法逐段輸出，改為收集後排序。
+        """
+        parts, alias = self._compacted_source(table)
+        if sort_by and len(parts) > 1:
+            lazy = self.scan(table, tiers=tiers)
+            if predicate is not None:
+                lazy = lazy.filter(predicate)
+            lazy = lazy.sort(sort_by, maintain_order=True)
+            df = lazy.select(columns).collect() if columns else lazy.collect()
+            yield from df.to_arrow().to_batches(max_chunksize=batch_size)
+            return
+        if alias is not None:
+            predicate = alias if predicate is None else alias & predicate
+        for part in parts:
+            yield from self.read_batches(
+                part,
+                columns=columns,
+                predicate=predicate,
+                sort_by=sort_by,
+                batch_size=batch_size,
+                tiers=tiers,
+            )
 
     def delete(self, table: str) -> None:
-        for backend in (self.hot_store, self.warm_store, self.cold_store):
-            backend.delete(table)
+        with self._locks.write(table):
+            for tier in ("hot", "warm", "cold"):
+                self._tier_delete(tier, table)
+            with self._state_lock:
+                for lru in (self._hot_lru, self._warm_lru):
+                    if table in lru:
+                        lru.remove(table)
+        if table in self.rollups:
+            for name in self.rollups[table].tables().values():
+                self.delete(name)
 
     def migrate(self, table: str, src_tier: str, dst_tier: str) -> None:
+        """搬移表格並更新 Catalog，Catalog 更新失敗時回復目標層級。"""
         start_time = perf_counter()
-        src = self._backend_for(src_tier)
-        dst = self._backend_for(dst_tier)
-        df = src.read(table)
-        STORAGE_READ_COUNTER.labels(tier=src_tier).inc()
-        update_tier_hit_rate()
-        dst.write(df, table)
-        STORAGE_WRITE_COUNTER.labels(tier=dst_tier).inc()
-        src.delete(table)
-
-        self.catalog.update_tier(table, dst_tier, dst_tier)
-
-        if src_tier == "hot" and table in self._hot_lru:
-            self._hot_lru.remove(table)
-        if src_tier == "warm" and table in self._warm_lru:
-            self._warm_lru.remove(table)
-
-        if dst_tier == "warm":
-            self._record_lru(self._warm_lru, table)
-        elif dst_tier == "hot":
-            self._record_lru(self._hot_lru, table)
+        self._backend_for(src_tier)
+        self._backend_for(dst_tier)
+        with self._locks.write(table):
+            df = self._tier_read(src_tier, table, "migrate_read")
+            STORAGE_READ_COUNTER.labels(tier=src_tier).inc()
+            update_tier_hit_rate()
+            self._tier_write(
+                dst_tier, df, table, "migrate_write", self._layout_metadata(table)
+            )
+            STORAGE_WRITE_COUNTER.labels(tier=dst_tier).inc()
+            try:
+                self.catalog.update_tier(table, dst_tier, dst_tier)
+            except Exception:
+                self._tier_delete(dst_tier, table)
+                raise
+            self._tier_delete(src_tier, table)
+            self._record_migration(table, src_tier, dst_tier)
 
+        for name in self._rollup_tables(table):
+            entry = self.catalog.get(name)
+            if entry is not None and entry.tier == src_tier:
+                self._migrate_evicted(name, src_tier, dst_tier)
         self._check_capacity()
         duration_ms = (perf_counter() - start_time) * 1000
         MIGRATION_LATENCY_MS.labels(src_tier=src_tier, dst_tier=dst_tier).observe(
             duration_ms
         )
+
+    async def amigrate(self, table: str, src_tier: str, dst_tier: str) -> None:
+        """``migrate`` 的非同步版本。"""
+        start_time = perf_counter()
+        self._backend_for(src_tier)
+        self._backend_for(dst_tier)
+        async with self._alocked(table, write=True):
+            df = await self._atier_read(src_tier, table, "migrate_read")
+            STORAGE_READ_COUNTER.labels(tier=src_tier).inc()
+            update_tier_hit_rate()
+            await self._atier_write(
+                dst_tier, df, table, "migrate_write", self._layout_metadata(table)
+            )
+            STORAGE_WRITE_COUNTER.labels(tier=dst_tier).inc()
+            try:
+                await self._run_blocking(
+                    self.catalog.update_tier, table, dst_tier, dst_tier
+                )
+            except Exception:
+                await self._atier_delete(dst_tier, table)
+                raise
+            await self._atier_delete(src_tier, table)
+            self._record_migration(table, src_tier, dst_tier)
+
+        for name in self._rollup_tables(table):
+            entry = await self._run_blocking(self.catalog.get, name)
+            if entry is not None and entry.tier == src_tier:
+                try:
+                    await self.amigrate(name, src_tier, dst_tier)
+                except KeyError:
+                    pass
+        await self._run_blocking(self._check_capacity)
+        duration_ms = (perf_counter() - start_time) * 1000
+        MIGRATION_LATENCY_MS.labels(src_tier=src_tier, dst_tier=dst_tier).observe(
+            duration_ms
+        )
+
+    def _record_migration(self, table: str, src_tier: str, dst_tier: str) -> None:
+        with self._state_lock:
+            if src_tier == "hot" and table in self._hot_lru:
+                self._hot_lru.remove(table)
+            if src_tier == "warm" and table in self._warm_lru:
+                self._warm_lru.remove(table)
+
+            if self._is_rollup(table):
+                return
+            if dst_tier == "warm":
+                self._record_lru(self._warm_lru, table)
+            elif dst_tier == "hot":
+                self._record_lru(self._hot_lru, table)
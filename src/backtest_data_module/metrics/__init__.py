@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Any
+
 from prometheus_client import Counter, Gauge, Histogram, start_http_server
 from backtest_data_module.data_ingestion.metrics import (
     REQUEST_COUNTER,
@@ -49,6 +52,77 @@ TIER_HIT_RATE = Gauge(
 )
 
 
+# 各層級儲存操作的延遲、資料量與筆數
+STORAGE_OP_LATENCY_MS = Histogram(
+    "data_storage_op_latency_ms",
+    "儲存層操作耗時（ms）",
+    ["tier", "op"],
+    buckets=(0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+
+STORAGE_BYTES_COUNTER = Counter(
+    "data_storage_bytes_total",
+    "儲存層傳輸位元組數（以記憶體估計值計）",
+    ["tier", "op"],
+)
+
+STORAGE_ROWS_COUNTER = Counter(
+    "data_storage_rows_total",
+    "儲存層傳輸筆數",
+    ["tier", "op"],
+)
+
+# 依表格區分的指標，需於 storage.yaml 設定 metrics_per_table 才會記錄
+STORAGE_TABLE_LATENCY_MS = Histogram(
+    "data_storage_table_latency_ms",
+    "各表格儲存操作耗時（ms）",
+    ["tier", "op", "table"],
+    buckets=(1, 5, 25, 100, 500, 2500, 10000),
+)
+
+STORAGE_TABLE_BYTES_COUNTER = Counter(
+    "data_storage_table_bytes_total",
+    "各表格傳輸位元組數",
+    ["tier", "op", "table"],
+)
+
+
+@lru_cache(maxsize=None)
+def _storage_op_children(tier: str, op: str) -> tuple[Any, Any, Any]:
+    """快取 labels() 結果，避免熱路徑上重複查找子指標。"""
+    return (
+        STORAGE_OP_LATENCY_MS.labels(tier=tier, op=op),
+        STORAGE_BYTES_COUNTER.labels(tier=tier, op=op),
+        STORAGE_ROWS_COUNTER.labels(tier=tier, op=op),
+    )
+
+
+def observe_storage_op(
+    tier: str,
+    op: str,
+    elapsed_ms: float,
+    df: Any = None,
+    table: str | None = None,
+) -> None:
+    """記錄一次儲存操作的耗時，並在提供 DataFrame 時累計位元組與筆數。"""
+    latency, nbytes, nrows = _storage_op_children(tier, op)
+    latency.observe(elapsed_ms)
+    size = 0
+    if df is not None:
+        estimate = getattr(df, "estimated_size", None)
+        size = int(estimate()) if estimate else 0
+        nbytes.inc(size)
+        nrows.inc(len(df))
+    if table is not None:
+        STORAGE_TABLE_LATENCY_MS.labels(tier=tier, op=op, table=table).observe(
+            elapsed_ms
+        )
+        if size:
+            STORAGE_TABLE_BYTES_COUNTER.labels(tier=tier, op=op, table=table).inc(
+                size
+            )
+
+
 def update_tier_hit_rate() -> None:
     """\u91cd\u65b0\u8a08\u7b97\u5c64\u7d1a\u547d\u4e2d\u7387."""
     total = sum(
@@ -78,6 +152,12 @@ __all__ = [
     "STORAGE_READ_COUNTER",
     "MIGRATION_LATENCY_MS",
     "TIER_HIT_RATE",
+    "STORAGE_OP_LATENCY_MS",
+    "STORAGE_BYTES_COUNTER",
+    "STORAGE_ROWS_COUNTER",
+    "STORAGE_TABLE_LATENCY_MS",
+    "STORAGE_TABLE_BYTES_COUNTER",
+    "observe_storage_op",
     "update_tier_hit_rate",
     "start_exporter",
 ]
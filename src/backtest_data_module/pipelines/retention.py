@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import yaml
+from prefect import flow, get_run_logger
+
+from backtest_data_module.data_storage.retention import RetentionService
+from backtest_data_module.data_storage.storage_backend import HybridStorageManager
+
+# 從配置檔讀取排程
+try:
+    with open("storage.yaml", "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f) or {}
+except FileNotFoundError:
+    cfg = {}
+SCHEDULE = cfg.get("retention_schedule", "0 2 * * *")
+
+
+@flow
+def retention_flow() -> None:
+    """依保留規則刪除或下移過期的表格。"""
+    logger = get_run_logger()
+    manager = HybridStorageManager()
+    actions = RetentionService(manager).enforce()
+    for action in actions:
+        logger.info(f"{action.action} {action.table} ({action.tier})")
+    logger.info(f"保留規則處理 {len(actions)} 個表格")
+
+
+if __name__ == "__main__":
+    # Prefect 3 以 serve 建立排程部署，cron 以 UTC 解讀
+    retention_flow.serve(
+        name="storage-retention", cron=SCHEDULE, tags=["maintenance"]
+    )
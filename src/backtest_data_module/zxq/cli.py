@@ -22,7 +22,10 @@ from backtest_data_module.data_processing.cross_validation import walk_forward_s
 from backtest_data_module.data_storage import (
     Catalog,
     CatalogEntry,
+    CompactionService,
     HybridStorageManager,
+    RetentionService,
+    StorageFlightServer,
 )
 from backtest_data_module.reporting.report import ReportGen
 
@@ -119,6 +122,68 @@ def migrate(
         typer.echo(f"已將 {table} 從 {entry.tier} 移至 {to}")
 
 
+@storage_app.command()
+def compact(
+    pattern: str = typer.Option(..., "--pattern", help="片段表格名稱樣式，如 AAPL_*"),
+    target: str = typer.Option(..., "--target", help="合併後的表格名稱"),
+    tier: str = typer.Option("cold", "--tier", help="要壓縮的層級"),
+    target_mb: int = typer.Option(128, "--target-mb", help="每個分段的目標大小（MB）"),
+    target_rows: int | None = typer.Option(
+        None, "--target-rows", help="每個分段的筆數上限"
+    ),
+    db: str = typer.Option(":memory:", "--db", help="Catalog 位置"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="僅顯示預期動作"),
+) -> None:
+    """將增量寫入的小表格合併為固定大小的分段。"""
+    manager = HybridStorageManager(catalog=Catalog(db_path=db))
+    service = CompactionService(
+        manager, target_bytes=target_mb * 1024 * 1024, target_rows=target_rows
+    )
+    result = service.compact(pattern, target, tier=tier, dry_run=dry_run)
+    if not result.fragments:
+        typer.echo(f"{tier} 層沒有符合 {pattern} 的片段")
+        return
+    if dry_run:
+        typer.echo(f"將合併 {len(result.fragments)} 個片段至 {target}")
+    else:
+        typer.echo(
+            f"已將 {len(result.fragments)} 個片段合併為 {len(result.parts)} 個分段"
+            f"（{result.row_count} 筆）"
+        )
+
+
+@storage_app.command()
+def retention(
+    db: str = typer.Option(":memory:", "--db", help="Catalog 位置"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="僅顯示預期動作"),
+) -> None:
+    """依 storage.yaml 的保留規則刪除或下移過期表格。"""
+    manager = HybridStorageManager(catalog=Catalog(db_path=db))
+    actions = RetentionService(manager).enforce(dry_run=dry_run)
+    if not actions:
+        typer.echo("沒有過期的表格")
+        return
+    for action in actions:
+        target = f" -> {action.target_tier}" if action.target_tier else ""
+        prefix = "將" if dry_run else "已"
+        typer.echo(
+            f"{prefix}{action.action} {action.table} ({action.tier}{target})"
+        )
+
+
+@storage_app.command()
+def serve(
+    host: str = typer.Option("0.0.0.0", "--host", help="監聽位址"),
+    port: int = typer.Option(8815, "--port", help="監聽埠號"),
+    db: str = typer.Option(":memory:", "--db", help="Catalog 位置"),
+) -> None:
+    """啟動 Arrow Flight 伺服器，供 worker 共用儲存層讀取。"""
+    manager = HybridStorageManager(catalog=Catalog(db_path=db))
+    server = StorageFlightServer(manager, f"grpc://{host}:{port}")
+    typer.echo(f"Flight 伺服器監聽於 grpc://{host}:{server.port}")
+    server.serve()
+
+
 @backup_app.command()
 def verify(latest: bool = False) -> None:
     """驗證或還原備份。"""
@@ -1,9 +1,13 @@
 import unittest
+from datetime import date, timedelta
+
+import numpy as np
 
 from backtest_data_module.backtesting.execution import (
     Execution,
     FlatCommission,
     GaussianSlippage,
+    LatencyModel,
 )
 from backtest_data_module.backtesting.events import OrderEvent
 
@@ -36,6 +40,50 @@ class TestExecution(unittest.TestCase):
         self.assertAlmostEqual(fills[1]["price"], 2800.0, delta=10.0)
         self.assertAlmostEqual(fills[1]["commission"], 140.0, delta=1.0)
 
+    def test_equal_times_keep_fifo_and_batch_matches(self):
+        class FixedLatency(LatencyModel):
+            def __init__(self, delays):
+                self.delays = iter(delays)
+
+            def get_delay(self) -> float:
+                return next(self.delays)
+
+        day = date(2024, 1, 1)
+        orders = [
+            OrderEvent(asset="B", quantity=1),
+            OrderEvent(asset="A", quantity=2),
+            OrderEvent(asset="B", quantity=3),
+            OrderEvent(asset="X", quantity=4),
+            OrderEvent(asset="A", quantity=5),
+        ]
+        delays = [86400, 0, 0, 0, 0]
+        executions = []
+        for _ in range(2):
+            execution = Execution(
+                commission_model=FlatCommission(0.001),
+                slippage_model=GaussianSlippage(seed=3),
+                latency_model=FixedLatency(delays),
+            )
+            for order in orders:
+                execution.place_order(order, day)
+            executions.append(execution)
+
+        first = executions[0].process_orders(
+            day, {"A": {"close": 10.0}, "B": {"close": 20.0}}
+        )
+        self.assertEqual([f["quantity"] for f in first], [2, 3, 5])
+
+        batch = executions[1].process_orders_batch(
+            day, np.array([10.0, 20.0]), {"A": 0, "B": 1}
+        )
+        self.assertEqual(batch, first)
+        self.assertEqual(len(executions[1].order_queue), 1)
+        later = executions[1].process_orders_batch(
+            day + timedelta(days=1), np.array([10.0, np.nan]), {"A": 0, "B": 1}
+        )
+        self.assertEqual(later, [])
+        self.assertEqual(executions[1].order_queue, [])
+
 
 if __name__ == "__main__":
     unittest.main()
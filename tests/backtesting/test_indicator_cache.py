@@ -0,0 +1,185 @@
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+
+from backtest_data_module.backtesting.indicator_cache import (
+    IndicatorCache,
+    compute_indicator,
+    fingerprint,
+    shared_indicator_cache,
+)
+from backtest_data_module.backtesting.strategies.mean_reversion import MeanReversion
+
+
+def _data(n=50) -> pl.DataFrame:
+    rng = np.random.default_rng(4)
+    return pl.DataFrame(
+        {
+            "date": list(range(n)) * 2,
+            "asset": ["A"] * n + ["B"] * n,
+            "close": 100 + rng.normal(0, 1, 2 * n).cumsum(),
+        }
+    )
+
+
+def test_hits_misses_and_fingerprint():
+    data = _data()
+    cache = IndicatorCache()
+    first = cache.indicator(data, "rolling_mean", "A", window=5)
+    again = cache.indicator(data.clone(), "rolling_mean", "A", window=5)
+    assert again is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.indicator(data, "rolling_mean", "A", window=10)
+    cache.indicator(data, "rolling_mean", "B", window=5)
+    assert cache.misses == 3
+
+    expected = data.filter(pl.col("asset") == "A")["close"].rolling_mean(5)
+    assert first.equals(expected, check_names=False)
+    changed = data.with_columns(pl.col("close") + 1)
+    assert fingerprint(changed) != fingerprint(data)
+    with pytest.raises(KeyError):
+        compute_indicator(data, "unknown")
+
+
+def test_byte_bound_evicts_least_recently_used():
+    data = _data()
+    size = compute_indicator(data, "rolling_mean", "A", window=5).estimated_size()
+    cache = IndicatorCache(max_bytes=2 * size)
+    for window in (3, 4, 5):
+        cache.indicator(data, "rolling_mean", "A", window=window)
+    assert len(cache) == 2
+    assert cache.nbytes <= 2 * size
+    cache.indicator(data, "rolling_mean", "A", window=3)
+    assert cache.misses == 4
+
+    restored = pickle.loads(pickle.dumps(cache))
+    restored.indicator(data, "rolling_mean", "A", window=5)
+    assert restored.hits == 1
+
+
+def test_strategy_signals_unchanged_with_cache():
+    data = _data()
+
+    def key(signal):
+        return signal.asset
+
+    plain = sorted(MeanReversion(window=10, threshold=1.0).on_data(data), key=key)
+    cache = IndicatorCache()
+    strategy = MeanReversion(window=10, threshold=1.0)
+    strategy.indicator_cache = cache
+    assert sorted(strategy.on_data(data), key=key) == plain
+    assert sorted(strategy.on_data(data), key=key) == plain
+    assert cache.hits == 2
+
+
+def test_shared_cache_across_ray_workers():
+    ray = pytest.importorskip("ray")
+    src = str(Path(__file__).resolve().parents[2] / "src")
+    ray.init(
+        num_cpus=1,
+        include_dashboard=False,
+        ignore_reinit_error=True,
+        runtime_env={"env_vars": {"PYTHONPATH": src}},
+    )
+    try:
+        cache = shared_indicator_cache()
+        data = _data()
+
+        @ray.remote
+        def worker(cache, data):
+            cache.indicator(data, "rolling_std", "B", window=7)
+            return cache.hits
+
+        assert ray.get(worker.remote(cache, data)) == 0
+        assert ray.get(worker.remote(cache, data)) == 1
+        assert cache.indicator(data, "rolling_std", "B", window=7).len() == 50
+        assert cache.hits == 1
+    finally:
+        ray.shutdown()
+
+
+def test_fingerprint_covers_only_used_columns():
+    data = _data()
+    extra = data.with_columns(volume=pl.lit(1))
+    cache = IndicatorCache()
+    cache.indicator(data, "rolling_mean", "A", window=5)
+    cache.indicator(extra, "rolling_mean", "A", window=5)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert fingerprint(data, ["close"]) == fingerprint(extra, ["close"])
+
+    exprs = {"ma": pl.col("close").rolling_mean(3).over("asset")}
+    first = cache.compute(data, exprs)
+    assert cache.compute(extra, exprs)["ma"].equals(first["ma"])
+    assert cache.hits == 2
+    # 萬用字元運算式無法列出讀取的欄位，改以全部欄位計算指紋
+    cache.compute(data, {"ma": pl.col("^c.*$").rolling_mean(3)})
+    cache.compute(extra, {"ma": pl.col("^c.*$").rolling_mean(3)})
+    assert cache.misses == 4
+
+
+def _register_sma_crossover():
+    from backtest_data_module.backtesting.strategies.sma_crossover import (
+        SmaCrossover,
+    )
+    from backtest_data_module.strategy_manager.registry import strategy_registry
+
+    if "SmaCrossover" not in strategy_registry._strategies:
+        strategy_registry.register("SmaCrossover", SmaCrossover)
+
+
+def test_run_ray_sweep_reuses_shared_cache(tmp_path, monkeypatch):
+    ray = pytest.importorskip("ray")
+    import pandas as pd
+
+    from backtest_data_module.backtesting.execution import Execution
+    from backtest_data_module.backtesting.orchestrator import Orchestrator
+    from backtest_data_module.backtesting.performance import Performance
+    from backtest_data_module.backtesting.portfolio import Portfolio
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "metrics").mkdir()
+    _register_sma_crossover()
+    # worker 需能匯入本測試模組以執行註冊策略的 setup hook
+    root = Path(__file__).resolve().parents[2]
+    ray.init(
+        num_cpus=1,
+        include_dashboard=False,
+        ignore_reinit_error=True,
+        runtime_env={
+            "env_vars": {"PYTHONPATH": os.pathsep.join([str(root / "src"), str(root)])},
+            "worker_process_setup_hook": _register_sma_crossover,
+        },
+    )
+    try:
+        orchestrator = Orchestrator(
+            None, "SmaCrossover", Portfolio, Execution, Performance
+        )
+        data = pd.DataFrame(
+            {
+                "asset": ["A"] * 120,
+                "close": [100.0 + i % 7 for i in range(120)],
+            },
+            index=pd.date_range("2020-01-01", periods=120, name="date"),
+        )
+        config = {
+            "walk_forward": {"train_period": 40, "test_period": 40, "step_size": 40},
+            "strategy_params": {"short_window": 5, "long_window": 10},
+        }
+        orchestrator.run_ray(config, data)
+        cache = orchestrator.remote_indicator_cache
+        # 兩個切片資料不同，各自計算兩條均線
+        assert cache.stats()["hits"] == 0
+        assert cache.stats()["items"] == 4
+
+        config["strategy_params"] = {"short_window": 5, "long_window": 20}
+        orchestrator.run_ray(config, data)
+        assert orchestrator.remote_indicator_cache is cache
+        # 第二組參數沿用各切片的短均線，只計算新的長均線
+        stats = cache.stats()
+        assert (stats["hits"], stats["items"]) == (2, 6)
+    finally:
+        ray.shutdown()
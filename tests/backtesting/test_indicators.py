@@ -0,0 +1,118 @@
+from collections import Counter
+from datetime import date, timedelta
+
+import numpy as np
+import polars as pl
+
+from backtest_data_module.backtesting import indicators as ind
+from backtest_data_module.backtesting.indicator_cache import IndicatorCache
+from backtest_data_module.backtesting.strategies.sma_crossover import SmaCrossover
+
+
+def _data(n=40, assets=("A", "B", "C")) -> pl.DataFrame:
+    rng = np.random.default_rng(9)
+    start = date(2024, 1, 1)
+    close = 100 + rng.normal(0, 1, n * len(assets)).cumsum()
+    frame = pl.DataFrame(
+        {
+            "date": [start + timedelta(days=i) for i in range(n)] * len(assets),
+            "asset": [a for a in assets for _ in range(n)],
+            "close": close,
+            "high": close + rng.uniform(0, 1, n * len(assets)),
+            "low": close - rng.uniform(0, 1, n * len(assets)),
+        }
+    )
+    # 打亂列順序，確認計算前會依資產與時間排序
+    return frame.sample(fraction=1.0, shuffle=True, seed=1)
+
+
+def test_indicators_match_per_asset_computation():
+    data = _data()
+    mid, upper, lower = ind.bollinger(10, k=2.0)
+    frame = ind.compute(
+        data,
+        {
+            "sma": ind.sma(5),
+            "ema": ind.ema(5),
+            "std": ind.rolling_std(5),
+            "z": ind.zscore(5),
+            "rsi": ind.rsi(14),
+            "atr": ind.atr(3),
+            "bb_mid": mid,
+            "bb_upper": upper,
+            "bb_lower": lower,
+            "ret": ind.returns(),
+            "log_ret": ind.returns(log=True),
+        },
+    )
+    assert frame.select("asset", "date").equals(
+        data.select("asset", "date").sort("asset", "date")
+    )
+    for asset in ("A", "B", "C"):
+        one = frame.filter(pl.col("asset") == asset)
+        close = one["close"]
+        np.testing.assert_allclose(
+            one["sma"].to_numpy(), close.rolling_mean(5).to_numpy(), equal_nan=True
+        )
+        np.testing.assert_allclose(
+            one["ema"].to_numpy(), close.ewm_mean(span=5, adjust=False).to_numpy()
+        )
+        np.testing.assert_allclose(
+            one["bb_upper"] - one["bb_mid"], 2.0 * close.rolling_std(10)
+        )
+        np.testing.assert_allclose(
+            one["ret"].to_numpy()[1:], (close / close.shift(1) - 1).to_numpy()[1:]
+        )
+        high, low = one["high"].to_numpy(), one["low"].to_numpy()
+        prev = close.to_numpy()[:-1]
+        tr = np.maximum.reduce(
+            [high[1:] - low[1:], np.abs(high[1:] - prev), np.abs(low[1:] - prev)]
+        )
+        np.testing.assert_allclose(one["atr"].to_numpy()[3], tr[:3].mean())
+    rsi = frame["rsi"].drop_nulls().drop_nans()
+    assert ((rsi >= 0) & (rsi <= 100)).all()
+
+
+def test_crossovers():
+    frame = pl.DataFrame(
+        {
+            "asset": ["A"] * 4 + ["B"] * 2,
+            "fast": [1.0, 3.0, 2.0, 0.0, 5.0, 6.0],
+            "slow": [2.0, 2.0, 2.0, 2.0, 1.0, 1.0],
+        }
+    )
+    out = frame.select(
+        up=ind.crossover("fast", "slow"), down=ind.crossunder("fast", "slow")
+    )
+    assert out["up"].fill_null(False).to_list() == [
+        False, True, False, False, False, False
+    ]
+    assert out["down"].fill_null(False).to_list() == [
+        False, False, False, True, False, False
+    ]
+
+
+def _reference_sma_signals(data, short, long):
+    counts = Counter()
+    for asset in data["asset"].unique():
+        closes = data.filter(pl.col("asset") == asset).sort("date")["close"]
+        s = closes.rolling_mean(short).to_numpy()
+        lg = closes.rolling_mean(long).to_numpy()
+        counts[(asset, 100)] += int(np.sum(s > lg))
+        counts[(asset, -100)] += int(np.sum(s < lg))
+    return +counts
+
+
+def test_sma_crossover_uses_one_query_and_cache():
+    data = _data()
+    strategy = SmaCrossover(short_window=3, long_window=8)
+    signals = strategy.on_data(data)
+    assert Counter((s.asset, s.quantity) for s in signals) == _reference_sma_signals(
+        data, 3, 8
+    )
+    assert {s.direction for s in signals if s.quantity > 0} == {"long"}
+
+    strategy.indicator_cache = IndicatorCache()
+    assert strategy.on_data(data) == signals
+    strategy.on_data(data)
+    assert strategy.indicator_cache.hits == 2
@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+
+import numpy as np
+import polars as pl
+
+from backtest_data_module.backtesting.engine import Backtest
+from backtest_data_module.backtesting.execution import (
+    Execution,
+    FlatCommission,
+    GaussianSlippage,
+)
+from backtest_data_module.backtesting.kernels import (
+    STOP_EXIT,
+    TARGET_EXIT,
+    stop_target_exits,
+    trailing_stop,
+    volatility_sizing,
+)
+from backtest_data_module.backtesting.performance import Performance
+from backtest_data_module.backtesting.portfolio import Portfolio, RiskManager
+from backtest_data_module.backtesting.strategy import StrategyBase
+from backtest_data_module.backtesting.vectorized import close_matrix
+
+
+def test_stop_and_target_exits():
+    close = np.array(
+        [[100.0, 100.0], [103.0, 97.0], [111.0, 94.0], [100.0, 89.0], [99.0, 80.0]]
+    )
+    signals = np.zeros_like(close)
+    signals[0] = [1, -1]
+    signals[2, 1] = 1
+    signals[3] = [1, 1]
+    direction, reason = stop_target_exits(close, signals, 0.05, 0.10)
+    # A 於第 3 根達停利，出場當根不再進場，第 4 根重新進場
+    assert direction[:, 0].tolist() == [1, 1, 0, 1, 1]
+    assert reason[2, 0] == TARGET_EXIT
+    # B 空單在價格下跌時獲利，第 4 根達停利
+    assert direction[:, 1].tolist() == [-1, -1, -1, 0, 0]
+    assert reason[3, 1] == TARGET_EXIT
+
+    entry = np.array([[1.0], [0], [0]])
+    falling = np.array([[100.0], [96.0], [94.0]])
+    direction, reason = stop_target_exits(falling, entry, 0.05, 0.5)
+    assert direction[:, 0].tolist() == [1, 1, 0]
+    assert reason[2, 0] == STOP_EXIT
+
+
+def test_trailing_stop_follows_peak():
+    close = np.array([[100.0], [110.0], [120.0], [110.0], [107.0], [np.nan]])
+    signals = np.array([[1.0], [0], [0], [0], [0], [0]])
+    direction = trailing_stop(close, signals, 0.1)
+    assert direction[:, 0].tolist() == [1, 1, 1, 1, 0, 0]
+
+
+def test_volatility_sizing_respects_capital():
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, [0.01, 0.03], (60, 2)), axis=0))
+    direction = np.ones_like(close)
+    shares = volatility_sizing(close, direction, 10000, 0.02, window=10, max_weight=2)
+    assert (shares[:10] == 0).all()
+    exposure = np.abs(shares[10:] * close[10:]).sum(axis=1)
+    assert (exposure <= 10000).all()
+    # 波動較低的資產分配到較多資金
+    value = shares[10:] * close[10:]
+    assert value[:, 0].mean() > value[:, 1].mean()
+
+
+class NoSignals(StrategyBase):
+    def __init__(self):
+        super().__init__({})
+
+    def on_data(self, data):
+        return []
+
+
+def test_kernel_targets_drive_vectorized_engine():
+    start = date(2024, 1, 1)
+    prices = [100.0, 104.0, 111.0, 108.0, 101.0]
+    data = pl.DataFrame(
+        {
+            "date": [start + timedelta(days=i) for i in range(5)],
+            "asset": "A",
+            "close": prices,
+        }
+    )
+    _, _, close = close_matrix(data)
+    entry = np.array([[1.0], [0], [0], [0], [0]])
+    direction, _ = stop_target_exits(close, entry, 0.05, 0.1)
+    backtest = Backtest(
+        NoSignals(),
+        Portfolio(initial_cash=1000, risk_manager=RiskManager(1000)),
+        Execution(
+            commission_model=FlatCommission(0.0),
+            slippage_model=GaussianSlippage(sigma=0.0),
+        ),
+        Performance(),
+        data,
+    )
+    result = backtest.run_vectorized(direction * 5, targets=True)
+    assert result.positions[:, 0].tolist() == [5, 5, 0, 0, 0]
+    assert result.nav[-1] == 1000 + 5 * 11.0
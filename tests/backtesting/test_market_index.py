@@ -0,0 +1,39 @@
+from datetime import date
+
+import numpy as np
+import polars as pl
+
+from backtest_data_module.backtesting.market_index import MarketIndex
+
+
+def _data() -> pl.DataFrame:
+    d = [date(2024, 1, i) for i in range(1, 4)]
+    return pl.DataFrame(
+        {
+            "date": [d[2], d[0], d[1], d[1], d[2]],
+            "asset": ["A", "A", "A", "B", "B"],
+            "close": [12.0, 10.0, 11.0, 50.0, None],
+        }
+    )
+
+
+def test_ranges_and_first_timestamps():
+    index = MarketIndex(_data())
+    assert index.assets == ["A", "B"]
+    assert index.asset_ranges == {"A": slice(0, 3), "B": slice(3, 5)}
+    assert index.first_timestamp("A") == date(2024, 1, 1)
+    assert index.first_timestamp("B") == date(2024, 1, 2)
+    assert index.asset_frame("A")["close"].to_list() == [10.0, 11.0, 12.0]
+    assert index.date_frame(date(2024, 1, 2))["asset"].to_list() == ["A", "B"]
+    assert index.ids(["B", "X"]).tolist() == [1, -1]
+
+
+def test_snapshots_and_as_of_prices():
+    index = MarketIndex(_data())
+    assert index.snapshot(date(2024, 1, 1)) == {"A": {"close": 10.0}}
+    # B 在最後一天沒有有效報價
+    assert index.snapshot(date(2024, 1, 3)) == {"A": {"close": 12.0}}
+    np.testing.assert_array_equal(
+        index.as_of(), [[10.0, 0.0], [11.0, 50.0], [12.0, 50.0]]
+    )
+    assert index.last_prices() == {"A": 12.0, "B": 50.0}
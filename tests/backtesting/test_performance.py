@@ -1,7 +1,15 @@
 import unittest
 import numpy as np
 import pyarrow as pa
-from backtest_data_module.backtesting.performance import Performance, PerformanceSummary
+from backtest_data_module.backtesting.performance import (
+    OnlineMetrics,
+    Performance,
+    PerformanceSummary,
+    batch_metrics,
+    bootstrap_indices,
+    bootstrap_metrics,
+    pad_nav_series,
+)
 
 
 class TestPerformance(unittest.TestCase):
@@ -128,5 +136,112 @@ class TestPerformance(unittest.TestCase):
         self.assertIsInstance(summary.to_arrow(), pa.Table)
 
 
+class TestOnlineMetrics(unittest.TestCase):
+    def _check(self, nav_series):
+        online = OnlineMetrics()
+        for nav in nav_series:
+            online.update(nav)
+        expected = Performance(list(nav_series)).compute_metrics().metrics
+        for key, value in online.compute_metrics().metrics.items():
+            np.testing.assert_allclose(value, expected[key], rtol=1e-9, atol=1e-12)
+
+    def test_matches_batch_metrics(self):
+        self._check([100, 110, 120, 130, 140, 150])
+        self._check([100, 110, 105, 115, 110, 120])
+        self._check([100, 90, 80, 70, 60, 50])
+
+    def test_matches_random_series(self):
+        rng = np.random.default_rng(7)
+        for _ in range(5):
+            nav = 100 * np.cumprod(1 + rng.normal(0, 0.02, 500))
+            self._check(nav.tolist())
+
+    def test_empty_series(self):
+        metrics = OnlineMetrics().compute_metrics().metrics
+        self.assertTrue(all(value == 0 for value in metrics.values()))
+        online = OnlineMetrics()
+        online.update(100)
+        self.assertEqual(online.compute_metrics().metrics["sharpe"], 0.0)
+
+
+class TestBatchMetrics(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.series = [
+            [],
+            [100],
+            [100, 110, 120, 130, 140, 150],
+            [100, 110, 105, 115, 110, 120],
+            [100, 90, 80, 70, 60, 50],
+        ] + [
+            (100 * np.cumprod(1 + rng.normal(0, 0.02, n))).tolist()
+            for n in (50, 300)
+        ]
+
+    def _assert_matches(self, table, row, nav_series):
+        expected = Performance(list(nav_series)).compute_metrics().metrics
+        for key, value in expected.items():
+            np.testing.assert_allclose(table[key][row], value, rtol=1e-9)
+
+    def test_ragged_series_match_performance(self):
+        nav, mask = pad_nav_series(self.series)
+        table = batch_metrics(nav, mask, ids=range(len(self.series)))
+        self.assertEqual(table["series"].to_list(), list(range(len(self.series))))
+        self.assertIsInstance(table.to_arrow(), pa.Table)
+        for row, series in enumerate(self.series):
+            self._assert_matches(table, row, series)
+
+    def test_masked_points_are_skipped(self):
+        nav, mask = pad_nav_series(self.series)
+        mask[-1, ::3] = False
+        table = batch_metrics(nav, mask)
+        self._assert_matches(table, len(self.series) - 1, nav[-1][mask[-1]])
+        # 未指定遮罩時 NaN 視為無效
+        nav[-1, ~mask[-1]] = np.nan
+        np.testing.assert_allclose(
+            batch_metrics(nav[-1:]).row(0), table.row(len(self.series) - 1)
+        )
+
+
+class TestBootstrap(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        nav = 100 * np.cumprod(1 + rng.normal(0.001, 0.01, 250))
+        self.perf = Performance(nav.tolist())
+
+    def test_block_indices_are_contiguous(self):
+        rng = np.random.default_rng(0)
+        idx = bootstrap_indices(20, 50, rng, method="block", block_size=5)
+        self.assertEqual(idx.shape, (50, 20))
+        steps = np.diff(idx.reshape(50, 4, 5), axis=2) % 20
+        self.assertTrue((steps == 1).all())
+
+        idx = bootstrap_indices(20, 50, rng, method="stationary", block_size=5)
+        self.assertEqual(idx.shape, (50, 20))
+        self.assertTrue(((idx >= 0) & (idx < 20)).all())
+        # 平均區塊長度約為 block_size
+        breaks = (np.diff(idx, axis=1) % 20 != 1).mean()
+        self.assertTrue(0.1 < breaks < 0.3)
+
+    def test_seeded_and_independent_of_workers(self):
+        a = bootstrap_metrics(self.perf.returns, 400, seed=3, chunk_size=100)
+        b = bootstrap_metrics(
+            self.perf.returns, 400, seed=3, chunk_size=100, workers=4
+        )
+        self.assertEqual(a.height, 400)
+        self.assertTrue(a.equals(b))
+        c = bootstrap_metrics(self.perf.returns, 400, seed=4, chunk_size=100)
+        self.assertFalse(a.equals(c))
+
+    def test_confidence_intervals_cover_estimate(self):
+        for method in ("stationary", "block", "iid", "normal"):
+            table = self.perf.confidence_intervals(2000, method=method, seed=1)
+            row = table.filter(metric="sharpe").row(0, named=True)
+            self.assertLess(row["lower"], row["estimate"])
+            self.assertLess(row["estimate"], row["upper"])
+        with self.assertRaises(ValueError):
+            bootstrap_metrics(self.perf.returns, 10, method="jackknife")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,22 @@
 import unittest
 
-from backtest_data_module.backtesting.portfolio import Portfolio
+import numpy as np
+
+from backtest_data_module.backtesting.portfolio import (
+    FILL_DTYPE,
+    ColumnarPortfolio,
+    Portfolio,
+    RiskManager,
+)
+
+
+class CashRiskManager(RiskManager):
+    """拒絕會使現金轉負的買進。"""
+
+    def check_risk(self, portfolio, asset, quantity):
+        if quantity > 0 and portfolio.cash < quantity * 100.0:
+            return False
+        return super().check_risk(portfolio, asset, quantity)
 
 
 class TestPortfolio(unittest.TestCase):
@@ -23,6 +39,76 @@ class TestPortfolio(unittest.TestCase):
         pnl = portfolio.get_pnl(market_data)
         self.assertAlmostEqual(pnl, (160 - 150) * 100 + (-50 * 2700 - -50 * 2800))
 
+    def test_columnar_matches_portfolio(self):
+        rng = np.random.default_rng(0)
+        assets = ["A", "B", "C", "D"]
+        batches = [
+            [
+                {
+                    "asset": assets[rng.integers(4)],
+                    "quantity": int(rng.choice([-30, -10, 10, 20, 40])),
+                    "price": float(rng.uniform(50, 150)),
+                    "commission": float(rng.uniform(0, 2)),
+                }
+                for _ in range(rng.integers(1, 12))
+            ]
+            for _ in range(30)
+        ]
+        portfolio = Portfolio(initial_cash=10000, risk_manager=RiskManager(50))
+        columnar = ColumnarPortfolio(
+            initial_cash=10000, risk_manager=RiskManager(50), capacity=4
+        )
+        for batch in batches:
+            expected = portfolio.update(batch)
+            self.assertEqual(columnar.update(batch), expected)
+
+        self.assertEqual(columnar.cash, portfolio.cash)
+        self.assertEqual(columnar.fills, portfolio.fills)
+        for asset, position in portfolio.positions.items():
+            self.assertEqual(columnar.positions[asset].quantity, position.quantity)
+            self.assertAlmostEqual(
+                columnar.positions[asset].realized_pnl, position.realized_pnl
+            )
+        prices = {"A": 90.0, "B": 110.0, "C": 100.0}
+        self.assertAlmostEqual(columnar.get_pnl(prices), portfolio.get_pnl(prices))
+
+    def test_columnar_accepts_structured_fills(self):
+        portfolio = ColumnarPortfolio(
+            initial_cash=1000, risk_manager=RiskManager(15), assets=["A", "B"]
+        )
+        fills = np.array(
+            [(0, 10, 5.0, 0.5), (1, -5, 20.0, 0.0), (0, 10, 6.0, 0.0)],
+            dtype=FILL_DTYPE,
+        )
+        accepted = portfolio.update(fills)
+        # A 的第二筆成交超過部位上限
+        self.assertEqual(accepted["asset_id"].tolist(), [0, 1])
+        self.assertEqual(portfolio.quantity.tolist(), [10.0, -5.0])
+        self.assertEqual(portfolio.cash, 1000 - 50.5 + 100.0)
+        self.assertEqual(len(portfolio.fills_array), 2)
+        self.assertAlmostEqual(
+            portfolio.get_pnl(np.array([7.0, 18.0])), 20.0 + 10.0
+        )
+
+    def test_columnar_custom_risk_sees_updated_cash(self):
+        fills = [
+            {"asset": "A", "quantity": 6, "price": 100.0, "commission": 0.0},
+            {"asset": "B", "quantity": 6, "price": 100.0, "commission": 0.0},
+            {"asset": "A", "quantity": -2, "price": 100.0, "commission": 0.0},
+            {"asset": "B", "quantity": 3, "price": 100.0, "commission": 0.0},
+        ]
+        portfolio = Portfolio(initial_cash=1000, risk_manager=CashRiskManager(50))
+        columnar = ColumnarPortfolio(
+            initial_cash=1000, risk_manager=CashRiskManager(50)
+        )
+        expected = portfolio.update(fills)
+        # 同一批次內第二筆買進須看到第一筆扣款後的現金
+        self.assertEqual([f["asset"] for f in expected], ["A", "A", "B"])
+        self.assertEqual(columnar.update(fills), expected)
+        self.assertEqual(columnar.cash, portfolio.cash)
+        self.assertEqual(columnar.positions["A"].quantity, 4)
+        self.assertEqual(columnar.positions["B"].quantity, 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,236 @@
+from datetime import date, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+from backtest_data_module.backtesting.engine import Backtest
+from backtest_data_module.backtesting.events import SignalEvent
+from backtest_data_module.backtesting.execution import (
+    Execution,
+    FlatCommission,
+    GaussianSlippage,
+    LatencyModel,
+)
+from backtest_data_module.backtesting.indicators import sma
+from backtest_data_module.backtesting.performance import Performance
+from backtest_data_module.backtesting.portfolio import Portfolio, RiskManager
+from backtest_data_module.backtesting.strategies.sma_crossover import SmaCrossover
+from backtest_data_module.backtesting.strategy import (
+    StrategyBase,
+    signal_events,
+    signal_frame,
+)
+from backtest_data_module.backtesting.streaming import StreamingBacktest
+
+
+class ZeroLatency(LatencyModel):
+    def get_delay(self) -> float:
+        return 0
+
+
+class FixedOutput(StrategyBase):
+    def __init__(self, output):
+        super().__init__({})
+        self.output = output
+
+    def on_data(self, data):
+        return self.output
+
+
+def _data(n_days=20, assets=("A", "B")) -> pl.DataFrame:
+    rng = np.random.default_rng(6)
+    start = date(2024, 1, 1)
+    return pl.DataFrame(
+        {
+            "date": [start + timedelta(days=i) for i in range(n_days)] * len(assets),
+            "asset": [a for a in assets for _ in range(n_days)],
+            "close": 100 + rng.normal(0, 1, n_days * len(assets)).cumsum(),
+        }
+    )
+
+
+def _run(strategy, data):
+    backtest = Backtest(
+        strategy,
+        Portfolio(initial_cash=10000, risk_manager=RiskManager(50)),
+        Execution(
+            commission_model=FlatCommission(0.001),
+            slippage_model=GaussianSlippage(seed=4),
+            latency_model=ZeroLatency(),
+        ),
+        Performance(),
+        data,
+    )
+    backtest.run()
+    return backtest
+
+
+def test_signal_frame_matches_signal_events():
+    data = _data()
+    rng = np.random.default_rng(1)
+    dates = data["date"].unique().sort()
+    frame = (
+        pl.DataFrame(
+            {
+                "date": dates.gather(rng.integers(0, len(dates), 30)),
+                "asset": rng.choice(["A", "B"], 30),
+                "quantity": rng.choice([-20, 10, 30], 30).astype(float),
+            }
+        )
+        .unique(["date", "asset"], keep="first", maintain_order=True)
+        .sort("date", "asset")
+    )
+    events = _run(FixedOutput(signal_events(frame)), data)
+    columnar = _run(FixedOutput(frame.to_arrow()), data)
+
+    assert len(events.results["fills"]) > 0
+    assert columnar.results["fills"] == events.results["fills"]
+    assert columnar.results["pnl"] == pytest.approx(events.results["pnl"])
+    np.testing.assert_allclose(
+        columnar.performance.nav_series, events.performance.nav_series
+    )
+
+
+def test_target_frames_and_adapters():
+    data = _data(n_days=4, assets=("A",))
+    dates = data["date"].to_list()
+    targets = pl.DataFrame(
+        {"date": [dates[0], dates[2]], "asset": ["A", "A"], "target": [20.0, 5.0]}
+    )
+    backtest = _run(FixedOutput(targets), data)
+    assert [f["quantity"] for f in backtest.results["fills"]] == [20.0, -15.0]
+
+    legacy = [SignalEvent(asset="A", quantity=10, timestamp=dates[1])]
+    frame = signal_frame(legacy)
+    assert frame.rows() == [(dates[1], "A", 10)]
+    assert signal_events(frame)[0].direction == "long"
+    with pytest.raises(ValueError):
+        signal_frame(pl.DataFrame({"asset": ["A"], "quantity": [1]}))
+    with pytest.raises(ValueError):
+        signal_events(targets)
+
+
+def test_builtin_strategy_columnar_output():
+    data = _data()
+    frame = SmaCrossover(3, 8, columnar=True).on_data(data)
+    assert frame.columns == ["date", "asset", "quantity"]
+
+    # 只在均線狀態改變時下單，累計部位等於 100 乘以當下狀態
+    short, long = pl.col("short"), pl.col("long")
+    states = (
+        SmaCrossover(3, 8)
+        .indicators(data, {"short": sma(3), "long": sma(8)})
+        .select(
+            "date",
+            "asset",
+            pl.when(short > long).then(1).when(short < long).then(-1).otherwise(0)
+            .alias("state"),
+        )
+    )
+    changes = states.filter(
+        pl.col("state") != pl.col("state").shift(1, fill_value=0).over("asset")
+    )
+    assert frame.select("date", "asset").equals(changes.select("date", "asset"))
+    assert frame.height < states.filter(pl.col("state") != 0).height
+    held = frame.with_columns(pl.col("quantity").cum_sum().over("asset"))
+    expected = held.join(states, on=["date", "asset"])
+    assert (expected["quantity"] == expected["state"] * 100).all()
+
+    backtest = _run(FixedOutput(frame), data)
+    assert len(backtest.results["fills"]) > 0
+
+
+def test_dated_signal_events_fill_at_their_timestamp():
+    data = _data(n_days=4, assets=("A",))
+    dates = data["date"].to_list()
+    signals = [
+        SignalEvent(asset="A", quantity=10, timestamp=dates[2]),
+        SignalEvent(asset="A", quantity=5),
+    ]
+    backtest = _run(FixedOutput(signals), data)
+    # 未帶時間的訊號於第一根成交，帶時間的訊號於指定時間成交
+    assert [f["quantity"] for f in backtest.results["fills"]] == [5, 10]
+
+
+class RecordingRisk(RiskManager):
+    def __init__(self):
+        super().__init__(1000)
+        self.checked = []
+
+    def check_risk(self, portfolio, asset, quantity):
+        self.checked.append((asset, quantity))
+        return quantity < 0
+
+
+def test_run_sends_signal_frames_through_portfolio():
+    data = _data()
+    frame = SmaCrossover(3, 8, columnar=True).on_data(data)
+    backtest = _run(FixedOutput(frame), data)
+    held = {a: p.quantity for a, p in backtest.portfolio.positions.items()}
+    expected = frame.group_by("asset").agg(pl.col("quantity").sum())
+    assert held == dict(expected.iter_rows())
+    assert backtest.portfolio.fills == backtest.results["fills"]
+
+    # 自訂風控逐筆檢查，只允許賣出
+    risk = RecordingRisk()
+    portfolio = Portfolio(initial_cash=10000, risk_manager=risk)
+    Backtest(
+        FixedOutput(frame),
+        portfolio,
+        Execution(latency_model=ZeroLatency()),
+        Performance(),
+        data,
+    ).run()
+    assert len(risk.checked) == frame.height
+    assert all(f["quantity"] < 0 for f in portfolio.fills)
+
+
+def test_run_targets_account_for_existing_positions():
+    data = _data(n_days=4, assets=("A",))
+    dates = data["date"].to_list()
+    portfolio = Portfolio(initial_cash=10000)
+    portfolio.update(
+        [{"asset": "A", "quantity": 5.0, "price": 100.0, "commission": 0.0}]
+    )
+    targets = pl.DataFrame({"date": [dates[1]], "asset": ["A"], "target": [20.0]})
+    Backtest(
+        FixedOutput(targets),
+        portfolio,
+        Execution(latency_model=ZeroLatency()),
+        Performance(),
+        data,
+    ).run()
+    assert [f["quantity"] for f in portfolio.fills[1:]] == [15.0]
+    assert portfolio.positions["A"].quantity == 20.0
+
+
+class TargetOnBar(StrategyBase):
+    def __init__(self):
+        super().__init__({})
+
+    def on_data(self, data):
+        return []
+
+    def on_bar(self, timestamp, bar, window):
+        target = 10.0 if bar["close"][0] > 100 else 0.0
+        return pl.DataFrame(
+            {"date": [timestamp], "asset": ["A"], "target": [target]}
+        )
+
+
+def test_streaming_accepts_target_frames():
+    data = _data(n_days=15, assets=("A",))
+    backtest = StreamingBacktest(
+        TargetOnBar(),
+        Portfolio(initial_cash=10000),
+        Execution(latency_model=ZeroLatency()),
+        Performance(),
+        [data],
+    )
+    backtest.run()
+    quantities = [f["quantity"] for f in backtest.results["fills"]]
+    held = np.cumsum(quantities)
+    assert set(held) <= {0.0, 10.0}
+    expected = (data["close"] > 100).cast(pl.Float64) * 10
+    assert held[-1] == expected[-1]
@@ -0,0 +1,192 @@
+from datetime import date, timedelta
+
+import numpy as np
+import polars as pl
+
+from backtest_data_module.backtesting.engine import Backtest
+from backtest_data_module.backtesting.events import SignalEvent
+from backtest_data_module.backtesting.execution import (
+    Execution,
+    FlatCommission,
+    GaussianSlippage,
+    LatencyModel,
+)
+from backtest_data_module.backtesting.performance import Performance
+from backtest_data_module.backtesting.portfolio import Portfolio, RiskManager
+from backtest_data_module.backtesting.strategy import StrategyBase
+from backtest_data_module.backtesting.streaming import BarWindow, StreamingBacktest
+from backtest_data_module.data_handler import DataHandler
+from backtest_data_module.data_storage import (
+    DuckHot,
+    HybridStorageManager,
+    S3Cold,
+    TableLayout,
+    TimescaleWarm,
+)
+from backtest_data_module.data_storage.catalog import Catalog
+
+
+class ZeroLatency(LatencyModel):
+    def get_delay(self) -> float:
+        return 0
+
+
+class Momentum(StrategyBase):
+    """收盤價高於前一根時買進，低於時賣出。"""
+
+    lookback = 2
+
+    def __init__(self):
+        super().__init__({})
+        self.max_window = 0
+
+    def on_data(self, data):
+        signals = []
+        data = data.sort("date").with_columns(
+            pl.col("close").diff().over("asset").alias("change")
+        )
+        for row in data.iter_rows(named=True):
+            quantity = self._quantity(row["change"])
+            if quantity:
+                signals.append(
+                    SignalEvent(
+                        asset=row["asset"], quantity=quantity, timestamp=row["date"]
+                    )
+                )
+        return signals
+
+    def on_bar(self, timestamp, bar, window):
+        self.max_window = max(self.max_window, len(window))
+        signals = []
+        for asset in bar["asset"].to_list():
+            closes = window.closes(asset)
+            if len(closes) == 2:
+                quantity = self._quantity(closes[1] - closes[0])
+                if quantity:
+                    signals.append(SignalEvent(asset=asset, quantity=quantity))
+        return signals
+
+    @staticmethod
+    def _quantity(change):
+        if change is None or change == 0:
+            return 0
+        return 10 if change > 0 else -10
+
+
+def _data(n_days=30, assets=("A", "B", "C")) -> pl.DataFrame:
+    rng = np.random.default_rng(5)
+    start = date(2024, 1, 1)
+    return (
+        pl.DataFrame(
+            {
+                "date": [start + timedelta(days=i) for i in range(n_days)]
+                * len(assets),
+                "asset": [a for a in assets for _ in range(n_days)],
+                "close": 100 + rng.normal(0, 1, n_days * len(assets)).cumsum(),
+            }
+        )
+        .sort(["date", "asset"])
+    )
+
+
+def _parts():
+    return (
+        Portfolio(initial_cash=10000, risk_manager=RiskManager(30)),
+        Execution(
+            commission_model=FlatCommission(0.001),
+            slippage_model=GaussianSlippage(seed=11),
+            latency_model=ZeroLatency(),
+        ),
+        Performance(),
+    )
+
+
+def test_streaming_matches_event_engine():
+    data = _data()
+    event_bt = Backtest(Momentum(), *_parts(), data)
+    event_bt.run()
+
+    strategy = Momentum()
+    # 每批 4 筆，同一天的資料會被切到不同批次
+    source = data.to_arrow().to_batches(max_chunksize=4)
+    stream_bt = StreamingBacktest(strategy, *_parts(), source)
+    stream_bt.run()
+
+    assert len(event_bt.results["fills"]) > 10
+    assert stream_bt.results["fills"] == event_bt.results["fills"]
+    assert stream_bt.results["pnl"] == event_bt.results["pnl"]
+    np.testing.assert_allclose(
+        stream_bt.performance.nav_series, event_bt.performance.nav_series
+    )
+    assert strategy.max_window == 2
+
+
+def test_online_metrics_without_nav_series():
+    data = _data()
+    stored = StreamingBacktest(Momentum(), *_parts(), data.to_arrow().to_batches(5))
+    stored.run()
+    online = StreamingBacktest(
+        Momentum(), *_parts(), data.to_arrow().to_batches(5), store_nav=False
+    )
+    online.run()
+
+    assert online.performance.nav_series == []
+    expected = stored.results["performance"].metrics
+    for key, value in online.results["performance"].metrics.items():
+        np.testing.assert_allclose(value, expected[key], rtol=1e-9, atol=1e-12)
+
+
+def test_from_storage_streams_batches():
+    manager = HybridStorageManager(
+        hot_store=DuckHot(),
+        warm_store=TimescaleWarm(),
+        cold_store=S3Cold(),
+        catalog=Catalog(),
+        hot_capacity=10,
+        config_path="missing.yaml",
+    )
+    data = _data(n_days=10)
+    manager.write(data, "bars")
+    handler = DataHandler(manager)
+    assert [b.num_rows for b in handler.iter_batches("bars", batch_size=7)] == [
+        7, 7, 7, 7, 2
+    ]
+
+    stream_bt = StreamingBacktest.from_storage(
+        Momentum(), *_parts(), handler, "bars", batch_size=7
+    )
+    stream_bt.run()
+    assert len(stream_bt.performance.nav_series) == 10
+
+
+def test_from_storage_sorts_clustered_table():
+    manager = HybridStorageManager(
+        hot_store=DuckHot(),
+        warm_store=TimescaleWarm(),
+        cold_store=S3Cold(),
+        catalog=Catalog(),
+        hot_capacity=10,
+        config_path="missing.yaml",
+    )
+    # 與 storage.yaml 的 bars_* 相同，寫入時依 asset、date 分群
+    manager.set_layout("bars_*", TableLayout(cluster_by=["asset", "date"]))
+    data = _data()
+    manager.write(data, "bars_1d")
+    assert manager.read("bars_1d")["asset"].to_list()[:2] == ["A", "A"]
+
+    event_bt = Backtest(Momentum(), *_parts(), data)
+    event_bt.run()
+    stream_bt = StreamingBacktest.from_storage(
+        Momentum(), *_parts(), DataHandler(manager), "bars_1d", batch_size=7
+    )
+    stream_bt.run()
+    assert stream_bt.results["fills"] == event_bt.results["fills"]
+
+
+def test_bar_window_keeps_lookback():
+    window = BarWindow(2)
+    for i in range(3):
+        window.append(pl.DataFrame({"asset": ["A"], "close": [float(i)]}))
+    assert window.full
+    assert window.frame()["close"].to_list() == [1.0, 2.0]
+    assert window.closes("A").tolist() == [1.0, 2.0]
@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+
+import numpy as np
+import polars as pl
+
+from backtest_data_module.backtesting.execution import FlatCommission, GaussianSlippage
+from backtest_data_module.backtesting.sweep import (
+    ParameterSweep,
+    parameter_grid,
+    rolling_means,
+    sma_crossover_targets,
+)
+from backtest_data_module.backtesting.vectorized import VectorizedBacktest
+
+
+def _data(n_days=60, assets=("A", "B")) -> pl.DataFrame:
+    rng = np.random.default_rng(3)
+    start = date(2024, 1, 1)
+    return pl.DataFrame(
+        {
+            "date": [start + timedelta(days=i) for i in range(n_days)] * len(assets),
+            "asset": [a for a in assets for _ in range(n_days)],
+            "close": 100 + rng.normal(0, 1, n_days * len(assets)).cumsum(),
+        }
+    )
+
+
+def test_rolling_means_match_polars():
+    data = _data().sort(["asset", "date"])
+    sweep = ParameterSweep(data)
+    means = rolling_means(sweep.close, [3, 10])
+    expected = data.filter(pl.col("asset") == "B")["close"].rolling_mean(10)
+    np.testing.assert_allclose(means[1, :, 1], expected.to_numpy(), equal_nan=True)
+    assert np.isnan(means[0, :2]).all()
+
+
+def test_sweep_matches_vectorized_backtest_per_combination():
+    data = _data()
+    grid = {"short_window": [2, 5], "long_window": [10, 20, 30]}
+    sweep = ParameterSweep(
+        data, initial_cash=10000, commission_model=FlatCommission(0.001), chunk_size=4
+    )
+    table = sweep.run(grid)
+    assert table.height == 6
+    assert table.select(["short_window", "long_window"]).rows() == [
+        (c["short_window"], c["long_window"]) for c in parameter_grid(grid)
+    ]
+
+    for row in table.iter_rows(named=True):
+        params = {
+            "short_window": np.array([row["short_window"]]),
+            "long_window": np.array([row["long_window"]]),
+        }
+        targets = sma_crossover_targets(params, sweep)[0]
+        result = VectorizedBacktest(
+            data,
+            initial_cash=10000,
+            commission_model=FlatCommission(0.001),
+            slippage_model=GaussianSlippage(sigma=0.0),
+        ).run(targets, targets=True)
+        assert np.isclose(row["final_nav"], result.nav[-1])
+        assert row["trades"] == len(result.fills)
+        peak = np.maximum.accumulate(result.nav)
+        assert np.isclose(row["max_drawdown"], ((result.nav - peak) / peak).min())
+
+
+def test_chunk_size_from_memory_budget():
+    data = _data()
+    sweep = ParameterSweep(data, max_bytes=1)
+    assert sweep.chunk_size == 1
+    table = sweep.run([{"short_window": 3, "long_window": 8}])
+    assert table["trades"][0] > 0
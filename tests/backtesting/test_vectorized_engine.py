@@ -0,0 +1,221 @@
+from datetime import date, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+from backtest_data_module.backtesting.engine import Backtest
+from backtest_data_module.backtesting.events import SignalEvent
+from backtest_data_module.backtesting.execution import (
+    Execution,
+    FlatCommission,
+    GaussianSlippage,
+    LatencyModel,
+)
+from backtest_data_module.backtesting.performance import Performance
+from backtest_data_module.backtesting.portfolio import (
+    ColumnarPortfolio,
+    Portfolio,
+    RiskManager,
+)
+from backtest_data_module.backtesting.strategy import StrategyBase
+from backtest_data_module.backtesting.vectorized import VectorizedBacktest
+
+
+class ZeroLatency(LatencyModel):
+    def get_delay(self) -> float:
+        return 0
+
+
+class ListStrategy(StrategyBase):
+    def __init__(self, signals):
+        super().__init__({})
+        self.signals = signals
+
+    def on_data(self, data):
+        return list(self.signals)
+
+
+def _data(n_days: int = 40, assets=("A", "B", "C"), seed: int = 0) -> pl.DataFrame:
+    rng = np.random.default_rng(seed)
+    start = date(2024, 1, 1)
+    frames = []
+    for asset in assets:
+        prices = 100 + np.cumsum(rng.normal(0, 1, n_days))
+        frames.append(
+            pl.DataFrame(
+                {
+                    "date": [start + timedelta(days=i) for i in range(n_days)],
+                    "asset": asset,
+                    "close": prices,
+                }
+            )
+        )
+    return pl.concat(frames)
+
+
+def _backtest(data, signals=(), limit=100, portfolio_cls=Portfolio):
+    return Backtest(
+        ListStrategy(signals),
+        portfolio_cls(initial_cash=100000, risk_manager=RiskManager(limit)),
+        Execution(
+            commission_model=FlatCommission(0.001),
+            slippage_model=GaussianSlippage(seed=7),
+            latency_model=ZeroLatency(),
+        ),
+        Performance(),
+        data,
+    )
+
+
+@pytest.mark.parametrize("limit", [100, 10_000])
+def test_matches_event_engine_for_market_orders(limit):
+    data = _data()
+    rng = np.random.default_rng(1)
+    engine = VectorizedBacktest(data)
+    orders = rng.choice([-60, -20, 0, 0, 0, 30, 50], size=engine.close.shape)
+
+    signals = [
+        SignalEvent(
+            asset=engine.assets[j],
+            quantity=int(orders[i, j]),
+            timestamp=engine.dates[int(i)],
+        )
+        for i, j in zip(*np.nonzero(orders))
+    ]
+    event_bt = _backtest(data, signals, limit)
+    event_bt.run()
+
+    vector_bt = _backtest(data, limit=limit)
+    result = vector_bt.run_vectorized(orders)
+
+    assert vector_bt.results["fills"] == event_bt.results["fills"]
+    assert vector_bt.results["pnl"] == pytest.approx(event_bt.results["pnl"])
+    assert result.cash[-1] == pytest.approx(event_bt.portfolio.cash)
+    np.testing.assert_allclose(event_bt.performance.nav_series, result.nav)
+    for j, asset in enumerate(result.assets):
+        position = event_bt.portfolio.positions.get(asset)
+        expected = position.quantity if position else 0
+        assert result.positions[-1, j] == expected
+    if limit == 100:
+        assert len(result.fills) < np.count_nonzero(orders)
+
+
+def test_targets_nav_and_long_form_signals():
+    data = _data(n_days=5, assets=("A", "B"))
+    engine = VectorizedBacktest(
+        data,
+        initial_cash=1000.0,
+        commission_model=FlatCommission(0.0),
+        slippage_model=GaussianSlippage(sigma=0.0),
+    )
+    targets = np.array(
+        [[10, 0], [10, 5], [np.nan, 5], [0, 5], [0, 0]], dtype=float
+    )
+    result = engine.run(targets, targets=True)
+    assert result.positions[:, 0].tolist() == [10, 10, 10, 0, 0]
+    assert result.positions[:, 1].tolist() == [0, 5, 5, 5, 0]
+    expected_nav = result.cash + (result.positions * engine.close).sum(axis=1)
+    np.testing.assert_allclose(result.nav, expected_nav)
+    # 無成本時 NAV 變化等於持有部位的價格變化
+    np.testing.assert_allclose(
+        np.diff(result.nav),
+        (result.positions[:-1] * np.diff(engine.close, axis=0)).sum(axis=1),
+    )
+
+    long_form = pl.DataFrame(
+        {
+            "date": [engine.dates[0], engine.dates[3]],
+            "asset": ["A", "A"],
+            "quantity": [10.0, -10.0],
+        }
+    )
+    same = engine.run(long_form)
+    assert same.positions[:, 0].tolist() == [10, 10, 10, 0, 0]
+    with pytest.raises(ValueError):
+        engine.run(np.zeros((2, 2)))
+
+
+def test_target_change_without_quote_fills_on_next_quote():
+    day = [date(2024, 1, d) for d in range(1, 6)]
+    data = pl.DataFrame(
+        {
+            "date": [day[i] for i in (0, 1, 3, 4)] + day,
+            "asset": ["A"] * 4 + ["B"] * 5,
+            "close": [10.0, 11.0, 12.0, 13.0] + [50.0] * 5,
+        }
+    )
+    # A 在第 3 期沒有報價，該期的目標改變須於下一根有報價的 K 線成交
+    targets = np.array(
+        [[10, 0], [np.nan, 0], [20, 0], [np.nan, 0], [12, 0]], dtype=float
+    )
+    cases = [
+        (None, [10, 10, 10, 20, 12], [10, 10, -8]),
+        # 超過上限的 +10 被拒絕，之後以實際部位換算為 +2
+        (15, [10, 10, 10, 10, 12], [10, 2]),
+    ]
+    for limit, positions, fills in cases:
+        engine = VectorizedBacktest(
+            data,
+            initial_cash=1000.0,
+            commission_model=FlatCommission(0.0),
+            slippage_model=GaussianSlippage(sigma=0.0),
+            position_limit=limit,
+        )
+        result = engine.run(targets, targets=True)
+        assert result.positions[:, 0].tolist() == positions
+        assert result.fills["quantity"].to_list() == fills
+
+
+def test_event_engine_nav_marks_positions_as_of_each_date():
+    day = [date(2024, 1, d) for d in range(1, 5)]
+    data = pl.DataFrame(
+        {
+            "date": day + [day[0], day[2], day[3]],
+            "asset": ["A"] * 4 + ["B"] * 3,
+            "close": [10.0, 11.0, 12.0, 9.0, 50.0, 55.0, 60.0],
+        }
+    )
+    signals = [
+        SignalEvent(asset="A", quantity=10, timestamp=day[1]),
+        SignalEvent(asset="B", quantity=2, timestamp=day[0]),
+        SignalEvent(asset="A", quantity=-10, timestamp=day[3]),
+    ]
+    backtest = Backtest(
+        ListStrategy(signals),
+        Portfolio(initial_cash=1000),
+        Execution(
+            commission_model=FlatCommission(0.0),
+            slippage_model=GaussianSlippage(sigma=0.0),
+            latency_model=ZeroLatency(),
+        ),
+        Performance(),
+        data,
+    )
+    backtest.run()
+    # B 在第 2 期沒有報價，沿用第 1 期的 50
+    assert backtest.performance.nav_series == [1000.0, 1000.0, 1020.0, 1000.0]
+
+
+def test_event_engine_with_columnar_portfolio():
+    data = _data(n_days=20)
+    rng = np.random.default_rng(2)
+    dates = data["date"].unique().sort()
+    signals = [
+        SignalEvent(
+            asset=str(rng.choice(["A", "B", "C"])),
+            quantity=int(rng.choice([-40, -20, 30, 50])),
+            timestamp=dates[int(rng.integers(len(dates)))],
+        )
+        for _ in range(60)
+    ]
+    expected = _backtest(data, signals)
+    expected.run()
+    columnar = _backtest(data, signals, portfolio_cls=ColumnarPortfolio)
+    columnar.run()
+
+    assert columnar.results["fills"] == expected.results["fills"]
+    assert columnar.results["pnl"] == pytest.approx(expected.results["pnl"])
+    np.testing.assert_allclose(
+        columnar.performance.nav_series, expected.performance.nav_series
+    )
@@ -1,7 +1,16 @@
 import unittest
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
 
 from backtest_data_module.data_processing.cross_validation import (
+    assemble_cpcv_paths,
     combinatorial_purged_cv,
+    cpcv_path_map,
+    deflated_sharpe_ratio,
+    probability_of_backtest_overfitting,
+    run_cpcv,
     walk_forward_split,
 )
 
@@ -44,5 +53,104 @@ class TestWalkForwardSplit(unittest.TestCase):
         self.assertEqual(splits, expected)
 
 
+class TestCPCVPaths(unittest.TestCase):
+    def test_path_map_covers_each_fold_once(self):
+        path_map = cpcv_path_map(6, 2)
+        # φ = C(5, 1) = 5
+        self.assertEqual(path_map.shape, (5, 6))
+        combos = list(combinations(range(6), 2))
+        for fold in range(6):
+            used = path_map[:, fold]
+            self.assertEqual(len(set(used)), 5)
+            self.assertTrue(all(fold in combos[c] for c in used))
+        # 每個組合的兩折各分配給一條路徑
+        self.assertEqual(np.bincount(path_map.ravel()).tolist(), [2] * 15)
+
+    def test_assemble_paths_from_combo_returns(self):
+        n_samples = 14
+        splits = list(combinatorial_purged_cv(4, n_samples, 2, 0))
+        # 以 組合索引 * 100 + 樣本索引 作為報酬，方便檢查來源
+        combo_returns = [
+            np.array(test, dtype=float) + 100 * c
+            for c, (_, test) in enumerate(splits)
+        ]
+        paths = assemble_cpcv_paths(combo_returns, 4, 2, n_samples)
+        self.assertEqual(paths.shape, (3, n_samples))
+        np.testing.assert_array_equal(paths % 100, np.tile(np.arange(14), (3, 1)))
+        # 最後一折包含餘數樣本
+        self.assertEqual(len(set(paths[0, 9:] // 100)), 1)
+
+    def test_run_cpcv_collects_paths(self):
+        data = pd.DataFrame({"feature": np.arange(60)})
+        result = run_cpcv(
+            data,
+            lambda train, test: pd.Series(100.0 + np.arange(len(test))),
+            n_splits=6,
+            n_test_splits=2,
+            embargo_pct=0.0,
+        )
+        self.assertEqual(len(result.results), 15)
+        paths = result.paths()
+        self.assertEqual(paths.shape, (5, 60))
+        self.assertFalse(np.isnan(paths).any())
+        # 報酬以前一期 NAV 為分母，第一筆為 0
+        nav = 100.0 + np.arange(20)
+        expected = np.concatenate([[0.0], 1.0 / nav[:-1]])
+        np.testing.assert_allclose(result.returns[0], expected)
+        np.testing.assert_allclose(paths[0, :20], expected)
+
+    def test_run_cpcv_warns_when_navs_missing(self):
+        data = pd.DataFrame({"feature": np.arange(12)})
+        with self.assertWarns(UserWarning):
+            result = run_cpcv(
+                data, lambda train, test: None, 4, 2, embargo_pct=0.0
+            )
+        with self.assertRaises(ValueError):
+            result.paths()
+
+
+class TestOverfitting(unittest.TestCase):
+    def test_pbo_noise_and_skill(self):
+        rng = np.random.default_rng(0)
+        noise = rng.normal(0, 1, (200, 10))
+        result = probability_of_backtest_overfitting(noise)
+        self.assertEqual(len(result.logits), 252)  # C(10, 5)
+        # 純雜訊下樣本內最佳的設定在樣本外沒有優勢
+        self.assertGreater(result.pbo, 0.2)
+
+        skill = noise + np.linspace(0, 5, 200)[:, None]
+        self.assertEqual(probability_of_backtest_overfitting(skill).pbo, 0.0)
+
+        with self.assertRaises(ValueError):
+            probability_of_backtest_overfitting(noise[:1])
+
+    def test_pbo_matches_loop(self):
+        rng = np.random.default_rng(2)
+        perf = rng.normal(0, 1, (7, 6))
+        result = probability_of_backtest_overfitting(perf)
+        logits = []
+        for is_blocks in combinations(range(6), 3):
+            oos_blocks = [b for b in range(6) if b not in is_blocks]
+            best = perf[:, is_blocks].mean(axis=1).argmax()
+            oos = perf[:, oos_blocks].mean(axis=1)
+            omega = (oos <= oos[best]).sum() / 8
+            logits.append(np.log(omega / (1 - omega)))
+        np.testing.assert_allclose(result.logits, logits)
+        self.assertAlmostEqual(result.pbo, np.mean(np.array(logits) <= 0))
+
+    def test_deflated_sharpe(self):
+        rng = np.random.default_rng(1)
+        returns = rng.normal(0, 0.01, (100, 500))
+        returns[0] += 0.004
+        dsr = deflated_sharpe_ratio(returns)
+        self.assertEqual(dsr.shape, (100,))
+        self.assertGreater(dsr[0], 0.95)
+        self.assertLess(np.median(dsr[1:]), 0.05)
+        # 試驗越多，基準越高
+        self.assertLess(
+            deflated_sharpe_ratio(returns, n_trials=10_000)[0], dsr[0]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,91 @@
+from datetime import date
+
+import polars as pl
+import pytest
+
+from backtest_data_module.data_storage import (
+    Catalog,
+    CompactionService,
+    HybridStorageManager,
+)
+
+
+def _fragment(asset: str, day: int) -> pl.DataFrame:
+    return pl.DataFrame(
+        {"date": [date(2024, 1, day)], "asset": [asset], "close": [float(day)]}
+    )
+
+
+@pytest.fixture
+def manager():
+    return HybridStorageManager(catalog=Catalog(), warm_capacity=100)
+
+
+def test_compact_merges_sorted_parts(manager):
+    for day in (3, 1, 2):
+        for asset in ("MSFT", "AAPL"):
+            manager.write(_fragment(asset, day), f"{asset}_{day}", tier="cold")
+
+    service = CompactionService(manager, target_rows=4)
+    result = service.compact("*_*", "bars", tier="cold")
+
+    assert len(result.fragments) == 6
+    assert result.parts == ["bars__part00000", "bars__part00001"]
+    first = manager.read("bars__part00000", tiers=["cold"])
+    assert first["asset"].to_list() == ["AAPL", "AAPL", "AAPL", "MSFT"]
+    assert first["close"].to_list() == [1.0, 2.0, 3.0, 1.0]
+    assert manager.catalog.get("AAPL_1").tier == "compacted"
+
+
+def test_compacted_names_read_from_parts(manager):
+    for day in (3, 1, 2):
+        for asset in ("MSFT", "AAPL"):
+            manager.write(_fragment(asset, day), f"{asset}_{day}", tier="cold")
+    CompactionService(manager, target_rows=4).compact("*_*", "bars", tier="cold")
+
+    # 合併目標解析為全部分段，原片段名稱解析為分段中該片段的資料
+    assert manager.read("bars").height == 6
+    assert manager.scan("bars").select(pl.len()).collect().item() == 6
+    fragment = manager.read("MSFT_2")
+    assert fragment.to_dicts() == _fragment("MSFT", 2).to_dicts()
+    batches = list(manager.read_batches("MSFT_2", columns=["close"]))
+    assert [b.column("close").to_pylist() for b in batches] == [[2.0]]
+    assert manager.schema("bars") == fragment.schema
+    with pytest.raises(KeyError):
+        manager.read("missing")
+
+
+def test_parts_sized_by_bytes(manager):
+    for day in range(1, 11):
+        manager.write(_fragment("AAPL", day), f"AAPL_{day}", tier="cold")
+    row_bytes = _fragment("AAPL", 1).estimated_size()
+    service = CompactionService(manager, target_bytes=row_bytes * 4)
+    result = service.compact("AAPL_*", "aapl", tier="cold")
+    assert [manager.catalog.get(p).row_count for p in result.parts] == [4, 4, 2]
+    with pytest.raises(ValueError):
+        CompactionService(manager, target_bytes=0)
+
+
+def test_compact_is_incremental(manager):
+    manager.write(_fragment("AAPL", 1), "AAPL_1", tier="warm")
+    service = CompactionService(manager, target_rows=3)
+    service.compact("AAPL_*", "aapl", tier="warm")
+
+    manager.write(_fragment("AAPL", 2), "AAPL_2", tier="warm")
+    result = service.compact("AAPL_*", "aapl", tier="warm")
+
+    assert result.fragments == ["AAPL_2"]
+    assert result.parts == ["aapl__part00000"]
+    part = manager.read("aapl__part00000", tiers=["warm"])
+    assert part["close"].to_list() == [1.0, 2.0]
+    assert manager.catalog.get("aapl__part00000").row_count == 2
+
+    assert service.compact("AAPL_*", "aapl", tier="warm").fragments == []
+
+
+def test_compact_dry_run(manager):
+    manager.write(_fragment("AAPL", 1), "AAPL_1", tier="cold")
+    result = CompactionService(manager).compact("AAPL_*", "aapl", dry_run=True)
+    assert result.fragments == ["AAPL_1"]
+    assert result.parts == []
+    assert manager.catalog.get("AAPL_1").tier == "cold"
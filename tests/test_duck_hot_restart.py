@@ -0,0 +1,49 @@
+import polars as pl
+import yaml
+
+from backtest_data_module.data_storage import Catalog, DuckHot, HybridStorageManager
+
+
+def test_duck_hot_reloads_tables(tmp_path):
+    path = str(tmp_path / "hot.duckdb")
+    hot = DuckHot(path, memory_limit="256MB", threads=1)
+    df = pl.DataFrame({"a": [1, 2]})
+    hot.write(df, "tbl")
+    hot.close()
+
+    restarted = DuckHot(path)
+    assert restarted._tables == {"tbl"}
+    assert restarted.read("tbl").equals(df)
+
+
+def test_checkpoint_interval(tmp_path):
+    hot = DuckHot(str(tmp_path / "hot.duckdb"), checkpoint_interval=0)
+    before = hot._last_checkpoint
+    hot.write(pl.DataFrame({"a": [1]}), "tbl")
+    assert hot._last_checkpoint > before
+
+
+def test_manager_restores_lru_from_catalog(tmp_path):
+    cfg = {
+        "duckdb_path": str(tmp_path / "hot.duckdb"),
+        "duckdb_memory_limit": "256MB",
+        "duckdb_threads": 1,
+        "duckdb_temp_directory": str(tmp_path / "spill"),
+        "catalog_path": str(tmp_path / "catalog.db"),
+        "hot_capacity": 2,
+    }
+    cfg_path = tmp_path / "storage.yaml"
+    cfg_path.write_text(yaml.dump(cfg), encoding="utf-8")
+
+    manager = HybridStorageManager(config_path=str(cfg_path))
+    manager.write(pl.DataFrame({"a": [1]}), "t1", tier="hot")
+    manager.write(pl.DataFrame({"b": [2]}), "t2", tier="hot")
+    manager.hot_store.close()
+
+    restarted = HybridStorageManager(config_path=str(cfg_path))
+    assert list(restarted._hot_lru) == ["t1", "t2"]
+    assert restarted.read("t2", tiers=["hot"])["b"].to_list() == [2]
+
+    restarted.write(pl.DataFrame({"c": [3]}), "t3", tier="hot")
+    assert "t1" not in restarted.hot_store._tables
+    assert Catalog(cfg["catalog_path"]).get("t1").tier == "warm"
@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+
+import polars as pl
+import pytest
+
+from backtest_data_module.data_storage import (
+    DuckHot,
+    FlightStorageBackend,
+    HybridStorageManager,
+    S3Cold,
+    StorageFlightServer,
+    TimescaleWarm,
+)
+from backtest_data_module.data_storage.catalog import Catalog
+from backtest_data_module.data_storage.flight import (
+    decode_ticket,
+    encode_ticket,
+    filters_to_expr,
+)
+
+
+@pytest.fixture
+def server_and_client():
+    manager = HybridStorageManager(
+        hot_store=DuckHot(),
+        warm_store=TimescaleWarm(),
+        cold_store=S3Cold(),
+        catalog=Catalog(),
+        hot_capacity=10,
+        config_path="missing.yaml",
+    )
+    server = StorageFlightServer(manager, "grpc://127.0.0.1:0")
+    client = FlightStorageBackend(f"grpc://127.0.0.1:{server.port}")
+    yield manager, server, client
+    server.shutdown()
+
+
+def _bars() -> pl.DataFrame:
+    start = date(2024, 1, 1)
+    return pl.DataFrame(
+        {
+            "date": [start + timedelta(days=i % 10) for i in range(30)],
+            "asset": ["A", "B", "C"] * 10,
+            "close": [float(i) for i in range(30)],
+        }
+    )
+
+
+def test_ticket_roundtrip_keeps_dates():
+    ticket = encode_ticket(
+        "bars",
+        columns=["close"],
+        filters=[("date", ">=", date(2024, 1, 5)), ("asset", "in", ["A"])],
+    )
+    request = decode_ticket(ticket)
+    assert request["filters"][0] == ("date", ">=", date(2024, 1, 5))
+    df = _bars().filter(filters_to_expr(request["filters"]))
+    assert set(df["asset"]) == {"A"}
+    with pytest.raises(ValueError):
+        filters_to_expr([("close", "~", 1)])
+
+
+def test_read_projection_and_filters_over_loopback(server_and_client):
+    manager, _, client = server_and_client
+    df = _bars()
+    manager.write(df, "bars")
+
+    assert client.read("bars").equals(df)
+    assert client.list_tables() == ["bars"]
+    # 只讀取結構的 list_flights 不計入存取次數
+    assert manager.compute_7day_hits()["bars"] == 1
+    result = client.read_arrow(
+        "bars",
+        columns=["asset", "close"],
+        filters=[("asset", "==", "B"), ("date", "<", date(2024, 1, 4))],
+    )
+    assert result.column_names == ["asset", "close"]
+    assert result.column("close").to_pylist() == [1.0, 10.0, 22.0]
+    with pytest.raises(KeyError):
+        client.read("missing")
+
+
+def test_read_batches_streams_in_chunks(server_and_client):
+    manager, _, client = server_and_client
+    manager.write(_bars(), "bars")
+    batches = list(client.read_batches("bars", batch_size=8))
+    assert [b.num_rows for b in batches] == [8, 8, 8, 6]
+    assert sum(b.num_rows for b in manager.read_batches("bars", batch_size=8)) == 30
+    sorted_batches = client.read_batches(
+        "bars",
+        columns=["close"],
+        predicate=(pl.col("asset") != "C") & (pl.col("close") % 2 == 0),
+        sort_by=["date"],
+    )
+    closes = [v for b in sorted_batches for v in b.column("close").to_pylist()]
+    assert closes == [0.0, 10.0, 12.0, 22.0, 4.0, 24.0, 6.0, 16.0, 18.0, 28.0]
+
+
+def test_scan_pushes_projection_to_server(server_and_client):
+    manager, _, client = server_and_client
+    manager.write(_bars(), "bars")
+    out = (
+        client.scan("bars")
+        .filter(pl.col("close") > 25)
+        .select("close")
+        .collect()
+    )
+    assert out["close"].to_list() == [26.0, 27.0, 28.0, 29.0]
+    assert client.scan("bars").head(5).collect().height == 5
+
+
+def test_scan_sends_filters_and_streams_uncached(server_and_client, monkeypatch):
+    manager, _, client = server_and_client
+    manager.write(_bars(), "bars")
+    tickets = []
+    reader = client._reader
+
+    def record(table, **kwargs):
+        tickets.append(kwargs)
+        return reader(table, **kwargs)
+
+    def forbid(*args, **kwargs):
+        raise AssertionError("未快取的請求應逐批讀取")
+
+    monkeypatch.setattr(client, "_reader", record)
+    monkeypatch.setattr(manager, "read_arrow", forbid)
+    out = (
+        client.scan("bars")
+        .filter((pl.col("asset") == "B") & (pl.col("close") * 2 > 30))
+        .select("close")
+        .collect()
+    )
+    assert out["close"].to_list() == [16.0, 19.0, 22.0, 25.0, 28.0]
+    assert tickets[-1]["filters"] == [("asset", "==", "B")]
+
+
+def test_cache_invalidated_by_new_versions(server_and_client):
+    manager, server, client = server_and_client
+    manager.write(pl.DataFrame({"x": [1]}), "t")
+    assert client.read("t")["x"].to_list() == [1]
+    manager.write(pl.DataFrame({"x": [2]}), "t")
+    assert client.read("t")["x"].to_list() == [2]
+
+    client.write(pl.DataFrame({"x": [3]}), "t")
+    assert manager.read("t")["x"].to_list() == [3]
+    assert client.read_arrow("t", filters=[("x", ">", 0)]).num_rows == 1
+    client.delete("t")
+    with pytest.raises(KeyError):
+        manager.read("t")
@@ -0,0 +1,152 @@
+import json
+from datetime import date, datetime, timedelta
+
+import polars as pl
+import pytest
+import yaml
+
+from backtest_data_module.data_storage import (
+    DuckHot,
+    HybridStorageManager,
+    RetentionRule,
+    RetentionService,
+    RollupSpec,
+    S3Cold,
+    TimescaleWarm,
+)
+from backtest_data_module.data_storage.catalog import Catalog
+from backtest_data_module.data_storage.retention import EXPIRED_TIER, parse_age
+
+NOW = datetime(2025, 1, 1)
+
+
+def _manager(**kwargs) -> HybridStorageManager:
+    return HybridStorageManager(
+        hot_store=DuckHot(),
+        warm_store=TimescaleWarm(),
+        cold_store=S3Cold(),
+        catalog=Catalog(),
+        hot_capacity=10,
+        warm_capacity=10,
+        config_path="missing.yaml",
+        **kwargs,
+    )
+
+
+def _bars(end: date, days: int = 3) -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "date": [end - timedelta(days=i) for i in range(days)],
+            "asset": ["A"] * days,
+            "close": [1.0] * days,
+        }
+    )
+
+
+def test_parse_age_and_rule_validation():
+    assert parse_age("7d") == timedelta(days=7)
+    assert parse_age("2y") == timedelta(days=730)
+    with pytest.raises(ValueError):
+        parse_age("7 days")
+    with pytest.raises(ValueError):
+        RetentionRule(pattern="*", max_age="1d", action="archive")
+
+
+def test_expired_tables_are_dropped_and_recorded():
+    manager = _manager()
+    manager.write(_bars(date(2022, 6, 1)), "ticks_2022", tier="cold")
+    manager.write(_bars(date(2024, 12, 30)), "ticks_2024", tier="cold")
+    # 最新資料仍在期限內的分段不可被刪除
+    manager.write(_bars(date(2024, 12, 30), days=1000), "ticks_mixed", tier="cold")
+    manager.write(_bars(date(2022, 6, 1)), "bars_2022", tier="cold")
+
+    service = RetentionService(
+        manager, [RetentionRule(pattern="ticks_*", max_age="2y")]
+    )
+    planned = service.enforce(NOW, dry_run=True)
+    assert [a.table for a in planned] == ["ticks_2022"]
+    assert manager.read("ticks_2022").height == 3
+
+    done = service.enforce(NOW)
+    assert [a.table for a in done] == ["ticks_2022"]
+    with pytest.raises(KeyError):
+        manager.read("ticks_2022")
+    entry = manager.catalog.get("ticks_2022")
+    assert entry.tier == EXPIRED_TIER
+    assert entry.lineage == "retention ticks_*:2y"
+    assert entry.row_count == 3
+    assert manager.read("ticks_2024").height == 3
+    assert manager.read("ticks_mixed").height == 1000
+    assert manager.read("bars_2022").height == 3
+    # 已過期的表格不會再次處理
+    assert service.enforce(NOW) == []
+
+
+def test_demote_moves_expired_hot_tables_down():
+    manager = _manager()
+    manager.write(_bars(date(2024, 12, 1)), "old")
+    manager.write(_bars(date(2024, 12, 31)), "new")
+    service = RetentionService(
+        manager,
+        [RetentionRule(pattern="*", tier="hot", max_age="7d", action="demote")],
+    )
+    done = service.enforce(NOW)
+    assert [(a.table, a.target_tier) for a in done] == [("old", "warm")]
+    assert manager.catalog.get("old").tier == "warm"
+    assert manager.catalog.get("new").tier == "hot"
+    assert "old" not in manager._hot_lru
+
+
+def test_retention_rules_from_config(tmp_path):
+    cfg = {
+        "retention": [
+            {"pattern": "ticks_*", "max_age": "2y"},
+            {"pattern": "*", "tier": "hot", "max_age": "7d", "action": "demote"},
+        ]
+    }
+    cfg_path = tmp_path / "storage.yaml"
+    cfg_path.write_text(yaml.dump(cfg), encoding="utf-8")
+    manager = HybridStorageManager(catalog=Catalog(), config_path=str(cfg_path))
+    assert [r.pattern for r in manager.retention_rules] == ["ticks_*", "*"]
+    assert RetentionService(manager).rules[1].action == "demote"
+
+
+def test_legacy_single_date_reads_real_data_end():
+    manager = _manager()
+    manager.write(_bars(date(2024, 12, 30), days=1000), "ticks_recent", tier="cold")
+    manager.write(_bars(date(2022, 6, 1)), "ticks_old", tier="cold")
+    # 舊版 Catalog 只記錄首筆資料的日期，不代表資料結束時間
+    for table, first in (("ticks_recent", "2021-01-01"), ("ticks_old", "2022-06-01")):
+        entry = manager.catalog.get(table)
+        entry.partition_keys = json.dumps({"date": first})
+        manager.catalog.upsert(entry)
+
+    service = RetentionService(
+        manager, [RetentionRule(pattern="ticks_*", max_age="1y")]
+    )
+    assert [a.table for a in service.plan(NOW)] == ["ticks_old"]
+
+
+def test_dropping_base_table_expires_its_rollups():
+    manager = _manager()
+    manager.register_rollup(RollupSpec(table="bars", levels=["5m", "1h"]))
+    start = datetime(2022, 6, 1)
+    minutes = [start + timedelta(minutes=i) for i in range(120)]
+    bars = pl.DataFrame(
+        {
+            "date": minutes,
+            "asset": ["A"] * 120,
+            "open": [1.0] * 120,
+            "high": [1.0] * 120,
+            "low": [1.0] * 120,
+            "close": [1.0] * 120,
+            "volume": [1] * 120,
+        }
+    )
+    manager.write(bars, "bars")
+    service = RetentionService(manager, [RetentionRule(pattern="bars", max_age="1y")])
+    assert [a.table for a in service.enforce(NOW)] == ["bars"]
+    for name in ("bars", "bars__5m", "bars__1h"):
+        entry = manager.catalog.get(name)
+        assert entry.tier == EXPIRED_TIER
+        assert entry.lineage == "retention bars:1y"
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+import polars as pl
+import pytest
+import yaml
+
+from backtest_data_module.data_storage import Catalog, HybridStorageManager, RollupSpec
+
+
+def _minute_bars(start: datetime, minutes: int) -> pl.DataFrame:
+    dates = [start + timedelta(minutes=i) for i in range(minutes)]
+    return pl.DataFrame(
+        {
+            "date": dates * 2,
+            "asset": ["AAPL"] * minutes + ["MSFT"] * minutes,
+            "open": [float(i) for i in range(2 * minutes)],
+            "high": [float(i) + 1 for i in range(2 * minutes)],
+            "low": [float(i) - 1 for i in range(2 * minutes)],
+            "close": [float(i) + 0.5 for i in range(2 * minutes)],
+            "volume": [1] * (2 * minutes),
+        }
+    )
+
+
+@pytest.fixture
+def manager():
+    manager = HybridStorageManager(catalog=Catalog(), hot_capacity=10)
+    manager.register_rollup(RollupSpec(table="bars"))
+    return manager
+
+
+def test_write_materialises_rollups(manager):
+    manager.write(_minute_bars(datetime(2024, 1, 1), 120), "bars", tier="hot")
+
+    five = manager.read("bars__5m")
+    assert five.height == 2 * 24
+    first = five.row(0, named=True)
+    assert first["open"] == 0.0 and first["close"] == 4.5
+    assert first["high"] == 5.0 and first["low"] == -1.0
+    assert first["volume"] == 5
+
+    hourly = manager.read("bars", interval="1h")
+    assert hourly.height == 4
+    assert hourly.filter(pl.col("asset") == "AAPL")["volume"].to_list() == [60, 60]
+
+
+def test_incremental_refresh_matches_full_rebuild(manager):
+    bars = _minute_bars(datetime(2024, 1, 1, 23, 0), 90)
+    manager.write(bars.filter(pl.col("date") < datetime(2024, 1, 1, 23, 33)), "bars")
+    manager.write(bars, "bars")
+    incremental = manager.read("bars__1d").sort("asset", "date")
+
+    manager.refresh_rollups("bars", full=True)
+    assert incremental.equals(manager.read("bars__1d").sort("asset", "date"))
+    assert incremental["volume"].to_list() == [60, 30, 60, 30]
+
+
+def test_read_routes_to_closest_rollup(manager):
+    manager.write(_minute_bars(datetime(2024, 1, 1), 60), "bars")
+    manager.delete("bars__1h")
+    fifteen = manager.read("bars", interval="15m")
+    assert fifteen.height == 8
+    with pytest.raises(ValueError):
+        manager.read("bars", interval="90s")
+
+
+def test_rollups_from_config(tmp_path):
+    cfg = {"rollups": {"bars": {"interval": "1m", "levels": ["5m"]}}}
+    cfg_path = tmp_path / "storage.yaml"
+    cfg_path.write_text(yaml.dump(cfg), encoding="utf-8")
+    manager = HybridStorageManager(config_path=str(cfg_path))
+    assert manager.rollups["bars"].tables() == {"5m": "bars__5m"}
+    with pytest.raises(ValueError):
+        RollupSpec(table="x", levels=["5m", "7m"])
+
+
+def test_incremental_refresh_backfills_new_asset(manager):
+    bars = _minute_bars(datetime(2024, 1, 1), 240)
+    manager.write(bars.filter(pl.col("asset") == "AAPL"), "bars")
+    # 第二次寫入才出現 MSFT，其完整歷史都須進入 rollup
+    manager.write(bars, "bars")
+    hourly = manager.read("bars__1h").sort("asset", "date")
+    msft = hourly.filter(pl.col("asset") == "MSFT")
+    assert msft.height == 4
+    assert msft["volume"].sum() == 240
+
+    manager.refresh_rollups("bars", full=True)
+    assert hourly.equals(manager.read("bars__1h").sort("asset", "date"))
+
+
+def test_rollups_do_not_count_toward_capacity():
+    manager = HybridStorageManager(catalog=Catalog(), config_path="missing.yaml")
+    assert manager.hot_capacity == 3
+    manager.register_rollup(RollupSpec(table="bars"))
+    manager.write(_minute_bars(datetime(2024, 1, 1), 60), "bars")
+    manager.write(pl.DataFrame({"x": [1]}), "other")
+    manager.write(pl.DataFrame({"x": [2]}), "third")
+    for name in ["bars", "bars__5m", "bars__1h", "bars__1d", "other", "third"]:
+        assert manager.catalog.get(name).tier == "hot"
+
+    # 超出容量時 rollup 隨基礎表格一起搬移
+    manager.write(pl.DataFrame({"x": [3]}), "fourth")
+    for name in ["bars", "bars__5m", "bars__1h", "bars__1d"]:
+        assert manager.catalog.get(name).tier == "warm"
+    assert manager.read("bars", interval="1h").height == 2
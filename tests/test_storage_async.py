@@ -0,0 +1,185 @@
+import asyncio
+import threading
+
+import polars as pl
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from backtest_data_module.data_ingestion.py.api_client import ApiClient
+from backtest_data_module.data_ingestion.py.caching import ICache
+from backtest_data_module.data_ingestion.py.data_source import APIDataSource
+from backtest_data_module.data_storage import (
+    DuckHot,
+    HybridStorageManager,
+    S3Cold,
+    TimescaleWarm,
+)
+from backtest_data_module.data_storage.catalog import Catalog
+from backtest_data_module.data_storage.storage_backend import StorageBackend
+
+
+def _manager(**kwargs) -> HybridStorageManager:
+    return HybridStorageManager(
+        hot_store=kwargs.pop("hot_store", DuckHot()),
+        warm_store=TimescaleWarm(),
+        cold_store=S3Cold(),
+        catalog=Catalog(),
+        config_path="missing.yaml",
+        **kwargs,
+    )
+
+
+class AsyncMemoryStore(StorageBackend):
+    """以協程實作 I/O 的記憶體後端，記錄呼叫時所在的執行緒。"""
+
+    native_async = True
+
+    def __init__(self) -> None:
+        self._tables: dict[str, pl.DataFrame] = {}
+        self.threads: set[int] = set()
+
+    def write(self, df, table, *, metadata=None):
+        raise AssertionError("sync write should not be used")
+
+    def read(self, table):
+        raise AssertionError("sync read should not be used")
+
+    def delete(self, table):
+        self._tables.pop(table, None)
+
+    async def awrite(self, df, table, *, metadata=None):
+        self.threads.add(threading.get_ident())
+        await asyncio.sleep(0)
+        self._tables[table] = df
+
+    async def aread(self, table):
+        self.threads.add(threading.get_ident())
+        await asyncio.sleep(0)
+        if table not in self._tables:
+            raise KeyError(table)
+        return self._tables[table]
+
+    async def adelete(self, table):
+        self._tables.pop(table, None)
+
+
+@pytest.mark.asyncio
+async def test_awrite_aread_roundtrip():
+    manager = _manager()
+    df = pl.DataFrame({"asset": ["A", "B"], "close": [1.0, 2.0]})
+    await manager.awrite(df, "prices")
+    result = await manager.aread("prices")
+    assert result.equals(df)
+    assert manager.catalog.get("prices").tier == "hot"
+    assert "prices" in manager._hot_lru
+    with pytest.raises(KeyError):
+        await manager.aread("missing")
+    manager.close()
+
+
+@pytest.mark.asyncio
+async def test_amigrate_updates_catalog():
+    manager = _manager()
+    df = pl.DataFrame({"x": [1, 2, 3]})
+    await manager.awrite(df, "t")
+    await manager.amigrate("t", "hot", "cold")
+    assert manager.catalog.get("t").tier == "cold"
+    assert "t" not in manager._hot_lru
+    assert (await manager.aread("t", tiers=["cold"])).equals(df)
+    with pytest.raises(KeyError):
+        await manager.aread("t", tiers=["hot"])
+    manager.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_awrites_respect_capacity():
+    manager = _manager(hot_capacity=2)
+    frames = {f"t{i}": pl.DataFrame({"x": [i]}) for i in range(6)}
+    await asyncio.gather(
+        *(manager.awrite(df, name) for name, df in frames.items())
+    )
+    assert len(manager.hot_store._tables) <= 2
+    for name, df in frames.items():
+        assert (await manager.aread(name)).equals(df)
+    manager.close()
+
+
+@pytest.mark.asyncio
+async def test_native_async_backend_runs_on_event_loop():
+    store = AsyncMemoryStore()
+    manager = _manager(hot_store=store, hot_capacity=10)
+    df = pl.DataFrame({"x": [1]})
+    await manager.awrite(df, "t")
+    assert (await manager.aread("t")).equals(df)
+    assert store.threads == {threading.get_ident()}
+    manager.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lock_wait_releases_lock():
+    manager = _manager()
+    df = pl.DataFrame({"x": [1]})
+    manager.write(df, "t")
+    lock = manager._locks.get("t")
+    lock.acquire_write()
+    task = asyncio.create_task(manager.aread("t"))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    lock.release_write()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    # 被取消的讀取取得鎖後應立即釋放，寫入不會卡住
+    await asyncio.wait_for(manager.awrite(df, "t"), timeout=5)
+    manager.close()
+
+
+@pytest.mark.asyncio
+async def test_ingest_overlaps_fetch_and_write():
+    events: list[str] = []
+
+    async def call_api(endpoint, params):
+        events.append(f"fetch-{params['n']}")
+        await asyncio.sleep(0.01)
+        return [{"n": params["n"]}]
+
+    api_client = AsyncMock(spec=ApiClient)
+    api_client.limiters = {}
+    api_client.call_api.side_effect = call_api
+    cache = MagicMock(spec=ICache)
+    cache.get = AsyncMock(return_value=None)
+    cache.set = AsyncMock()
+    source = APIDataSource(api_client=api_client, cache=cache, endpoint="bars")
+
+    manager = MagicMock()
+
+    async def awrite(df, table, *, tier):
+        events.append(f"write-start-{table}")
+        await asyncio.sleep(0.03)
+        events.append(f"write-end-{table}")
+
+    manager.awrite.side_effect = awrite
+    written = await source.ingest(
+        [(f"t{i}", {"n": i}) for i in range(3)], manager, max_pending_writes=2
+    )
+
+    assert written == ["t0", "t1", "t2"]
+    assert manager.awrite.call_count == 3
+    # 第一筆寫入完成前即開始擷取下一筆
+    assert events.index("fetch-1") < events.index("write-end-t0")
+
+
+@pytest.mark.asyncio
+async def test_lock_waiters_do_not_starve_io_pool():
+    manager = _manager(hot_capacity=10)
+    manager.async_max_workers = 2
+    df = pl.DataFrame({"x": list(range(1000))})
+    manager.write(df, "t")
+    # 等待中的讀寫者多於執行緒池大小時，持鎖者仍須取得執行緒完成 I/O
+    ops = (
+        [manager.aread("t") for _ in range(2)]
+        + [manager.awrite(df, "t")]
+        + [manager.aread("t") for _ in range(6)]
+    )
+    results = await asyncio.wait_for(asyncio.gather(*ops), timeout=10)
+    assert all(r.equals(df) for r in results if r is not None)
+    manager.close()
@@ -0,0 +1,57 @@
+import polars as pl
+import pytest
+
+from backtest_data_module.data_storage import Catalog, HybridStorageManager
+from backtest_data_module.metrics import (
+    STORAGE_BYTES_COUNTER,
+    STORAGE_OP_LATENCY_MS,
+    STORAGE_ROWS_COUNTER,
+    STORAGE_TABLE_LATENCY_MS,
+)
+
+
+def _count(hist, **labels):
+    return sum(b.get() for b in hist.labels(**labels)._buckets)
+
+
+def test_read_write_record_latency_bytes_and_rows():
+    manager = HybridStorageManager(catalog=Catalog())
+    df = pl.DataFrame({"a": list(range(100))})
+    rows_before = STORAGE_ROWS_COUNTER.labels(tier="cold", op="read")._value.get()
+    bytes_before = STORAGE_BYTES_COUNTER.labels(tier="cold", op="write")._value.get()
+    miss_before = _count(STORAGE_OP_LATENCY_MS, tier="hot", op="read_miss")
+
+    manager.write(df, "metrics_tbl", tier="cold")
+    manager.read("metrics_tbl")
+
+    assert (
+        STORAGE_BYTES_COUNTER.labels(tier="cold", op="write")._value.get()
+        == bytes_before + df.estimated_size()
+    )
+    assert (
+        STORAGE_ROWS_COUNTER.labels(tier="cold", op="read")._value.get()
+        == rows_before + 100
+    )
+    assert _count(STORAGE_OP_LATENCY_MS, tier="hot", op="read_miss") == miss_before + 1
+
+
+def test_migrate_uses_migration_ops():
+    manager = HybridStorageManager(catalog=Catalog())
+    manager.write(pl.DataFrame({"a": [1]}), "metrics_mig", tier="hot")
+    before = _count(STORAGE_OP_LATENCY_MS, tier="warm", op="migrate_write")
+    manager.migrate("metrics_mig", "hot", "warm")
+    assert _count(STORAGE_OP_LATENCY_MS, tier="warm", op="migrate_write") == before + 1
+
+
+@pytest.mark.parametrize("per_table", [False, True])
+def test_per_table_labels_are_opt_in(per_table):
+    manager = HybridStorageManager(catalog=Catalog())
+    manager.metrics_per_table = per_table
+    table = f"per_table_{per_table}"
+    manager.write(pl.DataFrame({"a": [1]}), table, tier="hot")
+    recorded = any(
+        sample.labels.get("table") == table
+        for metric in STORAGE_TABLE_LATENCY_MS.collect()
+        for sample in metric.samples
+    )
+    assert recorded is per_table
@@ -0,0 +1,171 @@
+import io
+
+import polars as pl
+import pytest
+
+from backtest_data_module.data_storage import (
+    Catalog,
+    DuckHot,
+    HybridStorageManager,
+    S3Cold,
+    TimescaleWarm,
+)
+
+DF = pl.DataFrame(
+    {"asset": ["A", "B", "A", "B"], "close": [1.0, 2.0, 3.0, 4.0], "v": [1, 2, 3, 4]}
+)
+
+
+@pytest.mark.parametrize("backend_cls", [DuckHot, TimescaleWarm, S3Cold])
+def test_backend_scan_matches_eager(backend_cls):
+    backend = backend_cls()
+    backend.write(DF, "tbl")
+    lazy = backend.scan("tbl")
+    assert isinstance(lazy, pl.LazyFrame)
+    result = (
+        lazy.filter(pl.col("asset") == "A")
+        .group_by("asset")
+        .agg(pl.col("close").sum())
+        .collect()
+    )
+    assert result.to_dicts() == [{"asset": "A", "close": 4.0}]
+    with pytest.raises(KeyError):
+        backend.scan("missing")
+
+
+def test_manager_scan_falls_through_tiers():
+    manager = HybridStorageManager(catalog=Catalog())
+    manager.write(DF, "cold_tbl", tier="cold")
+    lazy = manager.scan("cold_tbl")
+    assert lazy.select("v").collect()["v"].to_list() == [1, 2, 3, 4]
+    assert manager.compute_7day_hits()["cold_tbl"] == 1
+    with pytest.raises(KeyError):
+        manager.scan("missing")
+
+
+def test_duck_scan_projection_and_filter():
+    hot = DuckHot()
+    hot.write(DF, "tbl")
+    result = hot.scan("tbl").filter(pl.col("v") > 2).select("close").collect()
+    assert result.columns == ["close"]
+    assert result["close"].to_list() == [3.0, 4.0]
+
+
+def test_duck_scan_pushes_simple_predicates(monkeypatch):
+    from backtest_data_module.data_storage import storage_backend
+
+    queries = []
+    select_sql = storage_backend._select_sql
+
+    def record(*args, **kwargs):
+        queries.append(select_sql(*args, **kwargs))
+        return queries[-1]
+
+    monkeypatch.setattr(storage_backend, "_select_sql", record)
+    hot = DuckHot()
+    hot.write(DF, "tbl")
+    result = (
+        hot.scan("tbl")
+        .filter(
+            (pl.col("v") >= 2)
+            & pl.col("asset").is_in(["B"])
+            & (pl.col("close") * 2 > pl.col("v"))
+        )
+        .select("close")
+        .collect()
+    )
+    assert result["close"].to_list() == [2.0, 4.0]
+    sql, params = queries[-1]
+    # 簡單比較與 is_in 由 DuckDB 執行，欄位運算留給 Polars
+    assert '"v" >= ?' in sql and '"asset" IN (?)' in sql
+    assert set(params) == {2, "B"}
+
+
+def test_hot_read_batches_streams_sorted_rows(monkeypatch):
+    from backtest_data_module.data_storage import storage_backend
+
+    manager = HybridStorageManager(catalog=Catalog(), config_path="missing.yaml")
+    df = pl.DataFrame({"k": [3, 1, 2, 1] * 5, "v": list(range(20))})
+    manager.write(df, "tbl")
+
+    def forbid(self, table):
+        raise AssertionError("read_batches 不應先載入整個表格")
+
+    # 記錄自 DuckDB 取回的每批筆數，整表載入時首批即為全部資料
+    fetched = []
+    filter_batches = storage_backend._filter_batches
+
+    def record(batches):
+        for batch in batches:
+            fetched.append(batch.num_rows)
+            yield batch
+
+    monkeypatch.setattr(DuckHot, "read", forbid)
+    monkeypatch.setattr(DuckHot, "scan", forbid)
+    monkeypatch.setattr(
+        storage_backend,
+        "_filter_batches",
+        lambda batches, *args: filter_batches(record(batches), *args),
+    )
+    batches = list(
+        manager.read_batches(
+            "tbl",
+            columns=["v"],
+            predicate=pl.col("k") < 3,
+            sort_by=["k"],
+            batch_size=4,
+        )
+    )
+    assert [b.num_rows for b in batches] == [4, 4, 4, 3]
+    assert fetched == [4, 4, 4, 3]
+    values = [v for b in batches for v in b.column("v").to_pylist()]
+    expected = df.filter(pl.col("k") < 3).sort("k", maintain_order=True)["v"]
+    assert values == expected.to_list()
+    with pytest.raises(KeyError):
+        next(manager.read_batches("missing"))
+
+
+class RangeS3:
+    """記錄每次 get_object 下載位元組數的 S3 模擬。"""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.fetched = 0
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[Key] = Body
+
+    def head_object(self, Bucket, Key):
+        return {"ContentLength": len(self.objects[Key])}
+
+    def get_object(self, Bucket, Key, Range=None):
+        data = self.objects[Key]
+        if Range is not None:
+            start, end = Range.removeprefix("bytes=").split("-")
+            data = data[int(start) : int(end) + 1]
+        self.fetched += len(data)
+        return {"Body": io.BytesIO(data)}
+
+
+def test_cold_read_batches_reads_row_groups_in_order():
+    s3 = RangeS3()
+    cold = S3Cold("bucket", s3_client=s3, compression="uncompressed")
+    # 第二個 row group 的鍵值較小，需先輸出
+    df = pl.DataFrame(
+        {
+            "k": [5] * 20_000 + [1] * 20_000 + [9] * 20_000,
+            "v": [float(i) for i in range(60_000)],
+        }
+    )
+    cold.write(df, "tbl", metadata={"row_group_size": 20_000})
+    size = len(s3.objects["tbl.parquet"])
+    s3.fetched = 0
+    batches = cold.read_batches("tbl", sort_by=["k"], batch_size=500)
+    first = next(batches)
+    assert first.column("k").to_pylist() == [1] * 500
+    assert s3.fetched < size / 2
+    rest = [first, *batches]
+    values = [v for b in rest for v in b.column("v").to_pylist()]
+    assert values == df.sort("k", maintain_order=True)["v"].to_list()
+    with pytest.raises(KeyError):
+        next(cold.read_batches("missing"))
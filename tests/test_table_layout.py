@@ -0,0 +1,115 @@
+import io
+from datetime import date, timedelta
+
+import polars as pl
+import pyarrow.parquet as pq
+import pytest
+import yaml
+
+from backtest_data_module.data_storage import (
+    DuckHot,
+    HybridStorageManager,
+    S3Cold,
+    TableLayout,
+    TimescaleWarm,
+)
+from backtest_data_module.data_storage.catalog import Catalog
+
+
+class FakeS3:
+    """以字典模擬 put/get/delete_object。"""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[Key] = Body
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+
+def _bars(n_days: int = 50) -> pl.DataFrame:
+    start = date(2024, 1, 1)
+    rows = [
+        {"date": start + timedelta(days=d), "asset": asset, "close": float(d)}
+        for d in range(n_days)
+        for asset in ("C", "A", "B")
+    ]
+    return pl.DataFrame(rows)
+
+
+def test_table_layout_sorts_by_present_keys():
+    df = _bars(5)
+    layout = TableLayout(cluster_by=["asset", "date", "missing"])
+    sorted_df = layout.apply(df)
+    assert sorted_df["asset"].to_list()[:5] == ["A"] * 5
+    assert sorted_df.filter(pl.col("asset") == "A")["date"].is_sorted()
+    with pytest.raises(ValueError):
+        TableLayout(row_group_size=0)
+
+
+def test_write_clusters_matching_tables():
+    manager = HybridStorageManager(
+        hot_store=DuckHot(),
+        warm_store=TimescaleWarm(),
+        cold_store=S3Cold(),
+        catalog=Catalog(),
+        config_path="missing.yaml",
+    )
+    manager.set_layout("bars_*", TableLayout(cluster_by=["asset", "date"]))
+    df = _bars(5)
+    manager.write(df, "bars_daily")
+    manager.write(df, "other")
+
+    clustered = manager.read("bars_daily")
+    assert clustered["asset"].to_list() == sorted(df["asset"].to_list())
+    assert manager.read("other").equals(df)
+
+
+def test_cold_parquet_uses_codec_and_row_groups():
+    s3 = FakeS3()
+    cold = S3Cold(
+        "bucket", s3_client=s3, compression="zstd", compression_level=5
+    )
+    manager = HybridStorageManager(
+        hot_store=DuckHot(),
+        warm_store=TimescaleWarm(),
+        cold_store=cold,
+        catalog=Catalog(),
+        config_path="missing.yaml",
+    )
+    manager.set_layout("bars_*", TableLayout(row_group_size=50))
+    manager.write(_bars(), "bars_daily", tier="cold")
+
+    meta = pq.ParquetFile(io.BytesIO(s3.objects["bars_daily.parquet"])).metadata
+    assert meta.num_row_groups == 3
+    assert meta.row_group(0).column(0).compression == "ZSTD"
+    # 依資產分群後每個 row group 只包含單一資產
+    asset_idx = meta.schema.names.index("asset")
+    for i in range(meta.num_row_groups):
+        stats = meta.row_group(i).column(asset_idx).statistics
+        assert stats.min == stats.max
+    assert manager.read("bars_daily").height == 150
+
+
+def test_layouts_and_compression_from_config(tmp_path):
+    cfg = {
+        "layouts": {"ticks_*": {"cluster_by": ["asset", "ts"], "row_group_size": 10}},
+        "compression": {"cold": {"codec": "snappy"}, "warm": {"codec": "lz4"}},
+        "s3_row_group_size": 1000,
+    }
+    cfg_path = tmp_path / "storage.yaml"
+    cfg_path.write_text(yaml.dump(cfg), encoding="utf-8")
+
+    manager = HybridStorageManager(catalog=Catalog(), config_path=str(cfg_path))
+    layout = manager.layout_for("ticks_btc")
+    assert layout.cluster_by == ["asset", "ts"]
+    assert layout.row_group_size == 10
+    assert manager.layout_for("bars") is None
+    assert manager.cold_store.compression == "snappy"
+    assert manager.cold_store.row_group_size == 1000
+    assert manager.warm_store.compression == "lz4"